@@ -1,22 +1,99 @@
 
-from fastapi import FastAPI
-import pickle
+from fastapi import FastAPI, Header, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
-from src.Deployment.modelService import ModelService
-from src.Deployment.FeedbackStore import save_feedback
+from src.Deployment.artifactRegistry import ArtifactRegistry
+from src.Deployment.modelService import ModelRegistry
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.Deployment.FeedbackStore import create_feedback_writer
+from src.Deployment.onlineMonitor import create_online_monitor
+from src.Deployment.microBatcher import MicroBatcher
+from src.Deployment.inferenceExecutor import InferenceExecutor, ExecutorSaturatedError
+from src.Deployment.bulkReader import iter_csv_chunks, iter_arrow_chunks, iter_column_chunks
+from src.Deployment.coldStart import ColdStartTimer
+from src.Deployment.predictionCache import PredictionCache
 from pydantic import BaseModel
 from typing import List, Dict, Any
-import numpy as np
+import hmac
+import itertools
+import json
 import logging
+import os
+import tempfile
+import numpy as np
+import yaml
     
 
 logging.basicConfig(level=logging.INFO)
+cold_start = ColdStartTimer()
+cold_start.mark("imports_done")
+
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
 
 app = FastAPI(title="ML Model API with Feedback", version="1.0")
-service = ModelService("Artifacts/ctb-model.pkl")
+registry = ArtifactRegistry(
+    model_path=config["serving"]["model_path"],
+    scaler_path=config["serving"]["scaler_path"],
+    feature_config=FeatureTransformer.config_slice(config),
+    check_interval=config["serving"]["reload_check_interval"],
+    outlier_bounds_path=config["serving"]["outlier_bounds_path"],
+    classes=config["serving"]["classes"],
+    manifest_path=config["serving"]["models_manifest"],
+    model_name=config["serving"]["default_model"],
+)
+
+models = ModelRegistry(
+    config["serving"]["models"],
+    classes=config["serving"]["classes"],
+    max_memory_mb=config["serving"]["max_models_memory_mb"],
+    manifest_path=config["serving"]["models_manifest"],
+    check_interval=config["serving"]["reload_check_interval"],
+)
+cold_start.mark("artifacts_loaded")
+model_dir = os.path.realpath(os.path.join(config["project"]["root"], config["project"]["model_path"]))
+
+admin = config["serving"]["admin"]
+admin_token = os.environ.get(admin["token_env"]) if admin["enabled"] else None
+if admin["enabled"] and not admin_token:
+    logging.getLogger(__name__).warning(f"serving.admin is enabled but {admin['token_env']} is not set, admin endpoints reject every request")
+
+cache = None
+if config["serving"]["cache"]["enabled"]:
+    cache = PredictionCache(
+        max_size=config["serving"]["cache"]["max_size"],
+        ttl_seconds=config["serving"]["cache"]["ttl_seconds"],
+    )
+    registry.add_reload_listener(cache.clear)
+    models.add_promote_listener(cache.clear)
+
+batching = config["serving"]["batching"]
+batcher = None
+if batching["enabled"]:
+    batcher = MicroBatcher(
+        lambda X: registry.current().predict(X),
+        max_batch_size=batching["max_batch_size"],
+        max_wait_ms=batching["max_wait_ms"],
+    )
+
+executor = InferenceExecutor(
+    registry,
+    kind=config["serving"]["executor"]["kind"],
+    max_workers=config["serving"]["executor"]["max_workers"],
+    max_queue=config["serving"]["executor"]["max_queue"],
+)
+
+feedback_writer = create_feedback_writer(config["serving"]["feedback"])
+
+monitor = None
+if config["serving"]["monitoring"]["enabled"]:
+    monitor = create_online_monitor(config["serving"]["monitoring"], config["serving"]["classes"])
+
+REQUIRED_COLUMNS = ["date", "precipitation", "temp_max", "temp_min", "wind"]
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,68 +112,290 @@ class FeedbackRequest(BaseModel):
 class PredictionRequest(BaseModel):
     features: List[Dict[str, Any]]
 
+
+class PromoteRequest(BaseModel):
+    version: str
+    path: Optional[str] = None
+
 # -------------------------------
-# Preprocessing Helpers
+# Prediction Cache Helpers
 # -------------------------------
-def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply same preprocessing pipeline used in training."""
+def cache_key(bundle, model: Optional[str], service=None) -> str:
+    """
+    Identifies the scaler/model versions a prediction was made with. The model version
+    is the one of the service actually used, not the active one, which a concurrent
+    promote may already have changed.
+    """
+    if model is None:
+        return f"{bundle.version}:default"
+    return f"{bundle.version}:{model}:{service.version}"
+
+def lookup_cached(X: np.ndarray, key: str):
+    """Returns the cache keys, the cached predictions (None for misses) and the indices to compute."""
+    if cache is None:
+        return None, [None] * len(X), list(range(len(X)))
+    keys = cache.keys(X, key)
+    values, missing = cache.lookup(keys)
+    return keys, values, missing
+
+def merge_cached(keys, values: list, missing: list, preds) -> np.ndarray:
+    """Stores freshly computed predictions and merges them with the cached ones, in request order."""
+    if keys is not None:
+        cache.store([keys[i] for i in missing], preds)
+    for i, pred in zip(missing, preds):
+        values[i] = pred
+    return np.asarray(values)
+
+def resolve_model(model: Optional[str]):
+    """
+    Returns the service of a named model (None for the default model), loading it on
+    first use: call it off the event loop. An unknown model is a 404.
+    """
+    if model is None:
+        return None
     try:
-        logging.info("Starting preprocessing pipeline...")
-        logging.info(f"Original data shape: {df}")
-        df.drop(columns=["date"], inplace=True)
-
-        if "temp_max" not in df.columns or "temp_min" not in df.columns:
-            raise ValueError("Missing required columns: temp_max or temp_min")
-
-        df["temp_diff"] = df["temp_max"] - df["temp_min"]
-        df["temp_avg"] = (df["temp_max"] + df["temp_min"]) / 2
-        logging.info(f"Preprocessing data shape: {df}")
-        df["precipitation"] = np.log1p(df["precipitation"])
-        df["wind"] = np.sqrt(df["wind"])
-        logging.info(f"Preprocessing data shape: {df}")
-        columns_to_scale = ["precipitation","temp_max", "temp_min","wind","temp_avg", "temp_diff"]
-        
-        
-        with open("Artifacts/scaler.pkl", "rb") as f:
-            scaler = pickle.load(f)
-
-        df[columns_to_scale] = scaler.transform(df[columns_to_scale])
-        
-        logging.info(f"Preprocessed data shape: {df}")
-
-        logging.info("Preprocessing completed.")
-        return df
-    except Exception as e:
-        logging.error(f"Error in preprocessing: {e}")
-        raise
+        return models.get(model)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+def predict_records(records: List[dict], model: Optional[str], predict=None) -> np.ndarray:
+    """
+    Validates and converts row records and predicts them through the prediction cache.
+
+    Blocking: the column check and the conversion loop over every row, and
+    the artifact reload check and a cold model load can touch the disk, so
+    this runs on the inference executor or a worker thread, never on the event loop.
+
+    Args:
+        records (list[dict]): Raw input rows.
+        model (str, optional): Model name, the registry's model by default.
+        predict (callable, optional): ``predict(X, service)`` used instead of the bundle's model.
+    """
+    required = set(REQUIRED_COLUMNS)
+    for row in records:
+        if not required <= row.keys():
+            raise ValueError(f"Missing required column: {next(col for col in REQUIRED_COLUMNS if col not in row)}")
+
+    bundle = registry.current()
+    service = resolve_model(model)
+    X = bundle.transformer.inputs_from_records(records)
+    keys, values, missing = lookup_cached(X, cache_key(bundle, model, service))
+    if not missing:
+        return np.asarray(values)
+    X_missing = X if len(missing) == len(X) else X[missing]
+    computed = predict(X_missing, service) if predict is not None else bundle.predict(X_missing, service)
+    return merge_cached(keys, values, missing, computed)
+
+# Bulk bodies above this size are spooled to disk, like Starlette's multipart uploads.
+BULK_SPOOL_MEMORY_BYTES = 1024 * 1024
+
+async def spool_body(request: Request, max_bytes: Optional[int] = None) -> UploadFile:
+    """
+    Copies the request body into a temporary file as it arrives, so it is never held in
+    memory whole. The body must be consumed before the streamed response starts: below
+    ASGI spec 2.4 Starlette listens for the disconnect on the same receive channel.
+    """
+    upload = UploadFile(file=tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_MEMORY_BYTES))
+    size = 0
+    async for part in request.stream():
+        size += len(part)
+        if max_bytes is not None and size > max_bytes:
+            await upload.close()
+            raise HTTPException(status_code=413, detail=f"Body larger than {max_bytes} bytes, send CSV or Arrow instead")
+        await upload.write(part)
+    await upload.seek(0)
+    return upload
 
 # -------------------------------
 # Prediction Endpoint
 # -------------------------------
 @app.post("/predict")
-def predict(request: PredictionRequest):
+def predict(request: PredictionRequest, model: Optional[str] = None):
     try:
         df = pd.DataFrame(request.features)
 
-        required_cols = ["date", "precipitation", "temp_max", "temp_min", "wind"]
-        for col in required_cols:
+        for col in REQUIRED_COLUMNS:
             if col not in df.columns:
                 return {"error": f"Missing required column: {col}"}
 
-        df = preprocess_data(df)
+        bundle = registry.current()
+        service = resolve_model(model)
+        X = bundle.transformer.inputs_from_frame(df)
+        keys, values, missing = lookup_cached(X, cache_key(bundle, model, service))
+        if missing:
+            X_missing = X if len(missing) == len(X) else X[missing]
+            if service is None and batcher is not None:
+                computed = batcher.predict(X_missing)
+            else:
+                computed = bundle.predict(X_missing, service)
+            preds = merge_cached(keys, values, missing, computed)
+        else:
+            preds = np.asarray(values)
+        cold_start.mark("first_prediction")
+        return {"predictions": preds.tolist()}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Prediction error: {e}")
+        return {"error": str(e)}
 
-        preds = service.predict(df)
+
+@app.post("/predict/async")
+async def predict_async(request: PredictionRequest, model: Optional[str] = None):
+    """
+    Non-blocking variant of /predict: the whole request (validation, conversion, reload
+    check and inference) runs as one job of the bounded inference executor.
+    """
+    try:
+        if executor.kind == "thread":
+            preds = await executor.run_job(predict_records, request.features, model)
+        else:
+            if model is not None:
+                raise HTTPException(status_code=400, detail="The model parameter is not supported by the process executor "
+                                                            "(serving.executor.kind), use /predict")
+            # Process workers serve their own model: the rows are prepared on a worker
+            # thread, which waits for the pool to predict the rows missing from the cache.
+            preds = await run_in_threadpool(predict_records, request.features, model,
+                                            lambda X, service: executor.submit(X, service).result())
+        cold_start.mark("first_prediction")
         return {"predictions": preds.tolist()}
+    except ExecutorSaturatedError as e:
+        logging.warning(f"Rejecting prediction, executor saturated: {e}")
+        raise HTTPException(status_code=503, detail="Inference queue is full, retry later", headers={"Retry-After": "1"})
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Prediction error: {e}")
         return {"error": str(e)}
 
 
+@app.post("/predict/bulk")
+async def predict_bulk(request: Request,
+                       chunk_size: int = Query(config["serving"]["bulk"]["chunk_size"], gt=0,
+                                               le=config["serving"]["bulk"]["chunk_size"]),
+                       model: Optional[str] = None):
+    """
+    Columnar bulk prediction. Accepts a CSV upload (multipart field ``file``), a raw
+    ``text/csv`` body, an Arrow IPC body or column-oriented JSON (``{"columns": {...}}``).
+    Predictions stream back as one NDJSON line per chunk.
+
+    CSV and Arrow bodies are spooled to a temporary file as they arrive and read back
+    ``chunk_size`` rows at a time, so memory stays flat whatever the input size. JSON
+    is parsed whole and capped by ``serving.bulk.max_json_bytes``. A chunk failing
+    after the response started ends the stream with an ``{"offset", "error"}`` line.
+    """
+    # The reload check and a cold model load can touch the disk: keep them off the event loop.
+    bundle, service = await run_in_threadpool(lambda: (registry.current(), resolve_model(model)))
+    columns = bundle.transformer.input_columns
+    content_type = request.headers.get("content-type", "")
+    spool = None
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            chunks = iter_csv_chunks(form["file"].file, columns, chunk_size)
+        elif content_type.startswith("text/csv"):
+            spool = await spool_body(request)
+            chunks = iter_csv_chunks(spool.file, columns, chunk_size)
+        elif content_type.startswith("application/vnd.apache.arrow"):
+            spool = await spool_body(request)
+            chunks = iter_arrow_chunks(spool.file, columns, chunk_size)
+        elif content_type.startswith("application/json"):
+            spool = await spool_body(request, max_bytes=config["serving"]["bulk"]["max_json_bytes"])
+            payload = await run_in_threadpool(json.load, spool.file)
+            chunks = iter_column_chunks(payload["columns"], columns, chunk_size)
+        else:
+            raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+        # Read the first chunk eagerly so malformed payloads fail before streaming starts.
+        first = await run_in_threadpool(next, chunks, None)
+    except Exception as e:
+        if spool is not None:
+            await spool.close()
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, ImportError):
+            raise HTTPException(status_code=415, detail=f"Payload format not available on this server: {e}")
+        if isinstance(e, (KeyError, ValueError)):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+
+    def stream():
+        offset = 0
+        try:
+            if first is None:
+                return
+            for X in itertools.chain([first], chunks):
+                preds = bundle.predict(X, service)
+                cold_start.mark("first_prediction")
+                yield json.dumps({"offset": offset, "predictions": preds.ravel().tolist()}) + "\n"
+                offset += len(X)
+        except Exception as e:
+            # The 200 status is already sent: report the failing chunk and stop cleanly.
+            logging.error(f"Bulk prediction error at row {offset}: {e}")
+            yield json.dumps({"offset": offset, "error": str(e)}) + "\n"
+        finally:
+            if spool is not None:
+                spool.file.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @app.post("/feedback")
 def feedback(request: FeedbackRequest):
-    save_feedback(request.features, request.prediction, request.actual)
+    feedback_writer.submit(request.features, request.prediction, request.actual)
+    if monitor is not None:
+        monitor.observe(request.features, request.prediction, request.actual)
     return {"message": "Feedback saved successfully"}
 
+@app.get("/models")
+def list_models():
+    return models.stats()
+
+
+def require_admin(token: Optional[str]):
+    """Rejects the request unless admin endpoints are enabled and the token matches."""
+    if not admin["enabled"]:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (serving.admin.enabled)")
+    if not admin_token or token is None or not hmac.compare_digest(token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
+
+@app.post("/models/{name}/promote")
+def promote_model(name: str, request: PromoteRequest, x_admin_token: Optional[str] = Header(None)):
+    """Activates a version of a model. A new version can be registered with a path inside Artifacts/."""
+    require_admin(x_admin_token)
+    try:
+        if request.path is not None:
+            path = os.path.realpath(request.path)
+            if os.path.commonpath([path, model_dir]) != model_dir or not os.path.exists(path):
+                raise HTTPException(status_code=400, detail=f"Model path must be an existing file in {config['project']['model_path']}")
+            models.register(name, request.version, path)
+        models.promote(name, request.version)
+        return models.stats()
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.on_event("shutdown")
+def shutdown():
+    if batcher is not None:
+        batcher.close()
+    executor.shutdown()
+    feedback_writer.close()
+    stats = feedback_writer.stats()
+    logging.info(f"Feedback writer closed: {stats['written']} records written at {stats['records_per_second']:.0f} records/sec")
+
+@app.get("/metrics")
+def metrics():
+    stats = {"artifacts": registry.stats(), "cold_start": cold_start.stats()}
+    if batcher is not None:
+        stats["batching"] = batcher.stats()
+    stats["executor"] = executor.stats()
+    stats["models"] = models.stats()
+    if cache is not None:
+        stats["cache"] = cache.stats()
+    stats["feedback"] = feedback_writer.stats()
+    if monitor is not None:
+        stats["monitoring"] = monitor.stats()
+    return stats
+
 @app.get("/")
 def root():
     return {"message": "API is running"}
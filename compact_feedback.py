@@ -0,0 +1,26 @@
+import argparse
+import logging
+import yaml
+from src.Deployment.FeedbackStore import create_feedback_backend
+from src.Deployment.feedbackDataset import FeedbackDataset
+
+logging.basicConfig(level=logging.INFO)
+
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
+
+if __name__ == "__main__":
+    feedback_config = config['serving']['feedback']
+    parser = argparse.ArgumentParser(description="Compact the feedback log into the date-partitioned Arrow dataset.")
+    parser.add_argument("--dataset", default=feedback_config['dataset_path'], help="Directory of the partitioned dataset")
+    parser.add_argument("--evaluate", action="store_true", help="Score the logged predictions against the actual labels")
+    args = parser.parse_args()
+
+    dataset = FeedbackDataset(args.dataset)
+    stats = dataset.compact(create_feedback_backend(feedback_config))
+    summary = dataset.stats()
+    print(f"✅ Compacted {stats['rows']} records in {stats['seconds']:.2f}s -> {args.dataset} ({summary['rows']} records in {summary['partitions']} partitions)")
+    if args.evaluate:
+        metrics = dataset.evaluate(config['serving']['classes'])
+        print(f"📊 Feedback accuracy {metrics['accuracy']:.4f}, macro F1 {metrics['macro_avg']['f1']:.4f} "
+              f"on {metrics['support']} records ({metrics['skipped']} skipped)")
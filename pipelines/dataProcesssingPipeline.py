@@ -1,6 +1,7 @@
 from zenml import pipeline
-from steps.dataHandling import data_cleaning_step, outlier_handling_step, feature_engineering_step, scaling_step, save_to_csv_step
+from steps.dataHandling import data_cleaning_step, outlier_handling_step, feature_engineering_step, scaling_step, save_to_csv_step, streaming_preprocessing_step, feature_reference_step
 from steps.dataIngestion import data_ingestion_step
+from src.dataStrategies.featureTransformer import FeatureTransformer
 import yaml
 import os
 
@@ -11,18 +12,33 @@ with open("config/config.yaml", "r") as f:
 data_path = os.path.join(config['project']['root'], config['project']['data_path'])
 output_path = os.path.join(config['project']['root'], config['project']['output_path'] )
 drop_cols = config['data_cleaning']['drop_columns']
+dedup_config = config['data_cleaning']['dedup']
 remove_cols = config['outlier_handling']['remove_columns']
 cap_cols = config['outlier_handling']['cap_columns']
-transformations = config['feature_engineering']['transformations']
-columns_to_scale = config['scaling']['columns_to_scale']
+feature_config = FeatureTransformer.config_slice(config)
 
 @pipeline
 def data_preprocessing_pipeline():
     
     data = data_ingestion_step(DATA_PATH=data_path)
     data = data_cleaning_step(data, drop_cols=drop_cols)
+    # The monitor sees the raw /feedback features, so the reference is taken before the outliers are capped.
+    feature_reference_step(data, monitoring_config=config['serving']['monitoring'])
     data = outlier_handling_step(data, remove_cols=remove_cols, cap_cols=cap_cols)
-    data = feature_engineering_step(data, transformations=transformations)
-    data = scaling_step(data, columns_to_scale=columns_to_scale)
+    data = feature_engineering_step(data, feature_config=feature_config)
+    data = scaling_step(data, feature_config=feature_config)
     save_to_csv_step(data,output_path)
-    
\ No newline at end of file
+
+
+@pipeline
+def streaming_preprocessing_pipeline():
+    streaming_preprocessing_step(
+        data_path=data_path,
+        output_path=output_path,
+        drop_cols=drop_cols,
+        remove_cols=remove_cols,
+        cap_cols=cap_cols,
+        feature_config=feature_config,
+        streaming_config=config['streaming'],
+        dedup_config=dedup_config,
+    )
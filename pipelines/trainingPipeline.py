@@ -1,6 +1,10 @@
 from zenml import pipeline
 from steps.dataIngestion import data_ingestion_step
-from steps.training import split_step, trainingCatBoost, trainingXGBoost, modelEvaluation, decodeData, smoteData
+from steps.training import split_step, crossValidation, trainingCatBoost, trainingXGBoost, hyperparameterSearch, parallelTraining, resampleData, feedbackData, registerIncrementalModel, commitIncrementalRun
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.Deployment.modelService import ModelRegistry
+from src.TrainingStrategies.registry import load_strategy
+from src.incrementalTraining import TrainingState
 import logging
 import yaml
 import os
@@ -16,50 +20,135 @@ with open("config/config.yaml", "r") as f:
 data_path = os.path.join(config['project']['root'], config['project']['output_path'])
 ctbPath = os.path.join(config['project']['root'], config['project']['model_path'], "ctb-model.pkl")
 xgbPath = os.path.join(config['project']['root'], config['project']['model_path'], "xgb-model.pkl")
+ctbNativePath = os.path.join(config['project']['root'], config['project']['model_path'], "ctb-model.cbm")
+xgbNativePath = os.path.join(config['project']['root'], config['project']['model_path'], "xgb-model.ubj")
+statePath = os.path.join(config['project']['root'], config['incremental_training']['state_path'])
+
+def versioned(path: str, version: str) -> str:
+    """Artifacts/ctb-model.cbm -> Artifacts/ctb-model-v2.cbm"""
+    root, extension = os.path.splitext(path)
+    return f"{root}-{version}{extension}"
 
 @pipeline
 def training_pipeline():
 
     """
-    Defines a pipeline for training two models (CatBoost and XGBoost) on a dataset and logging the results to MLflow.
+    Defines a pipeline for training the configured model zoo (``training.models``) on a dataset and logging the results to MLflow.
 
     The pipeline consists of the following steps:
 
     1. Data ingestion: loads the dataset from a specified path
-    2. SMOTE: applies SMOTE oversampling to the dataset
-    3. Split: splits the dataset into training and test sets
-    4. CatBoost: trains a CatBoost model on the training set
-    5. XGBoost: trains an XGBoost model on the training set
-    6. Evaluation: evaluates both models on the test set and logs the results to MLflow
+    2. Split: splits the dataset into training and test sets, persisted with its K folds
+    3. Resampling: balances the classes of the training rows only (``training.resampling``)
+    4. Search: if enabled, tunes the boosters of ``hyperparameter_search.space`` on a validation
+       split of the raw training rows, resampling only the search's training part, and prunes
+       trials with successive halving
+    5. Cross-validation: if enabled, scores every model on the K folds of the split in parallel
+       processes, resampling only the training part of each fold, and logs the mean, std and
+       per-fold timings as one artifact
+    6. Training: trains and evaluates every model of ``training.models`` concurrently,
+       one process per model with its own thread budget, logs the results to the run
+       and selects the fastest model reaching ``training.selection.min_accuracy``
 
     The pipeline takes no arguments and returns no values.
 
     """
-    
+    training = config['training']
+
     with mlflow.start_run(run_name="training_pipeline_run", nested=True) as run:
 
         data = data_ingestion_step(DATA_PATH=data_path)
         mlflow.log_artifact(data_path, artifact_path="dataset")
 
-        balanceData = smoteData(data)
+        # Split first: only the training rows are resampled.
+        train_data, X_test, y_test, split = split_step(data, split_config=training['split'])
+
+        X_train, y_train, class_weights = resampleData(train_data, resampling=training['resampling'])
+
+        models = training['models']
+        if config['hyperparameter_search']['enabled']:
+            models = hyperparameterSearch(train_data, models=models, search=config['hyperparameter_search'],
+                                          classes=config['serving']['classes'], resampling=training['resampling'])
 
-        X_train, X_test, y_train, y_test = split_step(balanceData)
+        if training['cross_validation']['enabled']:
+            crossValidation(data, split, models=models, classes=config['serving']['classes'],
+                            resampling=training['resampling'], max_workers=training['cross_validation']['max_workers'])
 
-        cat_model = trainingCatBoost(X_train, y_train, ctbPath)
-        mlflow.log_artifact(ctbPath, artifact_path="models/catboost")
-        modelUrl = f"runs:/{run.info.run_id}/models/catboost"
-        mlflow.register_model(modelUrl, "CatboostModel")
+        results = parallelTraining(X_train, y_train, X_test, y_test, models=models,
+                                   classes=config['serving']['classes'], max_workers=training['max_workers'],
+                                   min_accuracy=training['selection']['min_accuracy'], state_path=statePath,
+                                   class_weights=class_weights)
 
-        y_train_decoded = decodeData(y_train)
-        y_test_decoded = decodeData(y_test)
-        xg_model = trainingXGBoost(X_train, y_train_decoded, xgbPath)
-        mlflow.log_artifact(xgbPath, artifact_path="models/xgboost")
-        modelUrl = f"runs:/{run.info.run_id}/models/xgboost"
-        mlflow.register_model(modelUrl, "XGBoostModel")
+        for name, spec in training['models'].items():
+            if not spec.get('enabled', True):
+                continue
+            mlflow.log_artifact(spec['path'], artifact_path=f"models/{name}")
+            if spec.get('native_path') and load_strategy(spec['strategy']).native_format:
+                mlflow.log_artifact(spec['native_path'], artifact_path=f"models/{name}")
+            if spec.get('registered_model'):
+                mlflow.register_model(f"runs:/{run.info.run_id}/models/{name}", spec['registered_model'])
 
-        cat_report, cat_cm = modelEvaluation(cat_model, X_test, y_test, run_id='CatBoost_Training')
+        logger.info(f"MLflow run completed")
+
+
+@pipeline
+def incremental_training_pipeline():
+
+    """
+    Continues training the active CatBoost and XGBoost models on the feedback received since the last run.
+
+    The pipeline consists of the following steps:
+
+    1. Feedback: loads the new feedback rows plus a small per-class replay of the processed data
+    2. CatBoost: adds trees to the active CatBoost model (init_model), with the params of the last full training
+    3. XGBoost: adds boosting rounds to the active XGBoost booster (xgb_model), with the params of the last full training
+    4. Registration: registers both models as new versions in the model manifest, and promotes each one
+       only if it beats the active version on the test set. The API's default model follows
+       the active CatBoost version (``serving.default_model``) in the manifest
+    5. Commit: stores the feedback cursor and reports the time saved compared with a full training
+
+    run_pipeline.py skips the run when fewer than ``incremental_training.min_new_rows`` records arrived.
+    """
+    incremental = config['incremental_training']
+    serving = config['serving']
+    registry = ModelRegistry(serving['models'], manifest_path=serving['models_manifest'])
+    params = TrainingState(statePath).load()['model_params']
+
+    ctbVersion, xgbVersion = registry.next_version("catboost"), registry.next_version("xgboost")
+    ctbCandidate, xgbCandidate = versioned(ctbNativePath, ctbVersion), versioned(xgbNativePath, xgbVersion)
+
+    with mlflow.start_run(run_name="incremental_training_run", nested=True) as run:
+
+        X_train, y_train, y_train_encoded, cursor, rows = feedbackData(
+            data_path=data_path,
+            state_path=statePath,
+            feedback_config=config['serving']['feedback'],
+            feature_config=FeatureTransformer.config_slice(config),
+            scaler_path=config['serving']['scaler_path'],
+            classes=config['serving']['classes'],
+            replay_rows_per_class=incremental['replay_rows_per_class'],
+            outlier_bounds_path=config['serving']['outlier_bounds_path'],
+        )
+
+        # The retrained models are written next to the served ones, under their new version.
+        cat_model = trainingCatBoost(X_train, y_train, versioned(ctbPath, ctbVersion), ctbCandidate,
+                                     init_model=registry.active_path("catboost"), iterations=incremental['boost_rounds'],
+                                     state_path=statePath, params=params.get("catboost"))
+        mlflow.log_artifact(ctbCandidate, artifact_path="models/catboost")
+
+        xg_model = trainingXGBoost(X_train, y_train_encoded, versioned(xgbPath, xgbVersion), xgbCandidate,
+                                   init_model=registry.active_path("xgboost"), n_estimators=incremental['boost_rounds'],
+                                   state_path=statePath, params=params.get("xgboost"))
+        mlflow.log_artifact(xgbCandidate, artifact_path="models/xgboost")
+
+        test_data_path = config['training']['split']['test_data_path']
+        registerIncrementalModel("catboost", ctbVersion, ctbCandidate, test_data_path, serving['models'],
+                                 serving['classes'], serving['models_manifest'],
+                                 after="trainingCatBoost", id="registerCatBoost")
+        registerIncrementalModel("xgboost", xgbVersion, xgbCandidate, test_data_path, serving['models'],
+                                 serving['classes'], serving['models_manifest'],
+                                 after="trainingXGBoost", id="registerXGBoost")
+
+        commitIncrementalRun(cursor, rows, statePath, after=["registerCatBoost", "registerXGBoost"])
 
-        
-        xg_report, xg_cm = modelEvaluation(xg_model, X_test, y_test_decoded, run_id='XGBoost_Training')
-        
         logger.info(f"MLflow run completed")
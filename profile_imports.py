@@ -0,0 +1,44 @@
+import argparse
+import re
+import subprocess
+import sys
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def profile(module: str):
+    """Imports ``module`` in a fresh interpreter with -X importtime and parses the report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report where the import time of a module goes.")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--top", type=int, default=15, help="Number of top-level packages to show")
+    args = parser.parse_args()
+
+    entries = profile(args.module)
+    total = next(cumulative for name, depth, _, cumulative in entries if name == args.module)
+
+    # Packages imported first (directly or by a dependency) at the top of the tree
+    # carry the cost of everything they pulled in.
+    packages = {}
+    for name, depth, _, cumulative in entries:
+        if depth == 1:
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0) + cumulative
+
+    print(f"import {args.module}: {total / 1e6:.3f}s")
+    print(f"{'package':<30}{'seconds':>10}{'share':>8}")
+    for root, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{root:<30}{cumulative / 1e6:>10.3f}{cumulative / total:>8.1%}")
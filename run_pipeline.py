@@ -1,11 +1,41 @@
-from pipelines.dataProcesssingPipeline import data_preprocessing_pipeline
-from pipelines.trainingPipeline import training_pipeline
+from pipelines.dataProcesssingPipeline import data_preprocessing_pipeline, streaming_preprocessing_pipeline
+from pipelines.trainingPipeline import training_pipeline, incremental_training_pipeline, statePath
+from src.Deployment.FeedbackStore import create_feedback_backend
+from src.incrementalTraining import TrainingState, valid_labels
+import argparse
+import logging
 import mlflow
 import dagshub
+import yaml
 dagshub.init(repo_owner='Aly-EL-Badry', repo_name='DisasterPrediction', mlflow=True)
 
+logging.basicConfig(level=logging.INFO)
+
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the data processing and training pipelines.")
+    parser.add_argument("--incremental", action="store_true", help="Continue training the current models on the feedback received since the last run")
+    parser.add_argument("--streaming", action="store_true", help="Preprocess the raw data chunk by chunk, for data that does not fit in memory")
+    args = parser.parse_args()
+
     mlflow.set_experiment("disaster-prediction v1")
 
-    data_preprocessing_pipeline()
-    training_pipeline()
\ No newline at end of file
+    if args.incremental:
+        backend = create_feedback_backend(config['serving']['feedback'])
+        records = backend.read_since(TrainingState(statePath).load()['feedback_cursor'])[0]
+        # Only records with a usable label are trained on.
+        new_rows = int(valid_labels(records, config['serving']['classes']).notna().sum())
+        min_rows = config['incremental_training']['min_new_rows']
+        if new_rows < min_rows:
+            logging.info(f"Skipping incremental training: {new_rows} new feedback records, {min_rows} required")
+        else:
+            incremental_training_pipeline()
+    else:
+        if args.streaming or config['data_cleaning']['dedup']['persist']:
+            # Only the streaming path ingests incrementally against the persisted dedup index.
+            streaming_preprocessing_pipeline()
+        else:
+            data_preprocessing_pipeline()
+        training_pipeline()
@@ -0,0 +1,45 @@
+import argparse
+import logging
+import os
+import yaml
+from src.batchScoring import BatchScorer
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+logging.basicConfig(level=logging.INFO)
+
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
+
+model_dir = os.path.join(config['project']['root'], config['project']['model_path'])
+
+def resolve_model(model: str) -> str:
+    """Accepts a path or a short name from Artifacts/ (e.g. "ctb" -> Artifacts/ctb-model.pkl)."""
+    if os.path.exists(model):
+        return model
+    return os.path.join(model_dir, f"{model}-model.pkl")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a weather CSV in chunks with a trained model.")
+    parser.add_argument("input", help="CSV with the raw weather columns")
+    parser.add_argument("output", help="CSV written with the input columns and a prediction column")
+    parser.add_argument("--model", default=config['serving']['model_path'], help="Model path or short name in Artifacts/ (ctb, xgb, rf, knn, dt)")
+    parser.add_argument("--chunk-size", type=int, default=config['batch_scoring']['chunk_size'])
+    parser.add_argument("--workers", type=int, default=config['batch_scoring']['workers'], help="Worker processes, 1 scores in-process")
+    parser.add_argument("--label-column", default=config['batch_scoring']['label_column'], help="Column of the true labels, evaluated when present")
+    args = parser.parse_args()
+
+    scorer = BatchScorer(
+        model_path=resolve_model(args.model),
+        scaler_path=config['serving']['scaler_path'],
+        feature_config=FeatureTransformer.config_slice(config),
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        outlier_bounds_path=config['serving']['outlier_bounds_path'],
+        label_column=args.label_column,
+        classes=config['serving']['classes'],
+    )
+    stats = scorer.score(args.input, args.output)
+    print(f"✅ Scored {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/sec) -> {args.output}")
+    if "metrics" in stats:
+        print(f"📊 Accuracy {stats['metrics']['accuracy']:.4f}, macro F1 {stats['metrics']['macro_avg']['f1']:.4f} "
+              f"on {stats['metrics']['support']} labelled rows")
@@ -1,16 +1,256 @@
-import pandas as pd
+import csv
+import io
+import logging
 import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked across processes.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+def feedback_fields(feature_columns: List[str]) -> List[str]:
+    return ["received_at", *feature_columns, "prediction", "actual"]
+
+
+class CsvFeedbackBackend:
+    def __init__(self, path: str, fields: List[str]):
+        """
+        Append-only CSV file with a single header row.
+
+        Every batch is appended under an exclusive ``flock``, so several
+        processes (e.g. uvicorn workers) can share the file safely.
+        """
+        self.path = path
+        self.fields = fields
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, records: List[dict]) -> None:
+        with open(self.path, "a", newline="") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                writer = csv.DictWriter(f, fieldnames=self.fields, extrasaction="ignore")
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    writer.writeheader()
+                writer.writerows(records)
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read_since(self, cursor: int = 0) -> Tuple[pd.DataFrame, int]:
+        """
+        Reads the records appended after ``cursor``.
+
+        Args:
+            cursor (int): Byte offset returned by the previous call, 0 to read from the start.
+
+        Returns:
+            tuple: The new records and the cursor to pass next time. A line still
+            being written is left for the next call.
+        """
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=self.fields), cursor
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < cursor:
+                raise ValueError(f"{self.path} is shorter than cursor {cursor}, was it truncated or rotated?")
+            f.seek(cursor)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]
+        records = pd.DataFrame(columns=self.fields)
+        if data.strip():
+            records = pd.read_csv(io.BytesIO(data), header=None, names=self.fields, skiprows=1 if cursor == 0 else 0)
+        return records, cursor + len(data)
+
+
+class SqliteFeedbackBackend:
+    def __init__(self, path: str, fields: List[str]):
+        """
+        Local SQLite database in WAL mode: writers append without blocking readers.
+        """
+        self.path = path
+        self.fields = fields
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        columns = ", ".join(f'"{field}"' for field in fields)
+        self._insert = f'INSERT INTO feedback ({columns}) VALUES ({", ".join("?" for _ in fields)})'
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS feedback ({columns})")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def write(self, records: List[dict]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(self._insert, [[record.get(field) for field in self.fields] for record in records])
+        finally:
+            conn.close()
+
+    def read_since(self, cursor: int = 0) -> Tuple[pd.DataFrame, int]:
+        """
+        Reads the records inserted after ``cursor``, a rowid (0 to read from the start).
+        """
+        conn = self._connect()
+        try:
+            records = pd.read_sql_query("SELECT rowid AS _rowid, * FROM feedback WHERE rowid > ? ORDER BY rowid", conn, params=(cursor,))
+        finally:
+            conn.close()
+        if len(records):
+            cursor = int(records["_rowid"].iloc[-1])
+        return records.drop(columns="_rowid"), cursor
+
+
+class FeedbackWriter:
+    """
+    Queues feedback records in memory and writes them in batches from a background thread.
+
+    A failed write is retried on the next flush. While the backend keeps
+    failing, the queue is capped at ``max_queued`` records: the oldest ones
+    are dropped and counted, so memory stays bounded.
+    """
+    def __init__(self, backend, flush_interval: float = 1.0, max_batch: int = 500, max_queued: int = 100000):
+        """
+        Args:
+            backend: CsvFeedbackBackend or SqliteFeedbackBackend.
+            flush_interval (float): Maximum number of seconds a record waits in memory.
+            max_batch (int): Number of queued records that triggers an early flush.
+            max_queued (int): Maximum number of records kept in memory.
+        """
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_queued = max_queued
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self.received = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.write_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, features: dict, prediction, actual) -> None:
+        record = {
+            **features,
+            "received_at": datetime.now(timezone.utc).isoformat(),
+            "prediction": prediction,
+            "actual": actual,
+        }
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("The feedback writer is closed")
+            self._buffer.append(record)
+            self.received += 1
+            # Only overflows while the backend fails; the failed flushes log the count.
+            self._drop_overflow()
+            full = len(self._buffer) >= self.max_batch
+        if full:
+            self._wakeup.set()
+
+    def _drop_overflow(self) -> int:
+        # Called with the lock held. Keeps the most recent records.
+        overflow = len(self._buffer) - self.max_queued
+        if overflow <= 0:
+            return 0
+        del self._buffer[:overflow]
+        self.dropped += overflow
+        return overflow
+
+    def flush(self) -> int:
+        """
+        Writes every queued record now. Returns the number of records written.
+        """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        start = time.perf_counter()
+        try:
+            self.backend.write(batch)
+        except Exception as e:
+            # Put the batch back in front so it is retried on the next flush.
+            with self._lock:
+                self._buffer = batch + self._buffer
+                self.failed += 1
+                self._drop_overflow()
+                queued, dropped = len(self._buffer), self.dropped
+            logger.error(f"Error writing {len(batch)} feedback records ({queued} queued, {dropped} dropped so far): {e}")
+            return 0
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.written += len(batch)
+            self.flushes += 1
+            self.write_seconds += elapsed
+        return len(batch)
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Stops the background thread and flushes what is still queued.
+        """
+        with self._lock:
+            self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "received": self.received,
+                "written": self.written,
+                "queued": len(self._buffer),
+                "flushes": self.flushes,
+                "failed_flushes": self.failed,
+                "dropped": self.dropped,
+                "records_per_second": self.written / self.write_seconds if self.write_seconds else 0.0,
+            }
+
+
+def create_feedback_backend(config: dict):
+    """
+    Builds the backend described by the ``feedback`` section of the config.
+    """
+    fields = feedback_fields(config["feature_columns"])
+    if config["backend"] == "sqlite":
+        return SqliteFeedbackBackend(config["path"], fields)
+    if config["backend"] == "csv":
+        return CsvFeedbackBackend(config["path"], fields)
+    raise ValueError(f"Unknown feedback backend: {config['backend']}")
+
+
+def create_feedback_writer(config: dict) -> FeedbackWriter:
+    """
+    Builds the writer and its backend from the ``feedback`` section of the config.
+    """
+    backend = create_feedback_backend(config)
+    return FeedbackWriter(backend, flush_interval=config["flush_interval"], max_batch=config["max_batch"],
+                          max_queued=config.get("max_queued", 100000))
 
-FEEDBACK_FILE = "data/feedback.csv"
-
-def save_feedback(features: dict, prediction: float, actual: float):
-    feedback = pd.DataFrame([{
-        **features,
-        "prediction": prediction,
-        "actual": actual
-    }])
-    
-    if not os.path.exists(FEEDBACK_FILE):
-        feedback.to_csv(FEEDBACK_FILE, index=False)
-    else:
-        feedback.to_csv(FEEDBACK_FILE, mode="a", header=False, index=False)
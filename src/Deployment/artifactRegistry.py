@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+from src.Deployment.modelService import ModelService, read_active_path
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class ArtifactBundle:
+    """
+    Snapshot of every artifact needed to serve a prediction.
+
+    A bundle is never mutated after it is built; a reload builds a new bundle
+    and swaps the registry's reference to it, so a request always sees a
+    scaler, outlier bounds, feature transformer and model that belong together.
+    """
+    def __init__(self, service: ModelService, transformer: FeatureTransformer, version: int, mtimes: Dict[str, int]):
+        self.service = service
+        self.transformer = transformer
+        self.scaler = transformer.scaler
+        self.features = transformer.output_columns
+        self.version = version
+        self.mtimes = mtimes
+
+    def predict(self, X, service: ModelService = None):
+        """
+        Preprocesses raw input rows and predicts them with the bundle's model.
+
+        Args:
+            X (np.ndarray): Raw values laid out as ``transformer.input_columns``.
+            service (ModelService, optional): Model to use instead of the bundle's model.
+
+        Returns:
+            np.ndarray: One prediction per row.
+        """
+        features = self.transformer.to_frame(self.transformer.transform(X))
+        return (service or self.service).predict(features)
+
+
+class ArtifactRegistry:
+    def __init__(self, model_path: str, scaler_path: str, feature_config: dict, check_interval: float = 5.0,
+                 outlier_bounds_path: str = None, classes: List[str] = None, manifest_path: str = None,
+                 model_name: str = None):
+        """
+        Loads the serving artifacts once and keeps them in memory.
+
+        Args:
+            model_path (str): Path to the pickled model.
+            scaler_path (str): Path to the scaler, as JSON parameters or a pickled scaler strategy.
+            feature_config (dict): Arguments of the FeatureTransformer, see ``FeatureTransformer.config_slice``.
+            check_interval (float): Minimum number of seconds between two checks of the
+                files on disk. Set to 0 to check on every access.
+            outlier_bounds_path (str, optional): Outlier bounds JSON of the training data.
+                When set, raw inputs are capped to them before the feature chain.
+            classes (list[str], optional): Class names. Models trained on label-encoded
+                targets (xgboost, random forest, knn, decision tree) predict class indices,
+                which are mapped back to these names.
+            manifest_path (str, optional): Model manifest of a ``ModelRegistry``. With ``model_name``,
+                the bundle serves the active version of that model, and a promotion
+                reloads it. ``model_path`` is used until the manifest lists the model.
+            model_name (str, optional): Name of the model the bundle follows in the manifest.
+        """
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.feature_config = feature_config
+        self.check_interval = check_interval
+        self.outlier_bounds_path = outlier_bounds_path
+        self.classes = classes
+        self.manifest_path = manifest_path
+        self.model_name = model_name
+
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self.reload_count = 0
+        self.failed_reloads = 0
+        self.last_reload_seconds = None
+        self._listeners = []
+
+        start = time.perf_counter()
+        self._bundle = self._load(version=1)
+        self.load_seconds = time.perf_counter() - start
+        logger.info(f"Artifacts loaded in {self.load_seconds:.3f}s")
+
+    def _model_path(self) -> str:
+        if self.manifest_path and self.model_name:
+            return read_active_path(self.manifest_path, self.model_name) or self.model_path
+        return self.model_path
+
+    def _paths(self, model_path: str) -> List[str]:
+        paths = [model_path, self.scaler_path]
+        if self.outlier_bounds_path:
+            paths.append(self.outlier_bounds_path)
+        if self.manifest_path and os.path.exists(self.manifest_path):
+            paths.append(self.manifest_path)
+        return paths
+
+    def _mtimes(self, model_path: str = None) -> Dict[str, int]:
+        return {path: os.stat(path).st_mtime_ns for path in self._paths(model_path or self._model_path())}
+
+    def _load(self, version: int) -> ArtifactBundle:
+        # Read the modification times first: if a file changes while we are
+        # loading it, the next check sees a newer mtime and reloads again.
+        # A promotion changes the manifest, hence the mtimes, and the model path.
+        model_path = self._model_path()
+        mtimes = self._mtimes(model_path)
+        service = ModelService(model_path, classes=self.classes)
+        transformer = FeatureTransformer(**self.feature_config)
+        transformer.load_scaler(self.scaler_path)
+        if self.outlier_bounds_path:
+            transformer.load_outlier_bounds(self.outlier_bounds_path)
+        return ArtifactBundle(service, transformer, version, mtimes)
+
+    def add_reload_listener(self, listener) -> None:
+        """
+        Registers a callable invoked with the new bundle after every reload.
+        """
+        self._listeners.append(listener)
+
+    def current(self) -> ArtifactBundle:
+        """
+        Returns the active bundle, reloading it first if the files on disk changed.
+        """
+        self.reload_if_changed()
+        return self._bundle
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        Reloads the artifacts when any of the files on disk changed.
+
+        The new bundle is fully loaded before it replaces the active one, so
+        concurrent requests keep using the previous artifacts until the swap.
+        A failed reload (e.g. a file that is still being written) is logged and
+        the previous bundle stays active.
+
+        Args:
+            force (bool): Reload even if the files did not change.
+
+        Returns:
+            bool: True if a new bundle was swapped in.
+        """
+        if not force and time.monotonic() - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                if not force and self._mtimes() == self._bundle.mtimes:
+                    return False
+
+                start = time.perf_counter()
+                bundle = self._load(version=self._bundle.version + 1)
+                self.last_reload_seconds = time.perf_counter() - start
+            except Exception as e:
+                self.failed_reloads += 1
+                logger.error(f"Error reloading artifacts, keeping version {self._bundle.version}: {e}")
+                return False
+
+            self._bundle = bundle
+            self.reload_count += 1
+            logger.info(f"Artifacts reloaded to version {bundle.version} in {self.last_reload_seconds:.3f}s")
+
+        for listener in self._listeners:
+            listener(bundle)
+        return True
+
+    def stats(self) -> dict:
+        """
+        Returns load and reload timings of the registry.
+        """
+        return {
+            "version": self._bundle.version,
+            "load_seconds": self.load_seconds,
+            "last_reload_seconds": self.last_reload_seconds,
+            "reload_count": self.reload_count,
+            "failed_reloads": self.failed_reloads,
+        }
@@ -0,0 +1,85 @@
+import logging
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _check_columns(available, columns: List[str]) -> None:
+    missing = [col for col in columns if col not in available]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+
+def iter_csv_chunks(fileobj: BinaryIO, columns: List[str], chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Reads a CSV file in chunks of ``chunk_size`` rows.
+
+    Args:
+        fileobj (BinaryIO): Open CSV file or file-like object.
+        columns (list[str]): Columns to extract, in order.
+        chunk_size (int): Number of rows per chunk.
+
+    Yields:
+        np.ndarray: float64 array of shape (rows, len(columns)).
+    """
+    reader = pd.read_csv(fileobj, usecols=lambda col: col in columns, chunksize=chunk_size)
+    for chunk in reader:
+        _check_columns(chunk.columns, columns)
+        yield np.ascontiguousarray(chunk[columns].to_numpy(dtype=np.float64))
+
+
+def iter_arrow_chunks(source: Union[bytes, BinaryIO], columns: List[str], chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Reads an Arrow IPC payload (stream or file format) in chunks of ``chunk_size`` rows.
+
+    From a seekable file, record batches are read one at a time, so only one
+    batch is in memory whatever the size of the payload.
+
+    pyarrow is an optional dependency and is only imported here.
+
+    Args:
+        source (bytes | BinaryIO): The payload, or a seekable binary file holding it.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    import pyarrow as pa
+
+    def open_source():
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return pa.BufferReader(source)
+        source.seek(0)
+        return pa.PythonFile(source, mode="r")
+
+    try:
+        batches = iter(pa.ipc.open_stream(open_source()))
+    except pa.ArrowInvalid:
+        reader = pa.ipc.open_file(open_source())
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+    for batch in batches:
+        _check_columns(batch.schema.names, columns)
+        for start in range(0, batch.num_rows, chunk_size):
+            part = batch.slice(start, chunk_size)
+            yield np.column_stack([
+                part.column(col).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+                for col in columns
+            ])
+
+
+def iter_column_chunks(data: Dict[str, list], columns: List[str], chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Slices column-oriented arrays (``{"col": [v1, v2, ...]}``) into chunks of ``chunk_size`` rows.
+    """
+    _check_columns(data.keys(), columns)
+    arrays = [np.asarray(data[col], dtype=np.float64) for col in columns]
+    lengths = {len(a) for a in arrays}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    values = np.column_stack(arrays)
+    for start in range(0, len(values), chunk_size):
+        yield values[start:start + chunk_size]
@@ -0,0 +1,47 @@
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def seconds_since_process_start() -> float:
+    """
+    Returns how long ago the current process was launched, read from /proc.
+    Returns None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the command name; the start time is field 22 of the whole line.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ColdStartTimer:
+    """
+    Records milestones of the startup, in seconds since the process was launched.
+
+    Where the launch time cannot be read, the milestones are measured from the
+    creation of the timer instead.
+    """
+    def __init__(self):
+        elapsed = seconds_since_process_start()
+        self.from_process_launch = elapsed is not None
+        self._origin = time.perf_counter() - (elapsed or 0.0)
+        self.marks = {}
+
+    def mark(self, name: str) -> None:
+        """
+        Records the milestone ``name`` the first time it is reached.
+        """
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self._origin
+            logger.info(f"Cold start: {name} after {self.marks[name]:.3f}s")
+
+    def stats(self) -> dict:
+        return {"from_process_launch": self.from_process_launch, **self.marks}
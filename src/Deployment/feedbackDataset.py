@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+INDEX_FILE = "_index.json"
+# Columns kept as strings, every other column is stored as float64.
+STRING_COLUMNS = ("received_at", "date")
+
+
+class FeedbackDataset:
+    """
+    Feedback log compacted into Arrow IPC files partitioned by the day it was received.
+
+    Layout::
+
+        <root>/_index.json
+        <root>/day=2024-05-01/part-00000.arrow
+        <root>/day=2024-05-02/part-00000.arrow
+
+    The index records the backend cursor already compacted and, per day, its
+    files and row count, so queries open only the partitions of the requested
+    range. The files are uncompressed Arrow so they are read by memory mapping.
+    pyarrow is an optional dependency and is only imported by the methods that
+    touch the files.
+    """
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Directory of the dataset, created on first compaction.
+        """
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+
+    def load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {"cursor": 0, "partitions": {}}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _normalize(records: pd.DataFrame) -> pd.DataFrame:
+        # Fixed dtypes so every part of the dataset has the same Arrow schema.
+        records = records.copy()
+        for col in records.columns:
+            if col in STRING_COLUMNS:
+                records[col] = records[col].astype(str)
+            else:
+                records[col] = pd.to_numeric(records[col], errors="coerce").astype("float64")
+        return records
+
+    def compact(self, backend) -> dict:
+        """
+        Moves the records appended to the feedback log since the last compaction into the dataset.
+
+        Args:
+            backend: Feedback backend exposing ``read_since(cursor)``.
+
+        Returns:
+            dict: Number of compacted rows, touched partitions, elapsed seconds and new cursor.
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        try:
+            start = time.perf_counter()
+            index = self.load_index()
+            records, cursor = backend.read_since(index["cursor"])
+            days = []
+            if len(records):
+                records = self._normalize(records)
+                received = pd.to_datetime(records["received_at"], utc=True, format="ISO8601")
+                for day, part in records.groupby(received.dt.strftime("%Y-%m-%d"), sort=True):
+                    partition = index["partitions"].setdefault(day, {"files": [], "rows": 0})
+                    directory = os.path.join(self.root, f"day={day}")
+                    os.makedirs(directory, exist_ok=True)
+                    name = f"part-{len(partition['files']):05d}.arrow"
+                    table = pa.Table.from_pandas(part.reset_index(drop=True), preserve_index=False)
+                    feather.write_feather(table, os.path.join(directory, name), compression="uncompressed")
+                    partition["files"].append(name)
+                    partition["rows"] += len(part)
+                    days.append(day)
+            os.makedirs(self.root, exist_ok=True)
+            # Saved last: a crash before this line only leaves orphan files and
+            # the same records are compacted again on the next run.
+            index["cursor"] = cursor
+            self._save_index(index)
+
+            elapsed = time.perf_counter() - start
+            stats = {"rows": len(records), "partitions": days, "seconds": elapsed, "cursor": cursor}
+            logger.info(f"Compacted {len(records)} feedback records into {len(days)} partitions in {elapsed:.2f}s")
+            return stats
+        except Exception as e:
+            logger.error(f"Error compacting feedback into {self.root}: {e}")
+            raise
+
+    def read(self, start: Optional[str] = None, end: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Loads the feedback received between two days.
+
+        Args:
+            start (str, optional): First day included, as ``YYYY-MM-DD``.
+            end (str, optional): Last day included, as ``YYYY-MM-DD``.
+            columns (list[str], optional): Columns to load, all by default.
+
+        Returns:
+            pd.DataFrame: The matching records, oldest first.
+        """
+        import pyarrow as pa
+
+        index = self.load_index()
+        tables = []
+        for day in sorted(index["partitions"]):
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            for name in index["partitions"][day]["files"]:
+                source = pa.memory_map(os.path.join(self.root, f"day={day}", name), "r")
+                table = pa.ipc.open_file(source).read_all()
+                tables.append(table.select(columns) if columns is not None else table)
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        return pa.concat_tables(tables).to_pandas()
+
+    def evaluate(self, classes: List[str], start: Optional[str] = None, end: Optional[str] = None) -> dict:
+        """
+        Scores the predictions of the feedback received between two days against the actual labels.
+
+        The partitions are read one record batch at a time, each only updating
+        the confusion matrix of a ``streamingMetricsEvaluation``, so memory stays
+        constant whatever the number of records.
+
+        Args:
+            classes (list[str]): Class names, in the order of the class indices stored in the log.
+            start (str, optional): First day included, as ``YYYY-MM-DD``.
+            end (str, optional): Last day included, as ``YYYY-MM-DD``.
+
+        Returns:
+            dict: The metrics of ``streamingMetricsEvaluation.metrics``.
+        """
+        import pyarrow as pa
+        from src.modelEvaluate.streamingMetrics import streamingMetricsEvaluation
+
+        evaluator = streamingMetricsEvaluation(classes)
+        index = self.load_index()
+        for day in sorted(index["partitions"]):
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            for name in index["partitions"][day]["files"]:
+                reader = pa.ipc.open_file(pa.memory_map(os.path.join(self.root, f"day={day}", name), "r"))
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    evaluator.update(batch.column("actual").to_numpy(zero_copy_only=False),
+                                     batch.column("prediction").to_numpy(zero_copy_only=False))
+        return evaluator.metrics()
+
+    def stats(self) -> dict:
+        index = self.load_index()
+        partitions = index["partitions"]
+        return {
+            "partitions": len(partitions),
+            "rows": sum(p["rows"] for p in partitions.values()),
+            "first_day": min(partitions) if partitions else None,
+            "last_day": max(partitions) if partitions else None,
+            "cursor": index["cursor"],
+        }
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from src.Deployment.artifactRegistry import ArtifactRegistry
+from src.Deployment.modelService import ModelService
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when the inference executor has no free slot for a new job."""
+
+
+# Registry owned by each worker of a process pool, loaded once by the initializer.
+_worker_registry = None
+
+def _init_worker(registry_kwargs: dict) -> None:
+    global _worker_registry
+    _worker_registry = ArtifactRegistry(**registry_kwargs)
+
+def _warmup_worker() -> int:
+    return _worker_registry.current().version
+
+def _predict_in_worker(X: np.ndarray) -> np.ndarray:
+    return _worker_registry.current().predict(X)
+
+
+class InferenceExecutor:
+    def __init__(self, registry: ArtifactRegistry, kind: str = "thread", max_workers: int = 1, max_queue: int = 16):
+        """
+        Dedicated, bounded executor for CPU-bound inference.
+
+        Args:
+            registry (ArtifactRegistry): Registry used by the thread pool. In process mode
+                each worker builds its own registry from the same paths and config.
+            kind (str): "thread" or "process".
+            max_workers (int): Number of worker threads or processes.
+            max_queue (int): Number of jobs allowed to wait for a free worker. Further
+                submissions are rejected with ExecutorSaturatedError.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+        if kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+            self._fn = lambda X, service=None: registry.current().predict(X, service)
+        else:
+            registry_kwargs = {
+                "model_path": registry.model_path,
+                "scaler_path": registry.scaler_path,
+                "feature_config": registry.feature_config,
+                "check_interval": registry.check_interval,
+                "outlier_bounds_path": registry.outlier_bounds_path,
+                "classes": registry.classes,
+                "manifest_path": registry.manifest_path,
+                "model_name": registry.model_name,
+            }
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(registry_kwargs,))
+            self._fn = _predict_in_worker
+            # Start every worker now so the model is loaded before the first request.
+            for future in [self._pool.submit(_warmup_worker) for _ in range(max_workers)]:
+                future.result()
+        logger.info(f"Inference executor started: {kind} x{max_workers}, max pending {self.max_pending}")
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def submit(self, X: np.ndarray, service: ModelService = None) -> Future:
+        """
+        Schedules a prediction on the pool.
+
+        Args:
+            X (np.ndarray): Raw input rows.
+            service (ModelService, optional): Model to use instead of the registry's model.
+                Only supported by the thread pool, process workers serve their own model.
+
+        Raises:
+            ExecutorSaturatedError: If ``max_workers + max_queue`` jobs are already pending.
+        """
+        if service is not None and self.kind == "process":
+            raise ValueError("Selecting a model is not supported by the process executor")
+        args = (X,) if service is None else (X, service)
+        return self._submit(self._fn, *args)
+
+    def submit_job(self, fn, *args) -> Future:
+        """
+        Schedules a whole request job, ``fn(*args)``, in the same bounded slots as the predictions.
+
+        The job runs every blocking part of a request off the event loop, not
+        only the model call: input validation and conversion, the artifact
+        reload check and cold model loads. Only supported by the thread pool,
+        whose jobs share the registry of the API.
+
+        Raises:
+            ExecutorSaturatedError: If ``max_workers + max_queue`` jobs are already pending.
+        """
+        if self.kind != "thread":
+            raise ValueError("Request jobs are only supported by the thread executor")
+        return self._submit(fn, *args)
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturatedError(f"{self._pending} inference jobs pending")
+            self._pending += 1
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, X: np.ndarray, service: ModelService = None) -> np.ndarray:
+        """
+        Awaits a prediction without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(X, service))
+
+    async def run_job(self, fn, *args):
+        """
+        Awaits a request job (see ``submit_job``) without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit_job(fn, *args))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
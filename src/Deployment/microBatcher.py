@@ -0,0 +1,156 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class MicroBatcher:
+    """
+    Dynamic batching layer in front of a vectorized predict function.
+
+    Callers submit row blocks from any thread. A single worker thread collects
+    them until ``max_batch_size`` rows are queued or ``max_wait_ms`` elapsed
+    since the first one arrived, runs one predict call on the concatenated
+    rows and scatters the results back to the waiting callers.
+    """
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+        Initializes the batcher and starts its worker thread.
+
+        Args:
+            predict_fn (Callable): Function mapping an (n, k) array to n predictions.
+            max_batch_size (int): Maximum number of rows in one predict call. A single
+                submission larger than this is still predicted in one call.
+            max_wait_ms (float): Maximum time to wait for more rows after the first one.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._buckets = self._bucket_bounds(max_batch_size)
+        self._histogram = {bound: 0 for bound in self._buckets}
+        self._max_queue_depth = 0
+        self._batches = 0
+        self._requests = 0
+        self._rows = 0
+
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _bucket_bounds(max_batch_size: int) -> list:
+        bounds = [1]
+        while bounds[-1] < max_batch_size:
+            bounds.append(bounds[-1] * 2)
+        return bounds + [float("inf")]
+
+    def submit(self, X: np.ndarray) -> Future:
+        """
+        Queues a block of rows for prediction.
+
+        Args:
+            X (np.ndarray): Rows to predict.
+
+        Returns:
+            Future: Resolves to the predictions of exactly these rows.
+        """
+        future = Future()
+        self._queue.put((X, future))
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+        return future
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Submits the rows and blocks until their predictions are ready.
+        """
+        return self.submit(X).result()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            items = [item]
+            rows = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+                rows += len(item[0])
+
+            self._process(items, rows)
+            if stop:
+                return
+
+    def _process(self, items: list, rows: int) -> None:
+        try:
+            X = items[0][0] if len(items) == 1 else np.concatenate([x for x, _ in items])
+            preds = self.predict_fn(X)
+        except Exception as e:
+            logger.error(f"Error in batched prediction of {rows} rows: {e}")
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for x, future in items:
+            end = start + len(x)
+            future.set_result(preds[start:end])
+            start = end
+
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(items)
+            self._rows += rows
+            for bound in self._buckets:
+                if rows <= bound:
+                    self._histogram[bound] += 1
+                    break
+
+    def close(self) -> None:
+        """
+        Stops the worker thread once every queued submission has been processed.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth and batch-size statistics.
+
+        The histogram maps the upper bound of each bucket (in rows) to the
+        number of predict calls whose batch fell in it.
+        """
+        with self._stats_lock:
+            histogram = {("inf" if bound == float("inf") else str(bound)): count for bound, count in self._histogram.items()}
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "batches": self._batches,
+                "requests": self._requests,
+                "rows": self._rows,
+                "mean_batch_rows": self._rows / self._batches if self._batches else 0.0,
+                "batch_rows_histogram": histogram,
+            }
@@ -1,15 +1,309 @@
+import json
+import logging
+import os
 import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+class BoosterClassifier:
+    """
+    Minimal classifier interface over a raw xgboost Booster loaded from its native format.
+    Predicts the encoded class index, like XGBClassifier.predict.
+    """
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, data):
+        import xgboost
+        probs = self.booster.predict(xgboost.DMatrix(data))
+        if probs.ndim == 1:
+            return (probs > 0.5).astype(int)
+        return probs.argmax(axis=1)
+
+
 class ModelService:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, classes: List[str] = None, version: str = None):
+        """
+        Loads a model for serving.
+
+        Args:
+            model_path (str): Path to the model: a pickle, a CatBoost ``.cbm`` or an
+                XGBoost ``.ubj``/``.json`` booster.
+            classes (list[str], optional): Class names of a model trained on label-encoded
+                targets. When given, numeric predictions are mapped back to these names;
+                models that already predict the names are left as they are.
+            version (str, optional): Version of the model in a ``ModelRegistry``.
+        """
+        self.path = model_path
+        self.version = version
+        self.classes = np.asarray(classes) if classes is not None else None
+        start = time.perf_counter()
         self.model = self._load_model(model_path)
+        self.load_seconds = time.perf_counter() - start
+        self.size_bytes = os.path.getsize(model_path)
 
     def _load_model(self, model_path: str):
+        # Native formats only need the booster library itself, not the
+        # training stack that unpickling the sklearn wrappers pulls in.
+        extension = os.path.splitext(model_path)[1]
+        if extension == ".cbm":
+            from catboost import CatBoostClassifier
+            model = CatBoostClassifier()
+            model.load_model(model_path, format="cbm")
+            return model
+        if extension in (".ubj", ".json"):
+            import xgboost
+            booster = xgboost.Booster()
+            booster.load_model(model_path)
+            return BoosterClassifier(booster)
         with open(model_path, "rb") as f:
             model = pickle.load(f)
         return model
 
     def predict(self, data: pd.DataFrame):
+        preds = self.model.predict(data)
+        if self.classes is not None and np.issubdtype(np.asarray(preds).dtype, np.number):
+            preds = self.classes[np.asarray(preds).astype(int).ravel()]
+        return preds
+
+
+def read_active_path(manifest_path: str, name: str) -> str:
+    """
+    Returns the path of the active version of ``name`` in a model manifest, or None
+    if the manifest does not exist or does not list the model.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as f:
+        spec = json.load(f).get(name)
+    return spec["versions"][spec["active"]] if spec else None
+
+
+class ModelRegistry:
+    """
+    Named, versioned models loaded lazily and kept in an LRU with a memory cap.
+
+    Every model name points to an active version. Promoting a version loads it
+    first and then swaps the pointer, so requests never wait on a cold load.
+
+    With a manifest, registered versions and active pointers are saved to a
+    JSON file that overrides the ``models`` of the config, so a version
+    registered or promoted by another process (e.g. incremental training) is
+    picked up on the next check.
+    """
+    def __init__(self, models: Dict[str, dict], classes: List[str] = None, max_memory_mb: float = 512,
+                 manifest_path: str = None, check_interval: float = 5.0):
+        """
+        Args:
+            models (dict): ``{name: {"active": version, "versions": {version: path}, "encoded_labels": bool}}``.
+            classes (list[str], optional): Class names used to decode models with ``encoded_labels``.
+            max_memory_mb (float): Budget for the loaded models, estimated from their size on disk.
+                The least recently used models are unloaded above it.
+            manifest_path (str, optional): JSON file the registered versions and active pointers
+                are saved to and reloaded from, in the layout of ``models``.
+            check_interval (float): Minimum number of seconds between two checks of the manifest.
+        """
+        self.classes = classes
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self._versions = {name: dict(spec["versions"]) for name, spec in models.items()}
+        self._encoded = {name: spec.get("encoded_labels", False) for name, spec in models.items()}
+        self._active = {name: spec["active"] for name, spec in models.items()}
+
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._cache = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._listeners = []
+
+        self.manifest_path = manifest_path
+        self.check_interval = check_interval
+        self._last_check = time.monotonic()
+        self._manifest_mtime = None
+        if manifest_path and os.path.exists(manifest_path):
+            self._apply_manifest()
+
+    def _apply_manifest(self) -> List[str]:
+        # Returns the models whose active version changed.
+        mtime = os.stat(self.manifest_path).st_mtime_ns
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+        changed = []
+        with self._lock:
+            for name, spec in manifest.items():
+                self._versions.setdefault(name, {}).update(spec["versions"])
+                self._encoded[name] = spec.get("encoded_labels", self._encoded.get(name, False))
+                if self._active.get(name) != spec["active"]:
+                    self._active[name] = spec["active"]
+                    changed.append(name)
+            self._manifest_mtime = mtime
+        return changed
+
+    def _save_manifest(self) -> None:
+        if not self.manifest_path:
+            return
+        with self._lock:
+            manifest = {
+                name: {"active": self._active[name], "versions": dict(versions), "encoded_labels": self._encoded[name]}
+                for name, versions in self._versions.items() if name in self._active
+            }
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+
+    def reload_manifest_if_changed(self) -> bool:
+        """
+        Applies the manifest when another process changed it, at most every ``check_interval`` seconds.
+
+        Returns:
+            bool: True if an active version changed.
+        """
+        if not self.manifest_path or time.monotonic() - self._last_check < self.check_interval:
+            return False
+        self._last_check = time.monotonic()
+        try:
+            if not os.path.exists(self.manifest_path) or os.stat(self.manifest_path).st_mtime_ns == self._manifest_mtime:
+                return False
+            changed = self._apply_manifest()
+        except Exception as e:
+            logger.error(f"Error reloading the model manifest {self.manifest_path}: {e}")
+            return False
+        for name in changed:
+            logger.info(f"Model {name} switched to version {self._active[name]} by the manifest")
+            for listener in self._listeners:
+                listener(name, self._active[name])
+        return bool(changed)
+
+    def add_promote_listener(self, listener) -> None:
+        """
+        Registers a callable invoked with the model name and version after every promotion.
+        """
+        self._listeners.append(listener)
+
+    def active_version(self, name: str) -> str:
+        if name not in self._active:
+            raise KeyError(f"Unknown model: {name}")
+        return self._active[name]
+
+    def names(self) -> List[str]:
+        return list(self._versions)
+
+    def active_path(self, name: str) -> str:
+        """
+        Returns the path of the active version of a model.
+        """
+        return self._versions[name][self.active_version(name)]
+
+    def next_version(self, name: str) -> str:
+        """
+        Returns the first free ``v<n>`` version name of a model.
+        """
+        versions = self._versions.get(name, {})
+        n = len(versions) + 1
+        while f"v{n}" in versions:
+            n += 1
+        return f"v{n}"
+
+    def register(self, name: str, version: str, path: str, encoded_labels: bool = None) -> None:
+        """
+        Declares a new version of a model without loading or activating it.
+        """
+        with self._lock:
+            self._versions.setdefault(name, {})[version] = path
+            if encoded_labels is not None or name not in self._encoded:
+                self._encoded[name] = bool(encoded_labels)
+        self._save_manifest()
+
+    def _load(self, name: str, version: str) -> ModelService:
+        key = (name, version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            if name not in self._versions or version not in self._versions[name]:
+                raise KeyError(f"Unknown model {name}:{version}")
+            path = self._versions[name][version]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available;
+        # the per-key lock makes concurrent requests share a single load.
+        with load_lock:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return self._cache[key]
+            try:
+                service = ModelService(path, classes=self.classes if self._encoded[name] else None, version=version)
+            except ImportError as e:
+                raise RuntimeError(f"Model {name}:{version} needs {e.name}, which is not installed") from e
+            logger.info(f"Loaded model {name}:{version} from {path} in {service.load_seconds:.3f}s")
+
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = service
+                self._memory_bytes += service.size_bytes
+                while self._memory_bytes > self.max_memory_bytes and len(self._cache) > 1:
+                    (old_name, old_version), old = self._cache.popitem(last=False)
+                    self._memory_bytes -= old.size_bytes
+                    self.evictions += 1
+                    logger.info(f"Evicted model {old_name}:{old_version} from memory")
+                self._load_locks.pop(key, None)
+            return service
+
+    def get(self, name: str) -> ModelService:
+        """
+        Returns the active version of a model, loading it on first use.
+        """
+        self.reload_manifest_if_changed()
+        if name not in self._active:
+            raise KeyError(f"Unknown model: {name}")
+        return self._load(name, self._active[name])
+
+    def get_version(self, name: str, version: str) -> ModelService:
+        """
+        Returns a given version of a model, active or not, loading it on first use.
+        """
+        return self._load(name, version)
+
+    def promote(self, name: str, version: str) -> ModelService:
+        """
+        Makes ``version`` the active version of ``name``.
+
+        The version is loaded before the pointer is swapped, so in-flight and
+        following requests keep a warm model throughout.
+        """
+        service = self._load(name, version)
+        with self._lock:
+            previous = self._active.get(name)
+            self._active[name] = version
+        self._save_manifest()
+        logger.info(f"Promoted model {name} from {previous} to {version}")
+        for listener in self._listeners:
+            listener(name, version)
+        return service
 
-        return self.model.predict(data)
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active": dict(self._active),
+                "loaded": [f"{name}:{version}" for name, version in self._cache],
+                "memory_mb": self._memory_bytes / (1024 * 1024),
+                "max_memory_mb": self.max_memory_bytes / (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
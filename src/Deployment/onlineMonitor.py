@@ -0,0 +1,237 @@
+import json
+import logging
+import math
+import os
+import threading
+from bisect import bisect_right
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.modelEvaluate.metrics import metrics_from_confusion_matrix
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Floor of a bin proportion in the PSI, so an empty bin does not make it infinite.
+PSI_EPSILON = 1e-4
+
+
+def build_feature_reference(data: pd.DataFrame, columns: List[str], bins: int = 10) -> dict:
+    """
+    Summarizes the training distribution of ``columns`` for the online monitor.
+
+    ``data`` holds raw values, as ``/feedback`` receives them, before outlier
+    capping: a capped reference would put every live value above the cap in
+    the last bin and report drift that is not there.
+
+    Every column is cut at its training quantiles into ``bins`` bins of about
+    equal mass, open at both ends (tied quantiles are merged, e.g. the dry days
+    of ``precipitation``).
+
+    Returns:
+        dict: Per column, the inner bin ``edges``, the training ``proportions`` of
+        the bins and the training ``quantiles``.
+    """
+    features = {}
+    for col in columns:
+        values = data[col].dropna().to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        features[col] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / len(values)).tolist(),
+            "quantiles": dict(zip(map(str, QUANTILES), np.quantile(values, QUANTILES).tolist())),
+        }
+    return {"rows": len(data), "bins": bins, "features": features}
+
+
+def save_feature_reference(reference: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+
+
+def population_stability_index(live: np.ndarray, reference: np.ndarray) -> float:
+    """
+    PSI of the live bin proportions against the reference ones: ``sum((p - q) * ln(p / q))``.
+    Below 0.1 the distributions are usually considered stable, above 0.25 shifted.
+    """
+    p = np.maximum(live, PSI_EPSILON)
+    q = np.maximum(reference, PSI_EPSILON)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+class OnlineMonitor:
+    """
+    Accuracy and input drift of the served model, fed by ``/feedback``.
+
+    The last ``window_size`` feedback events are kept in fixed ring buffers:
+    the label codes, the raw feature values and their bin in the training
+    histogram. Each event evicts the oldest one and updates the running hit
+    count, the window's confusion matrix and the window's histograms in O(1)
+    (a bisection over the ~10 bin edges), so memory is fixed by the window
+    size. Metrics, PSI and window quantiles are derived on read.
+
+    ``retrain_recommended`` is set once the window holds ``min_events``
+    labelled events and the rolling accuracy falls below ``min_accuracy`` or
+    a feature's PSI exceeds ``psi_threshold``.
+    """
+    def __init__(self, classes: List[str], reference: dict = None, window_size: int = 1000, min_events: int = 100,
+                 min_accuracy: float = 0.6, psi_threshold: float = 0.2):
+        """
+        Args:
+            classes (list[str]): Class names, in the order of the class indices of the feedback.
+            reference (dict, optional): Training distribution of the monitored features, see
+                ``build_feature_reference``. Without it only the accuracy is monitored.
+            window_size (int): Number of most recent feedback events the metrics cover.
+            min_events (int): Events needed in the window before recommending a retraining.
+            min_accuracy (float): Rolling accuracy below which a retraining is recommended.
+            psi_threshold (float): Feature PSI above which a retraining is recommended.
+        """
+        self.classes = list(classes)
+        self.window_size = window_size
+        self.min_events = min_events
+        self.min_accuracy = min_accuracy
+        self.psi_threshold = psi_threshold
+        self.reference = reference["features"] if reference else {}
+        self.features = list(self.reference)
+        self._edges = [self.reference[col]["edges"] for col in self.features]
+
+        n_classes = len(self.classes)
+        self._true = np.full(window_size, -1, dtype=np.int64)
+        self._pred = np.full(window_size, -1, dtype=np.int64)
+        self._values = np.full((window_size, len(self.features)), np.nan)
+        self._bins = np.full((window_size, len(self.features)), -1, dtype=np.int64)
+        self._confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self._histograms = [np.zeros(len(edges) + 1, dtype=np.int64) for edges in self._edges]
+        self._hits = 0
+        self._labelled = 0
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def _code(self, label) -> int:
+        if isinstance(label, str):
+            return self.classes.index(label) if label in self.classes else -1
+        try:
+            code = float(label)
+        except (TypeError, ValueError):
+            return -1
+        if not math.isfinite(code) or code != int(code) or not 0 <= code < len(self.classes):
+            return -1
+        return int(code)
+
+    def _evict(self, pos: int) -> None:
+        true, pred = self._true[pos], self._pred[pos]
+        if true >= 0 and pred >= 0:
+            self._confusion[true, pred] -= 1
+            self._hits -= int(true == pred)
+            self._labelled -= 1
+        for i, b in enumerate(self._bins[pos]):
+            if b >= 0:
+                self._histograms[i][b] -= 1
+
+    def observe(self, features: dict, prediction, actual) -> None:
+        """
+        Adds one feedback event to the window, evicting the oldest one when it is full.
+
+        Args:
+            features (dict): Raw input values of the event; missing or non-numeric values are ignored.
+            prediction: Predicted class, as a name or a class index.
+            actual: True class, as a name or a class index.
+        """
+        true, pred = self._code(actual), self._code(prediction)
+        values = []
+        for col in self.features:
+            try:
+                values.append(float(features.get(col)))
+            except (TypeError, ValueError):
+                values.append(math.nan)
+
+        with self._lock:
+            pos = self.events % self.window_size
+            if self.events >= self.window_size:
+                self._evict(pos)
+            self._true[pos], self._pred[pos] = true, pred
+            if true >= 0 and pred >= 0:
+                self._confusion[true, pred] += 1
+                self._hits += int(true == pred)
+                self._labelled += 1
+            for i, value in enumerate(values):
+                self._values[pos, i] = value
+                b = bisect_right(self._edges[i], value) if math.isfinite(value) else -1
+                self._bins[pos, i] = b
+                if b >= 0:
+                    self._histograms[i][b] += 1
+            self.events += 1
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Events seen, rolling accuracy and per-class metrics and confusion counts
+            of the window, per feature its PSI, window histogram and quantiles next to the
+            training ones, and ``retrain_recommended`` with its ``reasons``.
+        """
+        with self._lock:
+            filled = min(self.events, self.window_size)
+            confusion = self._confusion.copy()
+            hits, labelled = self._hits, self._labelled
+            histograms = [h.copy() for h in self._histograms]
+            values = self._values[:filled].copy()
+
+        metrics = metrics_from_confusion_matrix(confusion, self.classes)
+        accuracy = hits / labelled if labelled else None
+        features = {}
+        for i, col in enumerate(self.features):
+            counts = histograms[i]
+            total = int(counts.sum())
+            live = counts / total if total else np.zeros(len(counts))
+            column = values[:, i]
+            column = column[~np.isnan(column)]
+            features[col] = {
+                "psi": population_stability_index(live, np.asarray(self.reference[col]["proportions"])) if total else None,
+                "histogram": counts.tolist(),
+                "reference_proportions": self.reference[col]["proportions"],
+                "quantiles": dict(zip(map(str, QUANTILES), np.quantile(column, QUANTILES).tolist())) if len(column) else None,
+                "reference_quantiles": self.reference[col]["quantiles"],
+            }
+
+        reasons = []
+        if labelled >= self.min_events and accuracy < self.min_accuracy:
+            reasons.append(f"rolling accuracy {accuracy:.3f} below {self.min_accuracy}")
+        if filled >= self.min_events:
+            reasons += [f"{col} PSI {stats['psi']:.3f} above {self.psi_threshold}" for col, stats in features.items()
+                        if stats["psi"] is not None and stats["psi"] > self.psi_threshold]
+        return {
+            "events": self.events,
+            "window_events": filled,
+            "labelled_events": labelled,
+            "rolling_accuracy": accuracy,
+            "per_class": metrics["per_class"],
+            "macro_f1": metrics["macro_avg"]["f1"],
+            "confusion_matrix": confusion.tolist(),
+            "features": features,
+            "retrain_recommended": bool(reasons),
+            "reasons": reasons,
+        }
+
+
+def create_online_monitor(config: dict, classes: List[str]) -> OnlineMonitor:
+    """
+    Builds the monitor described by the ``monitoring`` section of the config.
+    Drift is only monitored when the feature reference of the training data exists.
+    """
+    reference = None
+    if os.path.exists(config["reference_path"]):
+        with open(config["reference_path"], "r") as f:
+            reference = json.load(f)
+        missing = [col for col in config["feature_columns"] if col not in reference["features"]]
+        if missing:
+            logger.warning(f"No training reference for {missing}, their drift is not monitored")
+        reference["features"] = {col: ref for col, ref in reference["features"].items() if col in config["feature_columns"]}
+    else:
+        logger.warning(f"No feature reference at {config['reference_path']}, only the accuracy is monitored")
+    return OnlineMonitor(classes, reference, window_size=config["window_size"], min_events=config["min_events"],
+                         min_accuracy=config["min_accuracy"], psi_threshold=config["psi_threshold"])
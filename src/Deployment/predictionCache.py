@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class PredictionCache:
+    """
+    In-process LRU cache of per-row predictions with a time-to-live.
+
+    Keys hash the raw model inputs of a row together with the model version,
+    so a reloaded or promoted model never serves a stale prediction even
+    before ``clear`` is called.
+    """
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600):
+        """
+        Args:
+            max_size (int): Maximum number of cached rows; the least recently used are evicted.
+            ttl_seconds (float): Lifetime of an entry.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def keys(X: np.ndarray, model_key: str) -> List[bytes]:
+        """
+        Hashes every row of raw inputs with the model key.
+
+        Rows are normalized to contiguous float64 (and -0.0 to 0.0) so that the
+        same values always give the same key whatever the JSON number format.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64) + 0.0
+        prefix = model_key.encode()
+        return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).digest() for row in X]
+
+    def lookup(self, keys: List[bytes]) -> Tuple[list, List[int]]:
+        """
+        Returns the cached prediction of every key (None for misses) and the indices of the misses.
+        """
+        now = time.monotonic()
+        values = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    missing.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                values[i] = entry[1]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        return values, missing
+
+    def store(self, keys: List[bytes], preds) -> None:
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key, pred in zip(keys, preds):
+                self._entries[key] = (expires, pred)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, *args) -> None:
+        """
+        Drops every entry. Accepts and ignores arguments so it can be used as a reload listener.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+        logger.info("Prediction cache invalidated")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
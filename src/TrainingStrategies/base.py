@@ -8,6 +8,17 @@ class Model(ABC):
     Abstract base class for all ML models.
     Defines a standard interface for training, predicting, evaluating, saving, and loading models.
     """
+    # Constructor argument limiting the number of threads the model trains with, if any.
+    threads_param = None
+    # Whether the model must be trained on integer labels instead of class names.
+    requires_encoded_labels = False
+    # Constructor argument taking ``{label: weight}`` class weights, if any.
+    class_weight_param = None
+    # Constructor arguments needed to train next to other models in parallel processes.
+    worker_params = {}
+    # File format of ``export_native``, the library's own format, if the model has one.
+    native_format = None
+
     def __init__(self):
         """
         Initialize the model object.
@@ -38,4 +49,22 @@ class Model(ABC):
         if self.model is None:
             raise ValueError("No model to save. Train a model first.")
         pickle.dump(self.model, open(path, "wb"))
-        print(f"Model saved at {path}")
\ No newline at end of file
+        print(f"Model saved at {path}")
+
+
+class BoosterModel(Model):
+    """
+    Base class of the gradient boosters, which train in rounds and report a
+    validation curve, as the hyperparameter search needs.
+    """
+    # Constructor argument setting the number of boosting rounds.
+    rounds_param = None
+
+    @abstractmethod
+    def train_with_eval(self, X_train: pd.DataFrame, y_train: pd.Series, X_val: pd.DataFrame, y_val: pd.Series,
+                        init_model: Any = None) -> list:
+        """
+        Train while evaluating on a validation set, optionally continuing from ``init_model``.
+        Returns the validation loss after every boosting round.
+        """
+        pass
@@ -1,7 +1,14 @@
-from .base import Model
+from .base import BoosterModel
 from catboost import CatBoostClassifier
 
-class CatboostModel(Model):
+class CatboostModel(BoosterModel):
+    threads_param = "thread_count"
+    rounds_param = "iterations"
+    class_weight_param = "class_weights"
+    # Parallel processes would otherwise race on the same ./catboost_info directory.
+    worker_params = {"allow_writing_files": False}
+    native_format = "cbm"
+
     def __init__(self, **kwargs):
         """
         Initialize the catboost model.
@@ -9,14 +16,34 @@ class CatboostModel(Model):
         """
         self.model = CatBoostClassifier(random_state=42, **kwargs)
 
-    def train(self, X_train, y_train):
+    def train(self, X_train, y_train, init_model=None):
         """
         Train the model on the provided training data.
+        With ``init_model`` (a CatBoost model or a .cbm path), training continues
+        from its trees instead of starting from scratch.
+        """
+        self.model.fit(X_train, y_train, init_model=init_model)
+
+    def train_with_eval(self, X_train, y_train, X_val, y_val, init_model=None):
+        """
+        Train while evaluating on a validation set. Returns the validation loss after every iteration.
         """
-        self.model.fit(X_train, y_train)
+        # Concurrent trials would otherwise share the catboost_info directory.
+        self.model.set_params(allow_writing_files=False)
+        self.model.fit(X_train, y_train, eval_set=(X_val, y_val), init_model=init_model, verbose=False)
+        return list(next(iter(self.model.get_evals_result()["validation"].values())))
 
     def predict(self, X):
         """
         Predict class labels for the given input data.
         """
-        return self.model.predict(X)
\ No newline at end of file
+        return self.model.predict(X)
+
+    def export_native(self, path):
+        """
+        Save the model in CatBoost's binary format (.cbm).
+        """
+        if self.model is None:
+            raise ValueError("No model to save. Train a model first.")
+        self.model.save_model(path, format="cbm")
+        print(f"Model exported at {path}")
@@ -0,0 +1,44 @@
+from .base import BoosterModel
+from lightgbm import LGBMClassifier
+
+class LightGBMModel(BoosterModel):
+    threads_param = "n_jobs"
+    rounds_param = "n_estimators"
+    native_format = "txt"
+    class_weight_param = "class_weight"
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the LightGBM model.
+        You can pass hyperparameters via kwargs.
+        lightgbm is an optional dependency, only imported when this strategy is used.
+        """
+        self.model = LGBMClassifier(random_state=42, verbosity=-1, **kwargs)
+
+    def train(self, X_train, y_train):
+        """
+        Train the model on the provided training data.
+        """
+        self.model.fit(X_train, y_train)
+
+    def train_with_eval(self, X_train, y_train, X_val, y_val, init_model=None):
+        """
+        Train while evaluating on a validation set. Returns the validation loss after every round.
+        """
+        self.model.fit(X_train, y_train, eval_set=[(X_val, y_val)], init_model=init_model)
+        return list(next(iter(self.model.evals_result_["valid_0"].values())))
+
+    def predict(self, X):
+        """
+        Predict class labels for the given input data.
+        """
+        return self.model.predict(X)
+
+    def export_native(self, path):
+        """
+        Save the booster in LightGBM's text format.
+        """
+        if self.model is None:
+            raise ValueError("No model to save. Train a model first.")
+        self.model.booster_.save_model(path)
+        print(f"Model exported at {path}")
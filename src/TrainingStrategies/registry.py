@@ -0,0 +1,24 @@
+import importlib
+
+# Model strategies by name, imported only when used so that training one
+# model does not load every library.
+MODEL_STRATEGIES = {
+    "catboost": "src.TrainingStrategies.catboost.CatboostModel",
+    "xgboost": "src.TrainingStrategies.xgboost.XGBoostModel",
+    "lightgbm": "src.TrainingStrategies.lightgbm.LightGBMModel",
+    "hist_gradient_boosting": "src.TrainingStrategies.sklearnModels.HistGradientBoostingModel",
+    "random_forest": "src.TrainingStrategies.sklearnModels.RandomForestModel",
+    "extra_trees": "src.TrainingStrategies.sklearnModels.ExtraTreesModel",
+    "knn": "src.TrainingStrategies.sklearnModels.KNNModel",
+    "decision_tree": "src.TrainingStrategies.sklearnModels.DecisionTreeModel",
+}
+
+
+def load_strategy(name: str):
+    """
+    Returns the Model subclass registered under ``name``.
+    """
+    if name not in MODEL_STRATEGIES:
+        raise ValueError(f"Unknown model strategy: {name}")
+    module, cls = MODEL_STRATEGIES[name].rsplit(".", 1)
+    return getattr(importlib.import_module(module), cls)
@@ -0,0 +1,62 @@
+from .base import Model
+from sklearn.ensemble import ExtraTreesClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+
+class SklearnModel(Model):
+    """
+    Shared train/predict of the scikit-learn classifiers. Subclasses set ``estimator``.
+    """
+    estimator = None
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the estimator, with random_state=42 when it accepts one.
+        You can pass hyperparameters via kwargs.
+        """
+        if "random_state" in self.estimator().get_params():
+            kwargs.setdefault("random_state", 42)
+        self.model = self.estimator(**kwargs)
+
+    def train(self, X_train, y_train):
+        """
+        Train the model on the provided training data.
+        """
+        self.model.fit(X_train, y_train)
+
+    def predict(self, X):
+        """
+        Predict class labels for the given input data.
+        """
+        return self.model.predict(X)
+
+
+class RandomForestModel(SklearnModel):
+    estimator = RandomForestClassifier
+    threads_param = "n_jobs"
+    class_weight_param = "class_weight"
+
+
+class ExtraTreesModel(SklearnModel):
+    estimator = ExtraTreesClassifier
+    threads_param = "n_jobs"
+    class_weight_param = "class_weight"
+
+
+class HistGradientBoostingModel(SklearnModel):
+    """
+    LightGBM-style histogram gradient boosting, without the extra dependency.
+    Its ``class_weight`` fails on string labels, so it trains without class weights.
+    """
+    estimator = HistGradientBoostingClassifier
+
+
+class KNNModel(SklearnModel):
+    estimator = KNeighborsClassifier
+    threads_param = "n_jobs"
+
+
+class DecisionTreeModel(SklearnModel):
+    estimator = DecisionTreeClassifier
+    class_weight_param = "class_weight"
@@ -1,19 +1,37 @@
-from .base import Model
+from .base import BoosterModel
 from xgboost import XGBClassifier
 
-class XGBoostModel(Model):
-    def __init__(self, **kwargs):
+class XGBoostModel(BoosterModel):
+    threads_param = "n_jobs"
+    requires_encoded_labels = True
+    rounds_param = "n_estimators"
+    native_format = "ubj"
+    class_weight_param = "class_weight"
+
+    def __init__(self, class_weight=None, **kwargs):
         """
         Initialize the XGBoost model.
         You can pass hyperparameters via kwargs.
+        XGBoost has no class weights, so ``class_weight`` is applied as per-row sample weights.
         """
+        self.class_weight = class_weight
         self.model = XGBClassifier(random_state=42, verbosity=0, **kwargs)
 
-    def train(self, X_train, y_train):
+    def train(self, X_train, y_train, init_model=None):
         """
         Train the model on the provided training data.
+        With ``init_model`` (a booster, an XGBoost model or a saved model path),
+        new boosting rounds are added to it instead of starting from scratch.
+        """
+        sample_weight = y_train.map(self.class_weight).to_numpy() if self.class_weight else None
+        self.model.fit(X_train, y_train, sample_weight=sample_weight, xgb_model=init_model)
+
+    def train_with_eval(self, X_train, y_train, X_val, y_val, init_model=None):
         """
-        self.model.fit(X_train, y_train)
+        Train while evaluating on a validation set. Returns the validation loss after every round.
+        """
+        self.model.fit(X_train, y_train, eval_set=[(X_val, y_val)], xgb_model=init_model, verbose=False)
+        return list(next(iter(self.model.evals_result()["validation_0"].values())))
 
     def predict(self, X):
         """
@@ -21,3 +39,11 @@ class XGBoostModel(Model):
         """
         return self.model.predict(X)
 
+    def export_native(self, path):
+        """
+        Save the booster in XGBoost's binary JSON format (use a .ubj extension).
+        """
+        if self.model is None:
+            raise ValueError("No model to save. Train a model first.")
+        self.model.save_model(path)
+        print(f"Model exported at {path}")
@@ -0,0 +1,128 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.Deployment.artifactRegistry import ArtifactRegistry
+from src.modelEvaluate.streamingMetrics import streamingMetricsEvaluation
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Bundle loaded once per worker process by the pool initializer.
+_worker_bundle = None
+
+def _init_worker(model_path: str, scaler_path: str, feature_config: dict, outlier_bounds_path: str = None,
+                 classes: List[str] = None) -> None:
+    global _worker_bundle
+    _worker_bundle = ArtifactRegistry(model_path, scaler_path, feature_config, outlier_bounds_path=outlier_bounds_path,
+                                      classes=classes).current()
+
+def _predict_chunk(X: np.ndarray) -> np.ndarray:
+    return _worker_bundle.predict(X)
+
+
+class BatchScorer:
+    def __init__(self, model_path: str, scaler_path: str, feature_config: dict, chunk_size: int = 50000, workers: int = 1,
+                 outlier_bounds_path: str = None, label_column: str = None, classes: List[str] = None):
+        """
+        Offline scorer for weather CSVs of any size.
+
+        Args:
+            model_path (str): Path to the model to score with.
+            scaler_path (str): Path to the scaler, as JSON parameters or a pickled scaler strategy.
+            feature_config (dict): Arguments of the FeatureTransformer.
+            chunk_size (int): Number of rows read, predicted and written at a time.
+            workers (int): Number of worker processes. With 1, chunks are scored in-process.
+            outlier_bounds_path (str, optional): Outlier bounds JSON the raw inputs are capped to.
+            label_column (str, optional): Column of the true labels. When the input has it,
+                the predictions are evaluated against it as they are written.
+            classes (list[str], optional): Class names, used to decode the predictions of
+                label-encoded models and required to evaluate the predictions.
+        """
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.feature_config = feature_config
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.outlier_bounds_path = outlier_bounds_path
+        self.label_column = label_column
+        self.classes = classes
+
+    def _write(self, chunk: pd.DataFrame, preds: np.ndarray, output_path: str, header: bool,
+               evaluator: streamingMetricsEvaluation = None) -> None:
+        if evaluator is not None and self.label_column in chunk:
+            evaluator.update(chunk[self.label_column].to_numpy(), preds)
+        chunk = chunk.assign(prediction=np.asarray(preds).ravel())
+        chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+
+    def score(self, input_path: str, output_path: str) -> dict:
+        """
+        Scores ``input_path`` chunk by chunk and appends the predictions to ``output_path``.
+
+        Every input column is kept and a ``prediction`` column is added. In
+        multiprocessing mode at most ``2 * workers`` chunks are in flight, so
+        memory stays bounded by the chunk size whatever the file size. When the
+        input has ``label_column``, every chunk also updates a
+        ``streamingMetricsEvaluation``, which only holds a confusion matrix.
+
+        Returns:
+            dict: Number of rows and chunks, elapsed seconds and rows/sec, and the
+            ``metrics`` of the predictions when the input has labels.
+        """
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            reader = pd.read_csv(input_path, chunksize=self.chunk_size)
+            start = time.perf_counter()
+            rows = 0
+            chunks = 0
+            evaluator = streamingMetricsEvaluation(self.classes) if self.label_column and self.classes else None
+
+            if self.workers <= 1:
+                bundle = ArtifactRegistry(self.model_path, self.scaler_path, self.feature_config,
+                                          outlier_bounds_path=self.outlier_bounds_path, classes=self.classes).current()
+                for chunk in reader:
+                    preds = bundle.predict(bundle.transformer.inputs_from_frame(chunk))
+                    self._write(chunk, preds, output_path, header=chunks == 0, evaluator=evaluator)
+                    rows += len(chunk)
+                    chunks += 1
+            else:
+                columns = self.feature_config["input_columns"]
+                initargs = (self.model_path, self.scaler_path, self.feature_config, self.outlier_bounds_path, self.classes)
+                with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                    in_flight = deque()
+                    for chunk in reader:
+                        X = np.ascontiguousarray(chunk[columns].to_numpy(dtype=np.float64))
+                        in_flight.append((chunk, pool.submit(_predict_chunk, X)))
+                        while len(in_flight) >= 2 * self.workers:
+                            done, future = in_flight.popleft()
+                            self._write(done, future.result(), output_path, header=chunks == 0, evaluator=evaluator)
+                            rows += len(done)
+                            chunks += 1
+                    while in_flight:
+                        done, future = in_flight.popleft()
+                        self._write(done, future.result(), output_path, header=chunks == 0, evaluator=evaluator)
+                        rows += len(done)
+                        chunks += 1
+
+            elapsed = time.perf_counter() - start
+            stats = {
+                "rows": rows,
+                "chunks": chunks,
+                "seconds": elapsed,
+                "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+            }
+            logger.info(f"Scored {rows} rows in {chunks} chunks in {elapsed:.2f}s ({stats['rows_per_second']:.0f} rows/sec)")
+            if evaluator is not None and evaluator.count:
+                stats["metrics"] = evaluator.metrics()
+                logger.info(f"Accuracy {stats['metrics']['accuracy']:.4f}, macro F1 {stats['metrics']['macro_avg']['f1']:.4f} "
+                            f"on {evaluator.count} labelled rows ({evaluator.skipped} skipped)")
+            return stats
+        except Exception as e:
+            logger.error(f"Error in batch scoring of {input_path}: {e}")
+            raise
@@ -1,4 +1,6 @@
 import logging
+from typing import Iterator
+
 import pandas as pd
 
 
@@ -35,4 +37,21 @@ class dataIngest:
             return data
         except Exception as e:
             logging.error(f"Error loading data from {self.file_path}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Yields the data ``chunk_size`` rows at a time, so the file never has to fit in memory.
+
+        Args:
+            chunk_size (int): Number of rows per chunk.
+
+        Raises:
+            Exception: If an error occurs while reading the data.
+        """
+        try:
+            for chunk in pd.read_csv(self.file_path, chunksize=chunk_size):
+                yield chunk
+        except Exception as e:
+            logging.error(f"Error reading data from {self.file_path}: {e}")
+            raise
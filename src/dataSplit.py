@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from src.stepCache import hash_frame
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def fold_indices(split: dict, fold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the row positions of the training and validation parts of a fold.
+    """
+    train, folds = split["train"], split["folds"]
+    return train[folds != fold], train[folds == fold]
+
+
+class SplitIndex:
+    """
+    Train/test split of a dataset, persisted as index arrays.
+
+    The split is keyed on the content hash of the data and on its parameters,
+    and stored as a ``.npz`` of row positions: ``train``, ``test`` and, with
+    ``n_folds``, ``folds``, the stratified fold of every training row (-1
+    without folds). A run on unchanged data loads the same split instead of
+    drawing it again, so every model and every run is evaluated on the same
+    rows, and the folds can be reused by cross-validation.
+    """
+    def __init__(self, directory: str = ".cache/splits"):
+        self.directory = directory
+
+    def key(self, data: pd.DataFrame, params: dict) -> str:
+        digest = hashlib.sha256(hash_frame(data).encode())
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _create(self, data: pd.DataFrame, target: str, test_size: float, random_state: int, stratify: bool,
+                n_folds: int) -> dict:
+        positions = np.arange(len(data), dtype=np.int32 if len(data) < 2**31 else np.int64)
+        y = data[target].to_numpy()
+        train, test = train_test_split(positions, test_size=test_size, random_state=random_state,
+                                       stratify=y if stratify else None)
+        train.sort()
+        test.sort()
+
+        folds = np.full(len(train), -1, dtype=np.int8)
+        if n_folds:
+            splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+            for fold, (_, val) in enumerate(splitter.split(train, y[train])):
+                folds[val] = fold
+        return {"train": train, "test": test, "folds": folds}
+
+    def load_or_create(self, data: pd.DataFrame, target: str = "weather", test_size: float = 0.2,
+                       random_state: int = 42, stratify: bool = True, n_folds: int = 0) -> Tuple[dict, bool]:
+        """
+        Returns the split of ``data``, drawing and saving it if it is not stored yet.
+
+        Args:
+            data (pd.DataFrame): Features and target column.
+            target (str): The target column name.
+            test_size (float): Share of the rows held out for testing.
+            random_state (int): Seed of the split and of the folds.
+            stratify (bool): Keep the class proportions in the test set.
+            n_folds (int): Number of stratified folds of the training rows, 0 for none.
+
+        Returns:
+            tuple: The split (``train``, ``test``, ``folds``, ``key``) and whether it was just created.
+        """
+        try:
+            params = {"target": target, "test_size": test_size, "random_state": random_state,
+                      "stratify": stratify, "n_folds": n_folds}
+            key = self.key(data, params)
+            path = os.path.join(self.directory, f"{key}.npz")
+            if os.path.exists(path):
+                with np.load(path) as saved:
+                    split = {name: saved[name] for name in saved.files}
+                logger.info(f"Loaded split {key[:12]}: {len(split['train'])} train, {len(split['test'])} test rows")
+                return {**split, "key": key}, False
+
+            split = self._create(data, target, test_size, random_state, stratify, n_folds)
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **split)
+            os.replace(tmp_path, path)
+            logger.info(f"Created split {key[:12]}: {len(split['train'])} train, {len(split['test'])} test rows, {n_folds} folds")
+            return {**split, "key": key}, True
+        except Exception as e:
+            logger.error(f"Error loading or creating the data split: {e}")
+            raise
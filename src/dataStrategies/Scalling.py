@@ -31,7 +31,7 @@ class StandardScalerStrategy(ScalingStrategy):
         
         try:
             data = self.scaler.fit_transform(data)
-            logging.info(f"StandardScaler fit and transformed on column: {data}")
+            logging.debug(f"StandardScaler fit and transformed on column: {data}")
             return data
         except Exception as e:
             logging.error(f"Error in fit_transform: {e}")
@@ -49,8 +49,21 @@ class StandardScalerStrategy(ScalingStrategy):
         """
         try:
             data = self.scaler.transform(data)
-            logging.info(f"StandardScaler transformed on column: {data}")
+            logging.debug(f"StandardScaler transformed on column: {data}")
             return data
         except Exception as e:
             logging.error(f"Error in transform: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def partial_fit(self, data):
+        """
+        Updates the running mean and variance of the scaler with a chunk of data.
+
+        Args:
+            data (pd.DataFrame): A chunk of the columns to scale.
+        """
+        try:
+            self.scaler.partial_fit(data)
+        except Exception as e:
+            logging.error(f"Error in partial_fit: {e}")
+            raise
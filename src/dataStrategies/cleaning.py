@@ -1,4 +1,5 @@
 from .base import DataStrategy
+from .dedupIndex import hash_rows
 import logging
 
 class DropColumnsStrategy(DataStrategy):
@@ -24,6 +25,17 @@ class DropColumnsStrategy(DataStrategy):
             raise
 
 class DropDuplicatesStrategy(DataStrategy):
+    def __init__(self, index=None):
+        """
+        Initializes the DropDuplicatesStrategy.
+
+        Args:
+            index (DedupIndex, optional): Hashes of the rows already kept. When given, rows
+                seen in an earlier chunk or run are dropped too, and the new rows are added to it.
+        """
+
+        self.index = index
+
     def handle_data(self, data):
         """
         Drops duplicate rows from the given DataFrame.
@@ -39,7 +51,9 @@ class DropDuplicatesStrategy(DataStrategy):
         """
         try:
             logging.info("Dropping duplicate rows...")
-            return data.drop_duplicates()
+            if self.index is None:
+                return data.drop_duplicates()
+            return data.iloc[self.index.filter_new(hash_rows(data))]
         except Exception as e:
             logging.error(f"Error dropping duplicates: {e}")
             raise
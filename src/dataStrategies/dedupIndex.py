@@ -0,0 +1,206 @@
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def hash_rows(data: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of every row of ``data``, ignoring the index.
+
+    Numbers are hashed as float64, since the dtypes read_csv infers can differ
+    between chunks (1 vs 1.0), and + 0.0 folds -0.0 into 0.0 as
+    ``drop_duplicates`` does.
+    """
+    numeric = data.select_dtypes("number").columns
+    keys = data.astype(dict.fromkeys(numeric, np.float64))
+    keys[numeric] = keys[numeric] + 0.0
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def _save_atomic(path: str, save) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        save(f)
+    os.replace(tmp_path, path)
+
+
+class DedupIndex(ABC):
+    """
+    Set of the row hashes already ingested, shared by every chunk of a run and,
+    when it has a path, by every run.
+    """
+    def __init__(self, path: str = None):
+        self.path = path
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+
+    @abstractmethod
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def add(self, hashes: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        pass
+
+    @abstractmethod
+    def save(self) -> None:
+        pass
+
+    def filter_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Adds the hashes not seen yet to the index.
+
+        Returns:
+            np.ndarray: Positions of the first occurrence of every new hash, in order.
+        """
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        start = time.perf_counter()
+        seen = self.contains(hashes[first])
+        self.lookup_seconds += time.perf_counter() - start
+        self.lookups += len(first)
+        new = first[~seen]
+        self.add(hashes[new])
+        return new
+
+    def __len__(self) -> int:
+        return self.count
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "memory_bytes": self.memory_bytes(),
+            "lookups": self.lookups,
+            "lookups_per_second": self.lookups / self.lookup_seconds if self.lookup_seconds > 0 else 0.0,
+        }
+
+
+class HashSetIndex(DedupIndex):
+    """
+    Exact set of row hashes: a sorted uint64 array, 8 bytes per row, saved as ``.npy``.
+
+    New hashes go to a small sorted array that is merged into the main one once
+    it reaches a quarter of its size, so adding n rows costs O(n log n) overall
+    and a lookup is two binary searches.
+    """
+    def __init__(self, path: str = None, min_merge_size: int = 1 << 16):
+        """
+        Args:
+            path (str, optional): ``.npy`` file the index is loaded from and saved to.
+            min_merge_size (int): Size of the recent array below which it is never merged.
+        """
+        super().__init__(path)
+        self.min_merge_size = min_merge_size
+        self._sorted = np.load(path) if path and os.path.exists(path) else np.empty(0, dtype=np.uint64)
+        self._recent = np.empty(0, dtype=np.uint64)
+
+    @property
+    def count(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    @staticmethod
+    def _in_sorted(values: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        if not len(values):
+            return np.zeros(len(hashes), dtype=bool)
+        idx = np.minimum(np.searchsorted(values, hashes), len(values) - 1)
+        return values[idx] == hashes
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        return self._in_sorted(self._sorted, hashes) | self._in_sorted(self._recent, hashes)
+
+    def add(self, hashes: np.ndarray) -> None:
+        self._recent = np.union1d(self._recent, hashes)
+        if len(self._recent) > max(self.min_merge_size, len(self._sorted) // 4):
+            self._merge()
+
+    def _merge(self) -> None:
+        self._sorted = np.union1d(self._sorted, self._recent)
+        self._recent = np.empty(0, dtype=np.uint64)
+
+    def memory_bytes(self) -> int:
+        return self._sorted.nbytes + self._recent.nbytes
+
+    def save(self) -> None:
+        self._merge()
+        _save_atomic(self.path, lambda f: np.save(f, self._sorted))
+
+
+class BloomFilterIndex(DedupIndex):
+    """
+    Bloom filter over the row hashes, saved as ``.npz``.
+
+    Sized for ``capacity`` rows at ``false_positive_rate``: about
+    ``-ln(p) / ln(2)^2`` bits per row (1.8 bytes at 0.1%) whatever the row. A
+    false positive drops a new row as a duplicate; duplicates are never missed.
+    The ``k`` bit positions of a row come from its 64-bit hash by double hashing.
+    """
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001, path: str = None):
+        """
+        Args:
+            capacity (int): Number of distinct rows the filter is sized for.
+            false_positive_rate (float): Target false-positive rate at ``capacity`` rows.
+            path (str, optional): ``.npz`` file the filter is loaded from and saved to.
+        """
+        super().__init__(path)
+        if path and os.path.exists(path):
+            with np.load(path) as saved:
+                self.bits, self.num_bits, self.num_hashes, self.count = (
+                    saved["bits"], int(saved["num_bits"]), int(saved["num_hashes"]), int(saved["count"]))
+        else:
+            self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+            self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+            self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+            self.count = 0
+        self.capacity = capacity
+
+    def _positions(self, hashes: np.ndarray):
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        positions = (h1[:, None] + np.arange(self.num_hashes, dtype=np.uint64) * h2[:, None]) % np.uint64(self.num_bits)
+        return positions >> np.uint64(3), (positions & np.uint64(7)).astype(np.uint8)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        byte, bit = self._positions(hashes)
+        return ((self.bits[byte] >> bit) & 1).all(axis=1)
+
+    def add(self, hashes: np.ndarray) -> None:
+        byte, bit = self._positions(hashes)
+        np.bitwise_or.at(self.bits, byte.ravel(), np.left_shift(1, bit.ravel()).astype(np.uint8))
+        self.count += len(hashes)
+        if self.count > self.capacity and self.count - len(hashes) <= self.capacity:
+            logger.warning(f"Bloom filter holds {self.count} rows, above its capacity of {self.capacity}: "
+                           f"the false-positive rate is now above its target")
+
+    def memory_bytes(self) -> int:
+        return self.bits.nbytes
+
+    def save(self) -> None:
+        _save_atomic(self.path, lambda f: np.savez(f, bits=self.bits, num_bits=self.num_bits,
+                                                   num_hashes=self.num_hashes, count=self.count))
+
+
+def create_dedup_index(config: dict) -> DedupIndex:
+    """
+    Builds the index described by the ``dedup`` section of the config. Without
+    ``persist`` the index starts empty and is never saved.
+    """
+    if config["kind"] == "hash_set":
+        path = os.path.join(config["directory"], "row-hashes.npy") if config["persist"] else None
+        return HashSetIndex(path)
+    if config["kind"] == "bloom":
+        path = os.path.join(config["directory"], "bloom.npz") if config["persist"] else None
+        return BloomFilterIndex(config["capacity"], config["false_positive_rate"], path)
+    raise ValueError(f"Unknown dedup index: {config['kind']}")
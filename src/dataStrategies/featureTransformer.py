@@ -0,0 +1,247 @@
+import json
+import logging
+import os
+import pickle
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class FeatureTransformer:
+    """
+    Compiled feature chain shared by the training steps and the API.
+
+    The chain is: cap the raw inputs to the fitted outlier bounds (once loaded
+    with ``load_outlier_bounds``), derive new columns from them, apply the
+    configured numpy transformations, then standard-scale. All of it runs in place on a
+    single contiguous float64 array laid out as ``output_columns``.
+
+    scikit-learn is only imported to fit a new scaler or to unpickle one; a
+    scaler saved with ``save_scaler`` as JSON is served with numpy alone.
+    """
+
+    DERIVE_METHODS = ("mean", "diff")
+
+    def __init__(self, input_columns: List[str], derived: List[dict], transformations: List[dict],
+                 columns_to_scale: List[str], scaler=None):
+        """
+        Initializes the transformer and resolves every column to its array index.
+
+        Args:
+            input_columns (list[str]): Raw numeric columns, in the order they are read.
+            derived (list[dict]): Derived columns, each with ``column``, ``method`` and ``inputs``.
+            transformations (list[dict]): Numpy functions to apply, each with ``column`` and ``method``.
+            columns_to_scale (list[str]): Columns standard-scaled at the end of the chain.
+            scaler (StandardScalerStrategy, optional): A fitted scaler. Required by ``transform``.
+        """
+        self.input_columns = list(input_columns)
+        self.output_columns = self.input_columns + [d["column"] for d in derived]
+        self.columns_to_scale = list(columns_to_scale)
+        index = {col: i for i, col in enumerate(self.output_columns)}
+
+        self._derive = []
+        for d in derived:
+            if d["method"] not in self.DERIVE_METHODS:
+                raise ValueError(f"Unknown derive method: {d['method']}")
+            left, right = d["inputs"]
+            self._derive.append((index[d["column"]], d["method"], index[left], index[right]))
+
+        self._transforms = [(index[t["column"]], getattr(np, t["method"])) for t in transformations]
+
+        missing = [col for col in self.columns_to_scale if col not in index]
+        if missing:
+            raise ValueError(f"Columns to scale are not produced by the transformer: {missing}")
+        self._scale_idx = np.array([index[col] for col in self.columns_to_scale], dtype=np.intp)
+        self._scale_all = np.array_equal(self._scale_idx, np.arange(len(self.output_columns)))
+
+        self._clip = []
+        self.scaler = None
+        self._mean = None
+        self._scale = None
+        if scaler is not None:
+            self._set_scaler(scaler)
+
+    @staticmethod
+    def config_slice(config: dict) -> dict:
+        """
+        Extracts the constructor arguments from the project config.
+        """
+        return {
+            "input_columns": config["feature_engineering"]["input_columns"],
+            "derived": config["feature_engineering"]["derived"],
+            "transformations": config["feature_engineering"]["transformations"],
+            "columns_to_scale": config["scaling"]["columns_to_scale"],
+        }
+
+    @classmethod
+    def from_config(cls, config: dict, scaler=None) -> "FeatureTransformer":
+        return cls(scaler=scaler, **cls.config_slice(config))
+
+    def _set_scaler(self, scaler) -> None:
+        self.scaler = scaler
+        self._mean = np.asarray(scaler.scaler.mean_, dtype=np.float64)
+        self._scale = np.asarray(scaler.scaler.scale_, dtype=np.float64)
+
+    def save_scaler(self, path: str) -> None:
+        """
+        Saves the fitted scaling parameters as JSON, loadable without scikit-learn.
+        """
+        if self._mean is None:
+            raise ValueError("The transformer has no fitted scaler.")
+        with open(path, "w") as f:
+            json.dump({"columns": self.columns_to_scale, "mean": self._mean.tolist(), "scale": self._scale.tolist()}, f, indent=2)
+
+    def load_scaler(self, path: str) -> None:
+        """
+        Loads scaling parameters from a ``save_scaler`` JSON file, or unpickles a
+        StandardScalerStrategy for any other extension.
+        """
+        if os.path.splitext(path)[1] != ".json":
+            with open(path, "rb") as f:
+                self._set_scaler(pickle.load(f))
+            return
+
+        with open(path, "r") as f:
+            params = json.load(f)
+        if params["columns"] != self.columns_to_scale:
+            raise ValueError(f"Scaler was fitted on {params['columns']}, expected {self.columns_to_scale}")
+        self.scaler = None
+        self._mean = np.asarray(params["mean"], dtype=np.float64)
+        self._scale = np.asarray(params["scale"], dtype=np.float64)
+
+    def load_outlier_bounds(self, path: str) -> None:
+        """
+        Loads the capping bounds saved by ``IQROutlierEngine.save_bounds``.
+
+        Only the capped input columns are clipped: the rows dropped for the
+        removed columns at training time have no equivalent for a single request.
+        """
+        with open(path, "r") as f:
+            bounds = json.load(f)["cap"]
+        index = {col: i for i, col in enumerate(self.input_columns)}
+        self._clip = [(index[col], b["lower"], b["upper"]) for col, b in bounds.items() if col in index]
+
+    def _engineer_into(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.input_columns):
+            raise ValueError(f"Expected an array of shape (n, {len(self.input_columns)}), got {X.shape}")
+
+        out = np.empty((X.shape[0], len(self.output_columns)), dtype=np.float64)
+        out[:, :X.shape[1]] = X
+        for idx, lower, upper in self._clip:
+            np.clip(out[:, idx], lower, upper, out=out[:, idx])
+        for idx, method, left, right in self._derive:
+            if method == "mean":
+                np.add(out[:, left], out[:, right], out=out[:, idx])
+                out[:, idx] *= 0.5
+            else:
+                np.subtract(out[:, left], out[:, right], out=out[:, idx])
+        for idx, func in self._transforms:
+            func(out[:, idx], out=out[:, idx])
+        return out
+
+    def _scale_inplace(self, out: np.ndarray) -> np.ndarray:
+        if self._mean is None:
+            raise ValueError("The transformer has no fitted scaler.")
+        if self._scale_all:
+            out -= self._mean
+            out /= self._scale
+        else:
+            out[:, self._scale_idx] = (out[:, self._scale_idx] - self._mean) / self._scale
+        return out
+
+    def engineer(self, X: np.ndarray) -> np.ndarray:
+        """
+        Derives and transforms the features without scaling them.
+
+        Args:
+            X (np.ndarray): Raw values laid out as ``input_columns``.
+
+        Returns:
+            np.ndarray: Engineered values laid out as ``output_columns``.
+        """
+        return self._engineer_into(X)
+
+    def fit_scaler(self, features: np.ndarray) -> np.ndarray:
+        """
+        Fits a new StandardScalerStrategy on engineered features and scales them.
+
+        Args:
+            features (np.ndarray): Engineered values laid out as ``output_columns``.
+
+        Returns:
+            np.ndarray: The scaled values.
+        """
+        from .Scalling import StandardScalerStrategy
+
+        features = np.array(features, dtype=np.float64)
+        scaler = StandardScalerStrategy()
+        scaler.fit_transform(pd.DataFrame(features[:, self._scale_idx], columns=self.columns_to_scale))
+        self._set_scaler(scaler)
+        return self._scale_inplace(features)
+
+    def partial_fit_scaler(self, features: np.ndarray) -> None:
+        """
+        Updates the scaler with a chunk of engineered features, starting a new
+        StandardScalerStrategy on the first chunk.
+
+        Args:
+            features (np.ndarray): Engineered values laid out as ``output_columns``.
+        """
+        from .Scalling import StandardScalerStrategy
+
+        if self.scaler is None:
+            self.scaler = StandardScalerStrategy()
+        features = np.asarray(features, dtype=np.float64)
+        self.scaler.partial_fit(pd.DataFrame(features[:, self._scale_idx], columns=self.columns_to_scale))
+        self._set_scaler(self.scaler)
+
+    def scale(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scales already engineered features with the fitted scaler.
+        """
+        return self._scale_inplace(np.array(features, dtype=np.float64))
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Runs the full derive/transform/scale chain on raw values.
+
+        Args:
+            X (np.ndarray): Raw values laid out as ``input_columns``.
+
+        Returns:
+            np.ndarray: Model-ready values laid out as ``output_columns``.
+        """
+        return self._scale_inplace(self._engineer_into(X))
+
+    def inputs_from_frame(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Extracts the raw input columns of a DataFrame as a contiguous float64 array.
+        """
+        missing = [col for col in self.input_columns if col not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        return np.ascontiguousarray(data[self.input_columns].to_numpy(dtype=np.float64))
+
+    def inputs_from_records(self, records: List[dict]) -> np.ndarray:
+        """
+        Builds the raw input array straight from a list of row dicts, without a DataFrame.
+        """
+        try:
+            return np.array([[row[col] for col in self.input_columns] for row in records], dtype=np.float64).reshape(-1, len(self.input_columns))
+        except KeyError as e:
+            raise ValueError(f"Missing required columns: [{e.args[0]!r}]")
+
+    def to_frame(self, values: np.ndarray, index=None) -> pd.DataFrame:
+        return pd.DataFrame(values, columns=self.output_columns, index=index, copy=False)
+
+    def transform_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Runs the full chain on a DataFrame and returns the model-ready features.
+        Columns that are not inputs of the chain (e.g. ``date``) are ignored.
+        """
+        return self.to_frame(self.transform(self.inputs_from_frame(data)), index=data.index)
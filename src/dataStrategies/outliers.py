@@ -1,6 +1,116 @@
 from .base import DataStrategy
+import json
 import logging
 
+import numpy as np
+import pandas as pd
+
+
+class IQROutlierEngine(DataStrategy):
+    """
+    Removes and caps the outliers of several columns in one pass.
+
+    The quartiles of all the columns of a group are computed with a single
+    ``quantile`` call, the rows outside the bounds of any removed column are
+    dropped with one combined mask, and the capped columns are clipped with
+    ``DataFrame.clip``. The bounds of every removed column are computed on the
+    same rows, and the capping bounds on the rows left after the removal.
+
+    The fitted bounds are kept in ``bounds`` and saved as JSON with
+    ``save_bounds``, so the API caps its raw inputs the same way.
+    """
+    def __init__(self, remove_columns=(), cap_columns=(), factor: float = 1.5):
+        """
+        Args:
+            remove_columns (list[str]): Columns whose outlier rows are dropped.
+            cap_columns (list[str]): Columns whose outliers are capped to the bounds.
+            factor (float): Multiple of the IQR added below Q1 and above Q3.
+        """
+        super().__init__()
+        self.remove_columns = list(remove_columns)
+        self.cap_columns = list(cap_columns)
+        self.factor = factor
+        self.bounds = {"remove": {}, "cap": {}}
+
+    def fit_bounds(self, group: str, quartiles: pd.DataFrame) -> None:
+        """
+        Sets the bounds of a column group from its quartiles.
+
+        Args:
+            group (str): ``"remove"`` or ``"cap"``.
+            quartiles (pd.DataFrame): Q1 and Q3 of every column of the group, indexed by 0.25 and 0.75,
+                e.g. ``data[columns].quantile([0.25, 0.75])`` or the estimates of a streaming sketch.
+        """
+        q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+        iqr = q3 - q1
+        lower, upper = q1 - self.factor * iqr, q3 + self.factor * iqr
+        self.bounds[group] = {col: {"lower": float(lower[col]), "upper": float(upper[col])} for col in quartiles.columns}
+
+    def remove_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Returns True for the rows within the bounds of every removed column.
+        """
+        columns = list(self.bounds["remove"])
+        lower = np.array([self.bounds["remove"][col]["lower"] for col in columns])
+        upper = np.array([self.bounds["remove"][col]["upper"] for col in columns])
+        values = data[columns].to_numpy(dtype=np.float64)
+        return ((values >= lower) & (values <= upper)).all(axis=1)
+
+    def cap(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns a copy of ``data`` with the capped columns clipped to their bounds.
+        """
+        columns = list(self.bounds["cap"])
+        lower = pd.Series({col: self.bounds["cap"][col]["lower"] for col in columns})
+        upper = pd.Series({col: self.bounds["cap"][col]["upper"] for col in columns})
+        data = data.copy()
+        data[columns] = data[columns].clip(lower=lower, upper=upper, axis=1)
+        return data
+
+    def handle_data(self, data):
+        """
+        Fits the bounds on ``data``, drops the outlier rows of the removed columns
+        and caps the capped columns.
+
+        Args:
+            data (pd.DataFrame): The DataFrame containing the columns to clean.
+
+        Returns:
+            pd.DataFrame: The cleaned DataFrame.
+        """
+        try:
+            logging.info(f"Handling outliers. Remove: {self.remove_columns}, Cap: {self.cap_columns}")
+            if self.remove_columns:
+                self.fit_bounds("remove", data[self.remove_columns].quantile([0.25, 0.75]))
+                data = data[self.remove_mask(data)]
+
+            if self.cap_columns:
+                self.fit_bounds("cap", data[self.cap_columns].quantile([0.25, 0.75]))
+                data = self.cap(data)
+
+            return data
+
+        except Exception as e:
+            logging.error(f"Error handling outliers: {e}")
+            raise
+
+    def save_bounds(self, path: str) -> None:
+        """
+        Saves the fitted bounds as JSON, see ``FeatureTransformer.load_outlier_bounds``.
+        """
+        with open(path, "w") as f:
+            json.dump({"factor": self.factor, **self.bounds}, f, indent=2)
+
+    def load_bounds(self, path: str) -> None:
+        """
+        Loads the bounds saved by ``save_bounds`` instead of fitting them.
+        """
+        with open(path, "r") as f:
+            saved = json.load(f)
+        self.factor = saved["factor"]
+        self.bounds = {"remove": saved["remove"], "cap": saved["cap"]}
+
+
 class OutliersHandlingStrategy(DataStrategy):
     def __init__(self, column):
         """
@@ -12,7 +122,7 @@ class OutliersHandlingStrategy(DataStrategy):
 
         super().__init__()
         self.columnToClean = column
-        
+
 
 class removingOutliersStrategy(OutliersHandlingStrategy):
     def handle_data(self, data):
@@ -28,21 +138,7 @@ class removingOutliersStrategy(OutliersHandlingStrategy):
         Returns:
             pd.DataFrame: The cleaned DataFrame with outliers removed.
         """
-        
-        try:
-
-            logging.info("Handling outliers...")
-            Q1 = data[self.columnToClean].quantile(0.25)
-            Q3 = data[self.columnToClean].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            data = data[(data[self.columnToClean] >= lower_bound) & (data[self.columnToClean] <= upper_bound)]
-            return data
-        
-        except Exception as e:
-            logging.error(f"Error handling outliers: {e}")
-            raise
+        return IQROutlierEngine(remove_columns=[self.columnToClean]).handle_data(data)
 
 class cappingOutliersStrategy(OutliersHandlingStrategy):
     def handle_data(self, data):
@@ -58,24 +154,4 @@ class cappingOutliersStrategy(OutliersHandlingStrategy):
         Returns:
             pd.DataFrame: The cleaned DataFrame with outliers capped.
         """
-        
-        try:
-            logging.info("Handling outliers...")
-
-            data = data.copy()
-
-            Q1 = data[self.columnToClean].quantile(0.25)
-            Q3 = data[self.columnToClean].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-
-            data.loc[:, self.columnToClean] = data[self.columnToClean].apply(
-                lambda x: lower_bound if x < lower_bound else upper_bound if x > upper_bound else x
-            )
-
-            return data
-
-        except Exception as e:
-            logging.error(f"Error handling outliers: {e}")
-            raise
+        return IQROutlierEngine(cap_columns=[self.columnToClean]).handle_data(data)
@@ -0,0 +1,182 @@
+from .base import DataStrategy
+import logging
+import math
+import time
+import tracemalloc
+
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+
+class ResamplingStrategy(DataStrategy):
+    """
+    Balances the classes of a dataset before training.
+
+    imbalanced-learn is a training-only dependency, imported by the strategies
+    that need it. With ``chunk_size``, data larger than it is split into
+    stratified chunks resampled independently, which bounds the cost of the
+    k-NN searches of SMOTE and ENN by the chunk size.
+
+    After ``handle_data``, ``stats`` holds the rows in and out and the seconds of
+    the resampling, plus its peak memory with ``trace_memory``.
+    """
+    def __init__(self, target: str = "weather", chunk_size: int = None, random_state: int = 42,
+                 trace_memory: bool = False):
+        """
+        Args:
+            target (str): The target column name.
+            chunk_size (int, optional): Resample chunks of about this many rows.
+            random_state (int): Seed of the sampler and of the chunking.
+            trace_memory (bool): Trace the peak memory with tracemalloc, which slows the
+                resampling down, so the seconds are then not comparable with untraced runs.
+        """
+        self.target = target
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+        self.trace_memory = trace_memory
+        self.stats = {}
+
+    def sampler(self):
+        """
+        Returns the imbalanced-learn sampler of the strategy, or None to keep the data as is.
+        """
+        return None
+
+    def class_weights(self, y: pd.Series) -> dict:
+        """
+        Returns the class weights the models should train with, empty when the data itself is balanced.
+        """
+        return {}
+
+    def _resample(self, X: pd.DataFrame, y: pd.Series):
+        sampler = self.sampler()
+        if sampler is None:
+            return X, y
+        return sampler.fit_resample(X, y)
+
+    def handle_data(self, data):
+        """
+        Resamples the data.
+
+        Args:
+            data (pd.DataFrame): Features and target column.
+
+        Returns:
+            pd.DataFrame: The resampled data, with the same columns.
+        """
+        started_tracing = False
+        try:
+            X = data.drop(columns=[self.target])
+            y = data[self.target]
+
+            if self.trace_memory:
+                # Another tracer (e.g. a profiler) keeps running, only its peak is reset.
+                started_tracing = not tracemalloc.is_tracing()
+                if started_tracing:
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            if self.chunk_size and len(data) > self.chunk_size:
+                n_chunks = math.ceil(len(data) / self.chunk_size)
+                folds = StratifiedKFold(n_splits=n_chunks, shuffle=True, random_state=self.random_state)
+                parts = [self._resample(X.iloc[idx], y.iloc[idx]) for _, idx in folds.split(X, y)]
+                X_res = pd.concat([part[0] for part in parts], ignore_index=True)
+                y_res = pd.concat([part[1] for part in parts], ignore_index=True)
+            else:
+                n_chunks = 1
+                X_res, y_res = self._resample(X, y)
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                if started_tracing:
+                    tracemalloc.stop()
+
+            balanced = pd.DataFrame(X_res, columns=X.columns)
+            balanced[self.target] = y_res
+            self.stats = {
+                "rows_in": len(data),
+                "rows_out": len(balanced),
+                "chunks": n_chunks,
+                "seconds": seconds,
+            }
+            memory = ""
+            if peak is not None:
+                self.stats["peak_memory_bytes"] = peak
+                memory = f", peak {peak / 2**20:.1f}MiB"
+            logging.info(f"{type(self).__name__}: {len(data)} -> {len(balanced)} rows in {n_chunks} chunks, "
+                         f"{seconds:.2f}s{memory}")
+            return balanced
+        except Exception as e:
+            if started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            logging.error(f"Error resampling data: {e}")
+            raise
+
+
+class SMOTEENNStrategy(ResamplingStrategy):
+    """
+    SMOTE oversampling followed by Edited Nearest Neighbours cleaning. The most
+    thorough and the slowest: ENN runs an exact k-NN search over all the rows.
+    """
+    def sampler(self):
+        from imblearn.combine import SMOTEENN
+        return SMOTEENN(sampling_strategy="auto", random_state=self.random_state, n_jobs=-1)
+
+
+class SMOTEStrategy(ResamplingStrategy):
+    """
+    SMOTE oversampling alone: synthetic minority rows, without the ENN cleaning pass.
+    """
+    def sampler(self):
+        from imblearn.over_sampling import SMOTE
+        return SMOTE(sampling_strategy="auto", random_state=self.random_state)
+
+
+class RandomOverSamplingStrategy(ResamplingStrategy):
+    """
+    Duplicates random minority rows up to the majority count. No neighbour search.
+    """
+    def sampler(self):
+        from imblearn.over_sampling import RandomOverSampler
+        return RandomOverSampler(sampling_strategy="auto", random_state=self.random_state)
+
+
+class RandomUnderSamplingStrategy(ResamplingStrategy):
+    """
+    Drops random majority rows down to the minority count. The cheapest, and it shrinks the training set.
+    """
+    def sampler(self):
+        from imblearn.under_sampling import RandomUnderSampler
+        return RandomUnderSampler(sampling_strategy="auto", random_state=self.random_state)
+
+
+class ClassWeightStrategy(ResamplingStrategy):
+    """
+    Keeps the data as is and weighs every class by ``n / (n_classes * count)``
+    instead, passed to the models through their ``class_weight_param``.
+    """
+    def class_weights(self, y: pd.Series) -> dict:
+        counts = y.value_counts()
+        return {label: float(len(y) / (len(counts) * count)) for label, count in counts.items()}
+
+
+RESAMPLING_STRATEGIES = {
+    "smoteenn": SMOTEENNStrategy,
+    "smote": SMOTEStrategy,
+    "random_over": RandomOverSamplingStrategy,
+    "random_under": RandomUnderSamplingStrategy,
+    "class_weight": ClassWeightStrategy,
+}
+
+
+def create_resampling_strategy(config: dict, target: str = "weather") -> ResamplingStrategy:
+    """
+    Builds the strategy described by the ``training.resampling`` section of the config.
+    """
+    if config["strategy"] not in RESAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown resampling strategy: {config['strategy']}")
+    return RESAMPLING_STRATEGIES[config["strategy"]](target=target, chunk_size=config.get("chunk_size"),
+                                                     random_state=config.get("random_state", 42),
+                                                     trace_memory=config.get("trace_memory", False))
@@ -0,0 +1,236 @@
+import logging
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.TrainingStrategies.base import BoosterModel
+from src.TrainingStrategies.registry import load_strategy
+from src.dataStrategies.resampling import create_resampling_strategy
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def sample_params(space: dict, rng: np.random.Generator) -> dict:
+    """
+    Draws one value per hyperparameter.
+
+    A list is a set of choices, ``{low, high}`` a uniform range (integers if both
+    bounds are), ``{low, high, log: true}`` a log-uniform range, and anything
+    else a constant.
+    """
+    params = {}
+    for name, dist in space.items():
+        if isinstance(dist, list):
+            params[name] = dist[int(rng.integers(len(dist)))]
+        elif isinstance(dist, dict):
+            low, high = dist["low"], dist["high"]
+            integer = isinstance(low, int) and isinstance(high, int)
+            if dist.get("log"):
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+                params[name] = round(value) if integer else value
+            elif integer:
+                params[name] = int(rng.integers(low, high + 1))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        else:
+            params[name] = dist
+    return params
+
+
+def run_trial(strategy_name: str, params: dict, rounds: int, init_model, data: tuple) -> dict:
+    """
+    Trains ``rounds`` more boosting rounds of one trial. Runs in a worker process of the search.
+
+    Returns:
+        dict: The model, its validation loss per round, fit seconds and prediction latency per 1k rows.
+    """
+    strategy = load_strategy(strategy_name)
+    model = strategy(**params, **{strategy.rounds_param: rounds})
+    X_train, y_train, X_val, y_val = data
+
+    start = time.perf_counter()
+    curve = model.train_with_eval(X_train, y_train, X_val, y_val, init_model=init_model)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict(X_val)
+    predict_seconds = time.perf_counter() - start
+    return {
+        "model": model.model,
+        "curve": curve,
+        "fit_seconds": fit_seconds,
+        "predict_ms_per_1k_rows": predict_seconds * 1000 * 1000 / max(len(X_val), 1),
+    }
+
+
+class HyperparameterSearch:
+    def __init__(self, space: Dict[str, dict], models: Dict[str, dict], classes: List[str], n_trials: int = 9,
+                 min_rounds: int = 50, max_rounds: int = 450, reduction_factor: int = 3, validation_size: float = 0.2,
+                 max_workers: int = 1, threads_per_trial: int = 1, latency_budget_ms_per_1k_rows: float = None,
+                 random_state: int = 42, resampling: dict = None, target: str = "weather"):
+        """
+        Successive-halving search over the hyperparameters of boosted models.
+
+        Every trial first trains ``min_rounds`` rounds. At the end of each rung only
+        the best ``1 / reduction_factor`` of the trials keep training, continuing
+        from their own booster, with ``reduction_factor`` times more rounds, up to
+        ``max_rounds``. Trials are scored on the lowest validation loss of their
+        per-round eval curve, and the selected configuration keeps the number of
+        rounds that reached it. The trials of a rung run in parallel, one process
+        per trial with ``threads_per_trial`` threads.
+
+        The validation rows are held out of the raw training rows first, and only
+        the rest is resampled, so trials are scored on real rows that none of
+        their synthetic training rows was derived from.
+
+        Args:
+            space (dict): ``{model name: {hyperparameter: distribution}}``, see ``sample_params``.
+            models (dict): The ``training.models`` section, to find the strategy of each model.
+            classes (list[str]): Class names, used to encode the labels of models trained on integers.
+            n_trials (int): Number of sampled configurations per model.
+            min_rounds (int): Boosting rounds of the first rung.
+            max_rounds (int): Boosting rounds of the last rung.
+            reduction_factor (int): Fraction of trials dropped and growth of the rounds at each rung.
+            validation_size (float): Share of the training data held out to score the trials.
+            max_workers (int): Number of trials trained at once. With 1, they are trained in-process.
+            threads_per_trial (int): Thread budget of every trial.
+            latency_budget_ms_per_1k_rows (float, optional): The selected configuration must predict
+                1k rows within this budget.
+            random_state (int): Seed of the sampling and the validation split.
+            resampling (dict, optional): The ``training.resampling`` section of the config,
+                applied to the training part of the validation split.
+            target (str): Target column name used by the resampling.
+        """
+        self.space = space
+        self.models = models
+        self.classes = classes
+        self.n_trials = n_trials
+        self.reduction_factor = reduction_factor
+        self.validation_size = validation_size
+        self.max_workers = max_workers
+        self.threads_per_trial = threads_per_trial
+        self.latency_budget = latency_budget_ms_per_1k_rows
+        self.random_state = random_state
+        self.resampling = resampling
+        self.target = target
+
+        self.rungs = [min_rounds]
+        while self.rungs[-1] * reduction_factor < max_rounds:
+            self.rungs.append(self.rungs[-1] * reduction_factor)
+        if self.rungs[-1] < max_rounds:
+            self.rungs.append(max_rounds)
+
+    def _run_rung(self, pool, strategy_name: str, trials: List[dict], budget: int, data: tuple) -> None:
+        args = [(strategy_name, trial["params"], budget - trial["rounds"], trial["model"], data) for trial in trials]
+        if pool is None:
+            results = [run_trial(*arg) for arg in args]
+        else:
+            results = [future.result() for future in [pool.submit(run_trial, *arg) for arg in args]]
+
+        for trial, result in zip(trials, results):
+            # The curve only covers the rounds trained in this rung: the best
+            # round so far may be in it or in an earlier rung.
+            best = int(np.argmin(result["curve"]))
+            if trial["score"] is None or result["curve"][best] < trial["score"]:
+                trial["score"] = result["curve"][best]
+                trial["best_rounds"] = trial["rounds"] + best + 1
+            trial["model"] = result["model"]
+            trial["rounds"] = budget
+            trial["fit_seconds"] += result["fit_seconds"]
+            trial["predict_ms_per_1k_rows"] = result["predict_ms_per_1k_rows"]
+            trial["history"].append({
+                "rounds": budget,
+                "val_loss": result["curve"][-1],
+                "best_val_loss": trial["score"],
+                "fit_seconds": trial["fit_seconds"],
+                "predict_ms_per_1k_rows": trial["predict_ms_per_1k_rows"],
+            })
+
+    def _split(self, X: pd.DataFrame, y: pd.Series) -> tuple:
+        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=self.validation_size, stratify=y,
+                                                          random_state=self.random_state)
+        if self.resampling:
+            strategy = create_resampling_strategy(self.resampling, self.target)
+            balanced = strategy.handle_data(X_train.assign(**{self.target: y_train}))
+            X_train, y_train = balanced.drop(columns=[self.target]), balanced[self.target]
+            logger.info(f"Search training rows resampled from {strategy.stats['rows_in']} to {len(y_train)}, "
+                        f"{len(y_val)} validation rows")
+        return X_train, y_train, X_val, y_val
+
+    def _search_model(self, pool, name: str, split: tuple) -> dict:
+        strategy_name = self.models[name]["strategy"]
+        strategy = load_strategy(strategy_name)
+        if not issubclass(strategy, BoosterModel):
+            raise ValueError(f"Model {name} has no boosting rounds to search with successive halving")
+        X_train, y_train, X_val, y_val = split
+        if strategy.requires_encoded_labels or self.models[name].get("encoded_labels", False):
+            codes = {label: i for i, label in enumerate(self.classes)}
+            y_train, y_val = y_train.map(codes), y_val.map(codes)
+        data = (X_train, y_train, X_val, y_val)
+
+        rng = np.random.default_rng(self.random_state)
+        fixed = {strategy.threads_param: self.threads_per_trial} if strategy.threads_param else {}
+        trials = [
+            {"id": i, "params": {**sample_params(self.space[name], rng), **fixed}, "model": None,
+             "rounds": 0, "score": None, "best_rounds": None, "fit_seconds": 0.0, "history": []}
+            for i in range(self.n_trials)
+        ]
+
+        alive = trials
+        for rung, budget in enumerate(self.rungs):
+            start = time.perf_counter()
+            self._run_rung(pool, strategy_name, alive, budget, data)
+            logger.info(f"{name}: rung {rung} ({budget} rounds) of {len(alive)} trials in {time.perf_counter() - start:.2f}s, "
+                        f"best val loss {min(t['score'] for t in alive):.4f}")
+            if rung < len(self.rungs) - 1:
+                alive = sorted(alive, key=lambda t: t["score"])[:max(1, len(alive) // self.reduction_factor)]
+
+        candidates = alive
+        if self.latency_budget is not None:
+            candidates = [t for t in alive if t["predict_ms_per_1k_rows"] <= self.latency_budget]
+            if not candidates:
+                logger.warning(f"{name}: no trial predicts within {self.latency_budget}ms per 1k rows, keeping the fastest")
+                candidates = [min(alive, key=lambda t: t["predict_ms_per_1k_rows"])]
+        best = min(candidates, key=lambda t: t["score"])
+
+        params = {key: value for key, value in best["params"].items() if key != strategy.threads_param}
+        params[strategy.rounds_param] = best["best_rounds"]
+        logger.info(f"{name}: best trial {best['id']} with val loss {best['score']:.4f}, "
+                    f"{best['predict_ms_per_1k_rows']:.2f}ms per 1k rows: {params}")
+        return {
+            "best_trial": best["id"],
+            "params": params,
+            "trials": [{key: value for key, value in t.items() if key != "model"} for t in trials],
+        }
+
+    def run(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, dict]:
+        """
+        Searches every model of the space.
+
+        Args:
+            X (pd.DataFrame): Raw training rows, not resampled yet.
+            y (pd.Series): Their labels, as class names.
+
+        Returns:
+            dict: Per model, the best trial id, its parameters (including its number of
+            rounds) and every trial with its score, fit time and latency at each rung.
+        """
+        try:
+            start = time.perf_counter()
+            split = self._split(X, y)
+            if self.max_workers <= 1:
+                results = {name: self._search_model(None, name, split) for name in self.space}
+            else:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    results = {name: self._search_model(pool, name, split) for name in self.space}
+            logger.info(f"Hyperparameter search of {len(results)} models completed in {time.perf_counter() - start:.2f}s")
+            return results
+        except Exception as e:
+            logger.error(f"Error in hyperparameter search: {e}")
+            raise
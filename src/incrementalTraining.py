@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TrainingState:
+    """
+    Small JSON file shared by the full and incremental training runs.
+
+    It keeps the feedback cursor consumed by the last incremental run, the
+    last training duration of every model, full and incremental, so the time
+    an incremental run saves can be reported, and the params of the last full
+    training (tuned by the hyperparameter search), which incremental runs reuse.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {"feedback_cursor": 0, "full_training_seconds": {}, "incremental_training_seconds": {}, "model_params": {}}
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        state.setdefault("model_params", {})
+        return state
+
+    def _save(self, state: dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record_training(self, model: str, seconds: float, incremental: bool) -> None:
+        state = self.load()
+        key = "incremental_training_seconds" if incremental else "full_training_seconds"
+        state[key][model] = seconds
+        self._save(state)
+
+    def record_params(self, model: str, params: dict) -> None:
+        state = self.load()
+        state["model_params"][model] = params
+        self._save(state)
+
+    def commit(self, cursor, rows: int) -> dict:
+        """
+        Stores the feedback cursor of a finished incremental run.
+
+        Returns:
+            dict: Rows used and, per model, incremental and full training seconds and the seconds saved.
+        """
+        state = self.load()
+        state["feedback_cursor"] = cursor
+        state["last_incremental_run"] = {"finished_at": datetime.now(timezone.utc).isoformat(), "rows": rows}
+        self._save(state)
+
+        report = {"rows": rows, "models": {}}
+        for model, seconds in state["incremental_training_seconds"].items():
+            full = state["full_training_seconds"].get(model)
+            report["models"][model] = {
+                "incremental_seconds": seconds,
+                "full_seconds": full,
+                "saved_seconds": full - seconds if full is not None else None,
+            }
+        return report
+
+
+def valid_labels(records: pd.DataFrame, classes: List[str]) -> pd.Series:
+    """
+    Returns the numeric ``actual`` of feedback records, NaN where it is not the index of a class.
+    """
+    actual = pd.to_numeric(records["actual"], errors="coerce")
+    valid = (actual >= 0) & (actual < len(classes)) & (actual % 1 == 0)
+    return actual.where(valid)
+
+
+def load_feedback_rows(backend, cursor, transformer: FeatureTransformer, classes: List[str], target: str = "weather") -> Tuple[pd.DataFrame, object]:
+    """
+    Turns the feedback appended since ``cursor`` into processed training rows.
+
+    The raw features go through the serving transformer, so the rows match the
+    processed training data, and the numeric ``actual`` is mapped to its class name.
+    Rows without a valid label are dropped.
+
+    Args:
+        backend: Feedback backend exposing ``read_since(cursor)``.
+        cursor: Cursor stored by the previous run.
+        transformer (FeatureTransformer): Transformer with the fitted scaler.
+        classes (list[str]): Class names, indexed by the numeric label.
+        target (str): Name of the label column.
+
+    Returns:
+        tuple: The processed rows with the label column and the new cursor.
+    """
+    try:
+        records, cursor = backend.read_since(cursor)
+        actual = valid_labels(records, classes)
+        valid = actual.notna()
+        if (~valid).any():
+            logger.warning(f"Dropping {int((~valid).sum())} feedback records without a valid label")
+        records = records[valid.to_numpy()]
+
+        if not len(records):
+            return pd.DataFrame(columns=[*transformer.output_columns, target]), cursor
+        rows = transformer.to_frame(transformer.transform(transformer.inputs_from_frame(records)))
+        rows[target] = np.asarray(classes)[actual[valid].astype(int).to_numpy()]
+        logger.info(f"Loaded {len(rows)} new feedback rows")
+        return rows, cursor
+    except Exception as e:
+        logger.error(f"Error loading feedback rows: {e}")
+        raise
+
+
+def replay_sample(data: pd.DataFrame, rows_per_class: int, target: str = "weather", random_state: int = 42) -> pd.DataFrame:
+    """
+    Draws up to ``rows_per_class`` rows of every class from the previous training data.
+
+    Continued training needs every class in the batch (CatBoost refuses a
+    warm start otherwise) and the replayed rows keep the model from drifting
+    towards the few classes present in recent feedback.
+    """
+    shuffled = data.sample(frac=1, random_state=random_state)
+    return shuffled.groupby(target).head(rows_per_class).reset_index(drop=True)
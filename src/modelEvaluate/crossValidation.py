@@ -0,0 +1,186 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.dataSplit import fold_indices
+from src.dataStrategies.resampling import create_resampling_strategy
+from src.modelEvaluate.metrics import confusion_matrix_counts, metrics_from_confusion_matrix
+from src.trainingOrchestrator import build_model
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Scalar fold results summarized by their mean and standard deviation.
+SUMMARY_KEYS = ("accuracy", "macro_precision", "macro_recall", "macro_f1", "weighted_f1",
+                "resample_seconds", "fit_seconds", "predict_seconds")
+
+# Features and labels of the dataset, set once per worker process by the pool initializer.
+_data = None
+
+
+def _init_worker(X: pd.DataFrame, y: pd.Series) -> None:
+    global _data
+    _data = (X, y)
+
+
+def evaluate_fold(name: str, spec: dict, classes: List[str], fold: int, train_idx: np.ndarray, val_idx: np.ndarray,
+                  resampling: dict = None, target: str = "weather") -> dict:
+    """
+    Trains a model on the training part of a fold and scores it on its validation part.
+    Runs in a worker process of the evaluator, on the data its initializer set.
+
+    Args:
+        name (str): Name of the model in the config.
+        spec (dict): Its config, as accepted by ``train_model``.
+        classes (list[str]): Class names, in the order of the confusion matrix.
+        fold (int): The fold number.
+        train_idx, val_idx (np.ndarray): Row positions of the training and validation parts.
+        resampling (dict, optional): The ``training.resampling`` section of the config, applied
+            to the training part only, so no synthetic row reaches the validation part.
+        target (str): The target column name.
+
+    Returns:
+        dict: The fold's confusion matrix, the metrics derived from it, its row counts
+        and the seconds spent resampling, fitting and predicting.
+    """
+    try:
+        X, y = _data
+        X_train, y_train = X.iloc[train_idx], y.iloc[train_idx]
+
+        start = time.perf_counter()
+        class_weights = None
+        if resampling:
+            strategy = create_resampling_strategy(resampling, target)
+            balanced = strategy.handle_data(X_train.assign(**{target: y_train}))
+            class_weights = strategy.class_weights(y_train) or None
+            X_train, y_train = balanced.drop(columns=[target]), balanced[target]
+        resample_seconds = time.perf_counter() - start
+
+        # Built like the final models, with the worker_params that keep parallel folds
+        # from sharing files (e.g. CatBoost's catboost_info).
+        model, encoded = build_model(name, spec, classes, class_weights)
+        codes = {label: i for i, label in enumerate(classes)}
+        start = time.perf_counter()
+        model.train(X_train, y_train.map(codes) if encoded else y_train)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        preds = np.asarray(model.predict(X.iloc[val_idx])).ravel()
+        predict_seconds = time.perf_counter() - start
+        pred_codes = preds.astype(np.int64) if encoded else pd.Series(preds).map(codes).to_numpy()
+
+        cm = confusion_matrix_counts(y.iloc[val_idx].map(codes).to_numpy(), pred_codes, len(classes))
+        metrics = metrics_from_confusion_matrix(cm, classes)
+        return {
+            "fold": fold,
+            "train_rows": len(X_train),
+            "val_rows": len(val_idx),
+            "resample_seconds": resample_seconds,
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds,
+            "accuracy": metrics["accuracy"],
+            "macro_precision": metrics["macro_avg"]["precision"],
+            "macro_recall": metrics["macro_avg"]["recall"],
+            "macro_f1": metrics["macro_avg"]["f1"],
+            "weighted_f1": metrics["weighted_avg"]["f1"],
+            "per_class": metrics["per_class"],
+            "confusion_matrix": cm.tolist(),
+        }
+    except Exception as e:
+        logger.error(f"Error evaluating model {name} on fold {fold}: {e}")
+        raise
+
+
+def summarize_folds(folds: List[dict], classes: List[str]) -> dict:
+    """
+    Mean and standard deviation of the fold results, and the metrics of the
+    confusion matrix summed over the folds.
+    """
+    values = {key: np.array([fold[key] for fold in folds], dtype=np.float64) for key in SUMMARY_KEYS}
+    pooled = np.sum([fold["confusion_matrix"] for fold in folds], axis=0)
+    return {
+        "mean": {key: float(v.mean()) for key, v in values.items()},
+        "std": {key: float(v.std()) for key, v in values.items()},
+        "pooled": {**metrics_from_confusion_matrix(pooled, classes), "confusion_matrix": pooled.tolist()},
+        "folds": folds,
+    }
+
+
+class CrossValidationEvaluator:
+    def __init__(self, models: Dict[str, dict], classes: List[str], max_workers: int = 1, resampling: dict = None,
+                 target: str = "weather"):
+        """
+        Scores every model on the K folds of a persisted split, in parallel.
+
+        Every (model, fold) pair is a task of a process pool. The dataset is sent
+        once to each worker by the pool initializer rather than with every task,
+        which only carries the row positions of its fold. A fold is scored from
+        a single integer confusion matrix, built with one ``bincount``, from
+        which every metric is derived.
+
+        Args:
+            models (dict): ``{name: spec}`` as accepted by ``train_model``. Specs with
+                ``enabled: false`` are skipped.
+            classes (list[str]): Class names.
+            max_workers (int): Number of folds trained at once. With 1, they are trained in-process.
+            resampling (dict, optional): The ``training.resampling`` section of the config,
+                applied to the training part of every fold.
+            target (str): The target column name.
+        """
+        self.models = {name: spec for name, spec in models.items() if spec.get("enabled", True)}
+        self.classes = classes
+        self.max_workers = max_workers
+        self.resampling = resampling
+        self.target = target
+
+    def run(self, data: pd.DataFrame, split: dict) -> dict:
+        """
+        Args:
+            data (pd.DataFrame): Features and target column, the rows the split indexes.
+            split (dict): The split of ``SplitIndex.load_or_create``, with ``folds``.
+
+        Returns:
+            dict: ``models`` with, per model, the mean and std of the fold metrics and timings,
+            the pooled metrics and every fold's result; the number of folds and the wall-clock seconds.
+        """
+        try:
+            n_folds = int(split["folds"].max()) + 1
+            if n_folds < 2:
+                raise ValueError("The split has no folds, set training.split.n_folds to at least 2")
+
+            X, y = data.drop(columns=[self.target]), data[self.target]
+            tasks = [(name, spec, fold, *fold_indices(split, fold))
+                     for name, spec in self.models.items() for fold in range(n_folds)]
+
+            start = time.perf_counter()
+            if self.max_workers <= 1:
+                _init_worker(X, y)
+                results = [evaluate_fold(name, spec, self.classes, fold, train_idx, val_idx, self.resampling, self.target)
+                           for name, spec, fold, train_idx, val_idx in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks)),
+                                         initializer=_init_worker, initargs=(X, y)) as pool:
+                    futures = [pool.submit(evaluate_fold, name, spec, self.classes, fold, train_idx, val_idx,
+                                           self.resampling, self.target)
+                               for name, spec, fold, train_idx, val_idx in tasks]
+                    results = [future.result() for future in futures]
+            wall = time.perf_counter() - start
+
+            models = {}
+            for name in self.models:
+                folds = [result for (task_name, *_), result in zip(tasks, results) if task_name == name]
+                models[name] = summarize_folds(folds, self.classes)
+                mean, std = models[name]["mean"], models[name]["std"]
+                logger.info(f"{name}: {n_folds}-fold accuracy {mean['accuracy']:.4f} ± {std['accuracy']:.4f}, "
+                            f"macro F1 {mean['macro_f1']:.4f} ± {std['macro_f1']:.4f}, fit {mean['fit_seconds']:.2f}s per fold")
+            logger.info(f"Cross-validated {len(models)} models on {n_folds} folds in {wall:.2f}s wall-clock "
+                        f"with {self.max_workers} workers on {os.cpu_count() or 1} cores")
+            return {"n_folds": n_folds, "wall_seconds": wall, "models": models}
+        except Exception as e:
+            logger.error(f"Error in cross-validation: {e}")
+            raise
@@ -0,0 +1,50 @@
+from typing import List
+
+import numpy as np
+
+
+def confusion_matrix_counts(y_true: np.ndarray, y_pred: np.ndarray, n_classes: int) -> np.ndarray:
+    """
+    Integer confusion matrix of label codes in one ``bincount`` pass: rows are
+    the true classes, columns the predicted ones.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_pred = np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def metrics_from_confusion_matrix(cm: np.ndarray, labels: List[str]) -> dict:
+    """
+    Derives every classification metric from a confusion matrix, without going
+    back to the predictions.
+
+    Args:
+        cm (np.ndarray): Confusion matrix, true classes in rows and predicted classes in columns.
+        labels (list[str]): Class names, in the order of the matrix.
+
+    Returns:
+        dict: Accuracy, per-class precision, recall, F1 and support, and their macro
+        and support-weighted averages, as in ``classification_report`` (0 where undefined).
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    total = support.sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    weights = support / total if total else np.zeros_like(support)
+    return {
+        "accuracy": float(tp.sum() / total) if total else 0.0,
+        "per_class": {
+            label: {"precision": float(p), "recall": float(r), "f1": float(f), "support": int(s)}
+            for label, p, r, f, s in zip(labels, precision, recall, f1, support)
+        },
+        "macro_avg": {"precision": float(precision.mean()), "recall": float(recall.mean()), "f1": float(f1.mean())},
+        "weighted_avg": {"precision": float(precision @ weights), "recall": float(recall @ weights), "f1": float(f1 @ weights)},
+        "support": int(total),
+    }
@@ -0,0 +1,81 @@
+from .base import ModelEvaluate
+from .metrics import confusion_matrix_counts, metrics_from_confusion_matrix
+from typing import List
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class streamingMetricsEvaluation(ModelEvaluate):
+    """
+    Incremental evaluation over prediction chunks, in constant memory.
+
+    Every chunk only updates one integer confusion matrix of the known classes,
+    with a single ``bincount``; precision, recall, F1, accuracy and their macro
+    and weighted averages are derived from it on demand. Labels may be class
+    names or integer class indices (as floats too, like the feedback log).
+    Pairs with a missing or unknown label are counted in ``skipped`` and left
+    out of the matrix.
+    """
+    def __init__(self, classes: List[str]):
+        """
+        Args:
+            classes (list[str]): Class names, in the order of the class indices.
+        """
+        self.classes = list(classes)
+        self.confusion_matrix = np.zeros((len(self.classes), len(self.classes)), dtype=np.int64)
+        self.skipped = 0
+
+    def _codes(self, values) -> np.ndarray:
+        values = np.asarray(values).ravel()
+        if values.dtype.kind in "iuf":
+            codes = np.full(len(values), -1, dtype=np.int64)
+            valid = np.isfinite(values) & (values >= 0) & (values < len(self.classes)) & (values == np.round(values))
+            codes[valid] = values[valid].astype(np.int64)
+            return codes
+        return pd.Categorical(values, categories=self.classes).codes.astype(np.int64)
+
+    def update(self, y_true, y_pred) -> None:
+        """
+        Adds a chunk of labels and predictions to the confusion matrix.
+        """
+        true, pred = self._codes(y_true), self._codes(y_pred)
+        if len(true) != len(pred):
+            raise ValueError(f"{len(true)} labels for {len(pred)} predictions")
+        valid = (true >= 0) & (pred >= 0)
+        self.skipped += int(len(true) - valid.sum())
+        self.confusion_matrix += confusion_matrix_counts(true[valid], pred[valid], len(self.classes))
+
+    def merge(self, other: "streamingMetricsEvaluation") -> None:
+        """
+        Adds the counts of another accumulator over the same classes, e.g. of another worker.
+        """
+        if other.classes != self.classes:
+            raise ValueError("Cannot merge metrics over different classes")
+        self.confusion_matrix += other.confusion_matrix
+        self.skipped += other.skipped
+
+    @property
+    def count(self) -> int:
+        return int(self.confusion_matrix.sum())
+
+    def metrics(self) -> dict:
+        """
+        Returns:
+            dict: The metrics of ``metrics_from_confusion_matrix`` over every chunk seen so far,
+            with the confusion matrix and the number of skipped pairs.
+        """
+        return {**metrics_from_confusion_matrix(self.confusion_matrix, self.classes),
+                "confusion_matrix": self.confusion_matrix.tolist(), "skipped": self.skipped}
+
+    def evaluate(self, y_test, y_predict):
+        try:
+            self.update(y_test, y_predict)
+            return self.metrics()
+        except Exception as e:
+            logger.error(f"Error in evaluating model: {e}")
+            raise
@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def hash_frame(data: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame: its values, index, column names and dtypes.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, data.columns)), list(map(str, data.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_value(value) -> str:
+    if isinstance(value, pd.DataFrame):
+        return hash_frame(value)
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def replace_if_changed(tmp_path: str, path: str) -> bool:
+    """
+    Moves ``tmp_path`` over ``path`` unless both have the same content, so
+    unchanged artifacts keep their modification time (the serving registry
+    reloads on mtime changes). Returns True when ``path`` was replaced.
+    """
+    if os.path.exists(path) and hash_file(tmp_path) == hash_file(path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+class StepCache:
+    """
+    Content-addressed cache of step outputs on local disk.
+
+    An entry is keyed on the step name and the hash of every argument: the
+    content of DataFrames and the JSON of config slices. A step whose inputs
+    did not change returns its pickled output without running, and since the
+    output is unchanged, so are the keys of the steps downstream of it.
+    """
+    def __init__(self, directory: str = ".cache/steps", enabled: bool = True):
+        """
+        Args:
+            directory (str): Directory of the cached outputs, one subdirectory per step.
+            enabled (bool): When False every step runs and nothing is stored.
+        """
+        self.directory = directory
+        self.enabled = enabled
+
+    def key(self, name: str, arguments: dict) -> str:
+        digest = hashlib.sha256(name.encode())
+        for arg_name in sorted(arguments):
+            digest.update(arg_name.encode())
+            digest.update(_hash_value(arguments[arg_name]).encode())
+        return digest.hexdigest()
+
+    def _path(self, name: str, key: str) -> str:
+        return os.path.join(self.directory, name, f"{key}.pkl")
+
+    def load(self, name: str, key: str):
+        """
+        Returns ``(True, output)`` for a cached entry and ``(False, None)`` otherwise.
+        """
+        path = self._path(name, key)
+        if not self.enabled or not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, "rb") as f:
+                return True, pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return False, None
+
+    def store(self, name: str, key: str, output) -> None:
+        if not self.enabled:
+            return
+        path = self._path(name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def cached(self, fn):
+        """
+        Decorator caching ``fn`` on the content of its arguments.
+
+        The wrapper keeps the signature of ``fn`` (``functools.wraps``). Steps
+        call a cached helper rather than being cached themselves, so their
+        logging and error handling run on every call, hit or miss.
+        """
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            start = time.perf_counter()
+            key = self.key(fn.__name__, bound.arguments)
+            hit, output = self.load(fn.__name__, key)
+            if hit:
+                logger.info(f"{fn.__name__}: cache hit {key[:12]} in {time.perf_counter() - start:.3f}s")
+                return output
+            output = fn(*args, **kwargs)
+            self.store(fn.__name__, key, output)
+            logger.info(f"{fn.__name__}: cache miss {key[:12]}, computed in {time.perf_counter() - start:.3f}s")
+            return output
+
+        return wrapper
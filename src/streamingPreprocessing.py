@@ -0,0 +1,280 @@
+import glob
+import logging
+import os
+import time
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from src.dataIngest import dataIngest
+from src.dataStrategies.cleaning import DropDuplicatesStrategy
+from src.dataStrategies.dedupIndex import HashSetIndex, create_dedup_index
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.dataStrategies.outliers import IQROutlierEngine
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream in bounded memory.
+
+    A KLL-style stack of compactors: the items of level ``h`` stand for
+    ``2 ** h`` values each. When a level holds more than ``k`` items it is
+    sorted and every other item, from a random offset, moves up one level,
+    so the sketch keeps ``O(k log(n / k))`` items. The rank error is about
+    ``log2(n / k) / k`` of ``n``; a stream of at most ``k`` values is never
+    compacted and its quantiles are exact.
+    """
+    def __init__(self, k: int = 2048, random_state: int = 42):
+        """
+        Args:
+            k (int): Capacity of a level. Memory and accuracy grow with it.
+            random_state (int): Seed of the compaction offsets.
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, values) -> None:
+        """
+        Adds a batch of values. NaNs are ignored, like ``pd.Series.quantile`` does.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+
+        for h in range(len(self.levels)):
+            level = self.levels[h]
+            if len(level) <= self.k:
+                continue
+            level = np.sort(level)
+            # An odd item out stays at this level so the total weight is exact.
+            # It is the smallest or the largest item at random, and the pairs
+            # promote their first or second item at random, both drawn anew at
+            # every compaction so that no end of the range is favoured.
+            if len(level) % 2:
+                first = int(self._rng.integers(2))
+                keep, level = (level[:1], level[1:]) if first else (level[-1:], level[:-1])
+            else:
+                keep = level[:0]
+            promoted = level[int(self._rng.integers(2))::2]
+            self.levels[h] = keep
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def quantile(self, q):
+        """
+        Returns the estimated quantiles ``q``, linearly interpolated like ``pd.Series.quantile``.
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        # An item of weight w covers w consecutive ranks, placed at their center.
+        positions = np.cumsum(weights) - weights + (weights - 1) / 2
+        return np.interp(np.asarray(q, dtype=np.float64) * (self.count - 1), positions, items)
+
+    def size(self) -> int:
+        """Number of items held by the sketch."""
+        return sum(len(level) for level in self.levels)
+
+
+def sketch_quartiles(sketches: Dict[str, QuantileSketch]) -> pd.DataFrame:
+    """
+    Q1 and Q3 of every sketched column, laid out like ``DataFrame.quantile([0.25, 0.75])``.
+    """
+    return pd.DataFrame({col: sketch.quantile([0.25, 0.75]) for col, sketch in sketches.items()}, index=[0.25, 0.75])
+
+
+class StreamingPreprocessor:
+    def __init__(self, drop_columns: List[str], remove_columns: List[str], cap_columns: List[str], feature_config: dict,
+                 chunk_size: int = 100000, sketch_size: int = 2048, spool_directory: str = ".cache/streaming",
+                 dedup_config: dict = None, outlier_bounds_path: str = "Artifacts/outlier-bounds.json",
+                 scaler_path: str = "Artifacts/scaler.json"):
+        """
+        Out-of-core version of ``data_preprocessing_pipeline``.
+
+        The raw files are read ``chunk_size`` rows at a time, and every statistic
+        the in-memory pipeline computes on the whole frame is computed on the
+        stream instead: duplicates with a ``DedupIndex`` of the rows already kept,
+        IQR bounds with a ``QuantileSketch`` per column and the scaler with
+        ``partial_fit``. The cleaned rows are spooled to disk once and re-read by
+        the following passes:
+
+        1. drop columns and duplicates, spool, sketch the removed columns;
+        2. drop the outlier rows, sketch the capped columns on the rows kept;
+        3. cap, engineer the features and ``partial_fit`` the scaler;
+        4. cap, engineer, scale and append to the output.
+
+        Peak memory is bounded by the chunk size, the sketches and the dedup
+        index (8 bytes per distinct row for a hash set, a fixed size for a Bloom
+        filter), whatever the size of the data.
+
+        With a persisted dedup index (``dedup.persist``) that already holds the
+        rows of earlier runs, the run is an incremental ingestion: only the new
+        rows are kept, they are cleaned and scaled with the outlier bounds and
+        scaler fitted on the whole history (passes 2 and 3 are skipped), and
+        they are appended to ``output_path`` instead of replacing it.
+
+        Args:
+            drop_columns (list[str]): Columns dropped before deduplication.
+            remove_columns (list[str]): Columns whose outlier rows are dropped.
+            cap_columns (list[str]): Columns whose outliers are capped.
+            feature_config (dict): Arguments of the FeatureTransformer.
+            chunk_size (int): Number of rows processed at a time.
+            sketch_size (int): Capacity ``k`` of the quantile sketches.
+            spool_directory (str): Directory of the temporary spool file.
+            dedup_config (dict, optional): The ``dedup`` section of the config, see
+                ``create_dedup_index``. Defaults to an in-memory hash set.
+            outlier_bounds_path (str): Outlier bounds of the earlier runs, used by an incremental ingestion.
+            scaler_path (str): Scaler JSON of the earlier runs, used by an incremental ingestion.
+        """
+        self.drop_columns = drop_columns
+        self.chunk_size = chunk_size
+        self.sketch_size = sketch_size
+        self.spool_directory = spool_directory
+        self.engine = IQROutlierEngine(remove_columns=remove_columns, cap_columns=cap_columns)
+        self.transformer = FeatureTransformer(**feature_config)
+        self.dedup_config = dedup_config
+        self.outlier_bounds_path = outlier_bounds_path
+        self.scaler_path = scaler_path
+
+    def _sketches(self, columns: List[str]) -> Dict[str, QuantileSketch]:
+        return {col: QuantileSketch(self.sketch_size) for col in columns}
+
+    def _read_spool(self, path: str) -> Iterator[pd.DataFrame]:
+        return dataIngest(path).iter_chunks(self.chunk_size)
+
+    def _engineer(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        features = self.transformer.engineer(self.transformer.inputs_from_frame(chunk))
+        others = chunk.drop(columns=self.transformer.input_columns)
+        return pd.concat([self.transformer.to_frame(features, index=chunk.index), others], axis=1)
+
+    def _clean(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.engine.remove_columns:
+            chunk = chunk[self.engine.remove_mask(chunk)]
+        if self.engine.cap_columns:
+            chunk = self.engine.cap(chunk)
+        return chunk
+
+    def run(self, data_path: str, output_path: str) -> dict:
+        """
+        Preprocesses every file matching ``data_path`` into ``output_path``.
+
+        Args:
+            data_path (str): A CSV path or a glob pattern, e.g. one file per station and year.
+            output_path (str): CSV written with the processed rows.
+
+        Returns:
+            dict: Files, chunks, rows read, duplicates, outlier rows removed, rows written,
+            whether the run was incremental, seconds and rows/sec of the run, and the
+            stats of the dedup index.
+
+        Raises:
+            ValueError: If no row is left to write, or if the persisted dedup index holds
+                earlier rows but ``output_path`` is missing.
+        """
+        spool = None
+        try:
+            paths = sorted(glob.glob(data_path))
+            if not paths:
+                raise FileNotFoundError(f"No file matches {data_path}")
+            os.makedirs(self.spool_directory, exist_ok=True)
+            spool = os.path.join(self.spool_directory, f"cleaned-{os.getpid()}.csv")
+            start = time.perf_counter()
+            stats = {"files": len(paths), "chunks": 0, "rows_read": 0, "duplicates": 0}
+            index = create_dedup_index(self.dedup_config) if self.dedup_config else HashSetIndex()
+            dedup = DropDuplicatesStrategy(index)
+            incremental = bool(index.path) and len(index) > 0
+            if incremental:
+                if not os.path.exists(output_path):
+                    raise ValueError(f"The dedup index {index.path} holds {len(index)} rows of earlier runs but "
+                                     f"{output_path} is missing: delete the index to rebuild the output from scratch")
+                self.engine.load_bounds(self.outlier_bounds_path)
+                self.transformer.load_scaler(self.scaler_path)
+                logger.info(f"Incremental ingestion: appending the new rows to {output_path}")
+            stats["incremental"] = incremental
+
+            # Pass 1: drop columns and duplicates, sketch the removed columns.
+            sketches = {} if incremental else self._sketches(self.engine.remove_columns)
+            spooled = 0
+            for path in paths:
+                for chunk in dataIngest(path).iter_chunks(self.chunk_size):
+                    stats["chunks"] += 1
+                    stats["rows_read"] += len(chunk)
+                    chunk = chunk.drop(columns=self.drop_columns)
+                    before = len(chunk)
+                    chunk = dedup.handle_data(chunk)
+                    stats["duplicates"] += before - len(chunk)
+                    for col, sketch in sketches.items():
+                        sketch.update(chunk[col].to_numpy())
+                    chunk.to_csv(spool, mode="w" if spooled == 0 else "a", header=spooled == 0, index=False)
+                    spooled += len(chunk)
+            if not spooled:
+                raise ValueError(f"No new rows in {data_path}, every row is a duplicate")
+            if sketches:
+                self.engine.fit_bounds("remove", sketch_quartiles(sketches))
+
+            # Pass 2: sketch the capped columns on the rows kept.
+            sketches = {} if incremental else self._sketches(self.engine.cap_columns)
+            if sketches:
+                for chunk in self._read_spool(spool):
+                    if self.engine.remove_columns:
+                        chunk = chunk[self.engine.remove_mask(chunk)]
+                    for col, sketch in sketches.items():
+                        sketch.update(chunk[col].to_numpy())
+                self.engine.fit_bounds("cap", sketch_quartiles(sketches))
+
+            # Pass 3: fit the scaler on the engineered features.
+            columns = self.transformer.output_columns
+            if not incremental:
+                self.transformer.scaler = None
+                for chunk in self._read_spool(spool):
+                    chunk = self._clean(chunk)
+                    if len(chunk):
+                        self.transformer.partial_fit_scaler(self._engineer(chunk)[columns].to_numpy())
+
+            # Pass 4: scale and write, or append to the output of the earlier runs.
+            written = 0
+            for chunk in self._read_spool(spool):
+                chunk = self._engineer(self._clean(chunk))
+                if not len(chunk):
+                    continue
+                chunk[columns] = self.transformer.scale(chunk[columns].to_numpy())
+                fresh = written == 0 and not incremental
+                chunk.to_csv(output_path, mode="w" if fresh else "a", header=fresh, index=False)
+                written += len(chunk)
+            if not written:
+                raise ValueError(f"No rows left in {data_path} after removing the outliers")
+            # Saved last, so a failed run does not mark its rows as ingested.
+            if index.path:
+                index.save()
+
+            seconds = time.perf_counter() - start
+            stats.update({
+                "outliers_removed": spooled - written,
+                "rows_written": written,
+                "seconds": seconds,
+                "rows_per_second": stats["rows_read"] / seconds if seconds > 0 else 0.0,
+                "dedup": index.stats(),
+            })
+            logger.info(f"Streamed {stats['rows_read']} rows in {stats['chunks']} chunks from {len(paths)} files "
+                        f"in {seconds:.2f}s: {stats['duplicates']} duplicates, {stats['outliers_removed']} outliers removed, "
+                        f"{written} rows written. Dedup index: {len(index)} rows in {index.memory_bytes() / 2**20:.1f}MiB, "
+                        f"{stats['dedup']['lookups_per_second']:.0f} lookups/sec")
+            return stats
+        except Exception as e:
+            logger.error(f"Error in streaming preprocessing: {e}")
+            raise
+        finally:
+            # Also on failure: the spool holds a full copy of the cleaned rows.
+            if spool and os.path.exists(spool):
+                os.remove(spool)
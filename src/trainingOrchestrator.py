@@ -0,0 +1,172 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.TrainingStrategies.registry import load_strategy
+from src.modelEvaluate.classificationReport import classificationReportEvaluation
+from src.modelEvaluate.confusionMatrix import confusionMatrixEvaluation
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def build_model(name: str, spec: dict, classes: List[str], class_weights: dict = None):
+    """
+    Instantiates the strategy of a model spec with its params, thread budget and class weights.
+    Models are built to train in worker processes, so the strategy's ``worker_params`` apply.
+
+    Returns:
+        tuple: The untrained model and whether it trains on encoded labels.
+    """
+    strategy = load_strategy(spec["strategy"])
+    kwargs = {**strategy.worker_params, **(spec.get("params") or {})}
+    if spec.get("threads") and strategy.threads_param:
+        kwargs[strategy.threads_param] = spec["threads"]
+
+    encoded = strategy.requires_encoded_labels or spec.get("encoded_labels", False)
+    if class_weights:
+        if strategy.class_weight_param:
+            kwargs[strategy.class_weight_param] = (
+                {classes.index(label): weight for label, weight in class_weights.items()} if encoded else dict(class_weights))
+        else:
+            logger.warning(f"{name}: {spec['strategy']} takes no class weights, training unweighted")
+    return strategy(**kwargs), encoded
+
+
+def save_model(model, path: str, native_path: str = None) -> bool:
+    """
+    Pickles a trained model and, with ``native_path``, also exports it in its native format.
+    A model without one keeps only the pickle, which is what gets served.
+
+    Returns:
+        bool: Whether the native file was written.
+    """
+    model.save(path=path)
+    if not native_path:
+        return False
+    if model.native_format is None:
+        logger.warning(f"{type(model).__name__} has no native format, {native_path} is not written, serve {path}")
+        return False
+    model.export_native(native_path)
+    return True
+
+
+def train_model(name: str, spec: dict, classes: List[str], X_train: pd.DataFrame, y_train: pd.Series,
+                X_test: pd.DataFrame, y_test: pd.Series, class_weights: dict = None) -> dict:
+    """
+    Trains, saves and evaluates one model. Runs in a worker process of the orchestrator.
+
+    Args:
+        name (str): Name of the model in the config.
+        spec (dict): Its config: ``strategy``, ``path`` and optionally ``params``, ``threads``,
+            ``native_path`` and ``encoded_labels``.
+        classes (list[str]): Class names, used to encode the labels of models trained on integers
+            (``encoded_labels`` or a strategy that ``requires_encoded_labels``).
+        X_train, y_train, X_test, y_test: Training and test sets, labels as class names.
+        class_weights (dict, optional): ``{class name: weight}``, passed as the strategy's
+            ``class_weight_param``. Models without one train unweighted.
+
+    Returns:
+        dict: Training seconds, prediction latency per 1k rows, model size, model parameters,
+        accuracy, classification report and confusion matrix.
+    """
+    try:
+        model, encoded = build_model(name, spec, classes, class_weights)
+        if encoded:
+            y_train = y_train.map({label: i for i, label in enumerate(classes)})
+
+        start = time.perf_counter()
+        model.train(X_train, y_train)
+        seconds = time.perf_counter() - start
+
+        save_model(model, spec["path"], spec.get("native_path"))
+
+        start = time.perf_counter()
+        preds = np.asarray(model.predict(X_test)).ravel()
+        predict_seconds = time.perf_counter() - start
+        if encoded:
+            preds = np.asarray(classes)[preds.astype(int)]
+        return {
+            "training_seconds": seconds,
+            "predict_ms_per_1k_rows": predict_seconds * 1000 * 1000 / max(len(X_test), 1),
+            "size_bytes": os.path.getsize(spec["path"]),
+            "params": model.model.get_params(),
+            "accuracy": float(np.mean(preds == np.asarray(y_test))),
+            "report": classificationReportEvaluation().evaluate(y_test, preds),
+            "confusion_matrix": confusionMatrixEvaluation().evaluate(y_test, preds),
+        }
+    except Exception as e:
+        logger.error(f"Error training model {name}: {e}")
+        raise
+
+
+class TrainingOrchestrator:
+    def __init__(self, models: Dict[str, dict], classes: List[str], max_workers: int = 1, class_weights: dict = None):
+        """
+        Trains a set of models concurrently, one process per model.
+
+        Every model gets an explicit thread budget (``threads`` in its spec, passed
+        as the strategy's ``threads_param``, e.g. CatBoost's ``thread_count`` or
+        ``n_jobs``), so the models share the cores instead of each one starting a
+        thread per core.
+
+        Args:
+            models (dict): ``{name: spec}`` as accepted by ``train_model``. Specs with
+                ``enabled: false`` are skipped.
+            classes (list[str]): Class names.
+            max_workers (int): Number of models trained at once. With 1, they are trained in-process.
+            class_weights (dict, optional): ``{class name: weight}`` every model trains with, see ``train_model``.
+        """
+        self.models = {name: spec for name, spec in models.items() if spec.get("enabled", True)}
+        self.class_weights = class_weights
+        self.classes = classes
+        self.max_workers = max_workers
+
+        # The heaviest models that can run at once must fit on the cores.
+        budgets = sorted((spec.get("threads") or 1 for spec in self.models.values()), reverse=True)
+        budget = sum(budgets[:max_workers])
+        cores = os.cpu_count() or 1
+        if max_workers > 1 and budget > cores:
+            logger.warning(f"Concurrent model thread budgets add up to {budget} threads on {cores} cores")
+
+    def run(self, X_train: pd.DataFrame, y_train: pd.Series, X_test: pd.DataFrame, y_test: pd.Series) -> dict:
+        """
+        Returns:
+            dict: ``models`` with the result of ``train_model`` per model, the wall-clock
+            seconds and the sum of the models' training seconds.
+        """
+        start = time.perf_counter()
+        data = (X_train, y_train, X_test, y_test)
+        if self.max_workers <= 1:
+            results = {name: train_model(name, spec, self.classes, *data, self.class_weights) for name, spec in self.models.items()}
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(self.models))) as pool:
+                futures = {name: pool.submit(train_model, name, spec, self.classes, *data, self.class_weights)
+                           for name, spec in self.models.items()}
+                results = {name: future.result() for name, future in futures.items()}
+        wall = time.perf_counter() - start
+
+        total = sum(result["training_seconds"] for result in results.values())
+        for name, result in results.items():
+            logger.info(
+                f"{name}: trained in {result['training_seconds']:.2f}s, accuracy {result['accuracy']:.4f}, "
+                f"{result['predict_ms_per_1k_rows']:.2f}ms per 1k rows, {result['size_bytes'] / 1024:.0f}KiB"
+            )
+        logger.info(f"Trained {len(results)} models in {wall:.2f}s wall-clock ({total:.2f}s of training)")
+        return {"models": results, "wall_seconds": wall, "training_seconds": total}
+
+
+def select_model(results: Dict[str, dict], min_accuracy: float):
+    """
+    Returns the name of the model with the lowest prediction latency among those
+    reaching ``min_accuracy``, or None if no model does.
+    """
+    eligible = [name for name, result in results.items() if result["accuracy"] >= min_accuracy]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda name: results[name]["predict_ms_per_1k_rows"])
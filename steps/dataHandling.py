@@ -3,42 +3,49 @@ from typing import List
 from zenml import step
 import pandas as pd
 import pickle
-import numpy as np
+import yaml
 
 from src.dataStrategies.cleaning import DropColumnsStrategy, DropDuplicatesStrategy
-from src.dataStrategies.outliers import cappingOutliersStrategy, removingOutliersStrategy
-from src.dataStrategies.Transformation import TransformationStrategy
-from src.dataStrategies.Scalling import StandardScalerStrategy
+from src.dataStrategies.outliers import IQROutlierEngine
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.Deployment.onlineMonitor import build_feature_reference, save_feature_reference
+from src.stepCache import StepCache, replace_if_changed
+from src.streamingPreprocessing import StreamingPreprocessor
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# -------------------------------
-# Helper Functions
-# -------------------------------
-def add_temp_avg(data: pd.DataFrame) -> pd.DataFrame:
-    if "temp_max" not in data.columns or "temp_min" not in data.columns:
-        raise ValueError("Missing columns: temp_max or temp_min")
-    data["temp_avg"] = (data["temp_max"] + data["temp_min"]) / 2
-    return data
-
-def add_temp_diff(data: pd.DataFrame) -> pd.DataFrame:
-    if "temp_max" not in data.columns or "temp_min" not in data.columns:
-        raise ValueError("Missing columns: temp_max or temp_min")
-    data["temp_diff"] = data["temp_max"] - data["temp_min"]
-    return data
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
+
+# Every step below is keyed on the content of its input and its config slice,
+# so an unchanged input returns the output of the previous run from disk.
+step_cache = StepCache(**config['step_cache'])
 
 # -------------------------------
 # ZenML Steps
 # -------------------------------
 
+@step_cache.cached
+def clean_data(data: pd.DataFrame, drop_cols: List[str]) -> pd.DataFrame:
+    """Drops the useless columns and the duplicate rows of the data."""
+    data = DropColumnsStrategy(columns_to_drop=drop_cols).handle_data(data)
+    return DropDuplicatesStrategy().handle_data(data)
+
 @step
 def data_cleaning_step(data: pd.DataFrame, drop_cols: List[str]) -> pd.DataFrame:
-    """Step to drop useless columns and duplicates."""
+    """
+    Step to drop useless columns and duplicates.
+
+    The in-memory pipeline refits every statistic on the whole data and
+    rewrites the processed CSV, so it never drops the rows of earlier runs:
+    the persisted dedup index is only used by the incremental streaming ingestion.
+    """
     try:
         logger.info(f"Starting data cleaning. Dropping: {drop_cols}")
-        data = DropColumnsStrategy(columns_to_drop=drop_cols).handle_data(data)
-        data = DropDuplicatesStrategy().handle_data(data)
+        data = clean_data(data, drop_cols)
+        if data.empty:
+            raise ValueError("No rows left after cleaning")
         logger.info(f"Data cleaning completed. Shape: {data.shape}")
         return data 
     except Exception as e:
@@ -46,15 +53,20 @@ def data_cleaning_step(data: pd.DataFrame, drop_cols: List[str]) -> pd.DataFrame
         raise
 
 
+@step_cache.cached
+def fit_outliers(data: pd.DataFrame, remove_cols: List[str], cap_cols: List[str]):
+    """Removes and caps the outliers in one pass and returns the cleaned data with the fitted engine."""
+    engine = IQROutlierEngine(remove_columns=remove_cols, cap_columns=cap_cols)
+    return engine.handle_data(data), engine
+
 @step
 def outlier_handling_step(data: pd.DataFrame, remove_cols: List[str], cap_cols: List[str]) -> pd.DataFrame:
     """Step to remove and cap outliers."""
     try:
         logger.info(f"Starting outlier handling. Remove: {remove_cols}, Cap: {cap_cols}")
-        for col in remove_cols:
-            data = removingOutliersStrategy(col).handle_data(data)
-        for col in cap_cols:
-            data = cappingOutliersStrategy(col).handle_data(data)
+        data, engine = fit_outliers(data, remove_cols, cap_cols)
+        save_outlier_bounds(engine)
+
         logger.info("Outlier handling completed.")
         return data
     except Exception as e:
@@ -62,18 +74,37 @@ def outlier_handling_step(data: pd.DataFrame, remove_cols: List[str], cap_cols:
         raise
 
 @step
-def feature_engineering_step(data: pd.DataFrame, transformations: list) -> pd.DataFrame:
-    """Step to add new features and transformations from config."""
+def feature_reference_step(data: pd.DataFrame, monitoring_config: dict) -> None:
+    """
+    Step to save the training distribution of the monitored features, the reference of the online drift monitor.
+
+    ``data`` must be the cleaned raw data, before outlier handling: the monitor
+    bins the raw features of ``/feedback``, which are not capped.
+    """
     try:
-        logger.info(f"Starting feature engineering with transformations: {transformations}")
-        data = add_temp_avg(data)
-        data = add_temp_diff(data)
+        reference = build_feature_reference(data, monitoring_config["feature_columns"], monitoring_config["bins"])
+        path = monitoring_config["reference_path"]
+        save_feature_reference(reference, f"{path}.tmp")
+        replace_if_changed(f"{path}.tmp", path)
+        logger.info(f"Feature reference of {reference['rows']} rows saved to {path}")
+    except Exception as e:
+        logger.error(f"Error in feature reference step: {e}")
+        raise
 
-        for transform in transformations:
-            column = transform["column"]
-            method = transform["method"]
-            func = getattr(np, method) 
-            data[column] = TransformationStrategy(func, column).handle_data(data)
+@step_cache.cached
+def engineer_features(data: pd.DataFrame, feature_config: dict) -> pd.DataFrame:
+    """Replaces the input columns with the engineered features, keeping the other columns."""
+    transformer = FeatureTransformer(**feature_config)
+    features = transformer.engineer(transformer.inputs_from_frame(data))
+    others = data.drop(columns=transformer.input_columns)
+    return pd.concat([transformer.to_frame(features, index=data.index), others], axis=1)
+
+@step
+def feature_engineering_step(data: pd.DataFrame, feature_config: dict) -> pd.DataFrame:
+    """Step to add derived features and apply the configured transformations."""
+    try:
+        logger.info(f"Starting feature engineering with config: {feature_config}")
+        data = engineer_features(data, feature_config)
 
         logger.info("Feature engineering completed.")
         return data
@@ -81,24 +112,67 @@ def feature_engineering_step(data: pd.DataFrame, transformations: list) -> pd.Da
         logger.error(f"Error in feature engineering: {e}")
         raise
 
+@step_cache.cached
+def fit_scaling(data: pd.DataFrame, feature_config: dict):
+    """Fits the scaler on the engineered features and returns the scaled data with the fitted scaler."""
+    transformer = FeatureTransformer(**feature_config)
+    columns = transformer.output_columns
+    data = data.copy()
+    data[columns] = transformer.fit_scaler(data[columns].to_numpy())
+    return data, transformer.scaler
+
+def save_scaler_artifacts(transformer: FeatureTransformer) -> None:
+    """Writes the fitted scaler of ``transformer`` to Artifacts/scaler.pkl and Artifacts/scaler.json."""
+    # The scaler files are only rewritten when they change, so a cached run
+    # does not make the serving registry reload identical artifacts.
+    with open("Artifacts/scaler.pkl.tmp", "wb") as f:
+        pickle.dump(transformer.scaler, f)
+    replace_if_changed("Artifacts/scaler.pkl.tmp", "Artifacts/scaler.pkl")
+    transformer.save_scaler("Artifacts/scaler.json.tmp")
+    replace_if_changed("Artifacts/scaler.json.tmp", "Artifacts/scaler.json")
+
+def save_outlier_bounds(engine: IQROutlierEngine) -> None:
+    """Writes the fitted outlier bounds to Artifacts/outlier-bounds.json."""
+    # The API caps its raw inputs to the same bounds.
+    engine.save_bounds("Artifacts/outlier-bounds.json.tmp")
+    replace_if_changed("Artifacts/outlier-bounds.json.tmp", "Artifacts/outlier-bounds.json")
+
 @step
-def scaling_step(data: pd.DataFrame, columns_to_scale: List[str]) -> pd.DataFrame:
-    """Step to scale specified columns."""
+def scaling_step(data: pd.DataFrame, feature_config: dict) -> pd.DataFrame:
+    """Step to fit the scaler on the engineered features and scale them."""
     try:
-        logger.info(f"Starting scaling step for columns: {columns_to_scale}")
-        scaler = StandardScalerStrategy()
-        data[columns_to_scale] = scaler.fit_transform(data[columns_to_scale])
+        logger.info(f"Starting scaling step for columns: {feature_config['columns_to_scale']}")
+        data, scaler = fit_scaling(data, feature_config)
+
+        save_scaler_artifacts(FeatureTransformer(scaler=scaler, **feature_config))
 
-        with open("Artifacts/scaler.pkl", "wb") as f:
-            pickle.dump(scaler, f)
-        
         logger.info("Scaling completed.")
         return data
     except Exception as e:
         logger.error(f"Error in scaling step: {e}")
         raise
 
+@step(enable_cache=False)
+def streaming_preprocessing_step(data_path: str, output_path: str, drop_cols: List[str], remove_cols: List[str],
+                                 cap_cols: List[str], feature_config: dict, streaming_config: dict,
+                                 dedup_config: dict) -> dict:
+    """Step to preprocess data larger than memory chunk by chunk, see StreamingPreprocessor."""
+    try:
+        preprocessor = StreamingPreprocessor(drop_cols, remove_cols, cap_cols, feature_config,
+                                             dedup_config=dedup_config, **streaming_config)
+        stats = preprocessor.run(data_path, output_path)
+        if not stats["incremental"]:
+            save_outlier_bounds(preprocessor.engine)
+            save_scaler_artifacts(preprocessor.transformer)
+        print(f"✅ Data saved to {output_path}")
+        return stats
+    except Exception as e:
+        logger.error(f"Error in streaming preprocessing step: {e}")
+        raise
+
 @step
 def save_to_csv_step(data: pd.DataFrame, path: str) -> None:
+    if data.empty:
+        raise ValueError(f"No rows to save to {path}")
     data.to_csv(path, index=False)
     print(f"✅ Data saved to {path}")
\ No newline at end of file
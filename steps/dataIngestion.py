@@ -1,7 +1,15 @@
 import logging
+import os
 import pandas as pd
+import yaml
 from zenml import step
 import mlflow
+from src.stepCache import StepCache, hash_file
+
+with open("config/config.yaml", "r") as f:
+    config = yaml.safe_load(f)
+
+step_cache = StepCache(**config['step_cache'])
 
 
 @step(enable_cache=False)
@@ -9,14 +17,31 @@ def data_ingestion_step(DATA_PATH) -> pd.DataFrame:
     """
     Ingests the raw data from a CSV file and returns it as a pandas DataFrame.
 
+    The parsed data is cached on the hash of the file, and the file is only
+    logged to MLflow when its hash differs from the last logged one.
+
     Returns:
         pd.DataFrame: The ingested data.
     """
     try:
         logging.info(f"Starting data ingestion from: {DATA_PATH}")
-        data = pd.read_csv(DATA_PATH)
-        mlflow.log_artifact(DATA_PATH)
-        logging.info(f"Data ingestion completed. Shape: {data.shape}")
+        file_hash = hash_file(DATA_PATH)
+        hit, data = step_cache.load("data_ingestion_step", file_hash)
+        if not hit:
+            data = pd.read_csv(DATA_PATH)
+            step_cache.store("data_ingestion_step", file_hash, data)
+
+        marker = os.path.join(step_cache.directory, "data_ingestion_step", f"{os.path.basename(DATA_PATH)}.logged")
+        logged_hash = None
+        if os.path.exists(marker):
+            with open(marker, "r") as f:
+                logged_hash = f.read()
+        if logged_hash != file_hash:
+            mlflow.log_artifact(DATA_PATH)
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            with open(marker, "w") as f:
+                f.write(file_hash)
+        logging.info(f"Data ingestion completed. Shape: {data.shape}, cached: {hit}")
         return data
     except FileNotFoundError:
         logging.error(f"CSV file not found at: {DATA_PATH}")
@@ -1,17 +1,24 @@
 import pandas as pd
 from zenml import step
-from sklearn.model_selection import train_test_split
 from typing import Tuple, Any
-import numpy as np
-from imblearn.combine import SMOTEENN
 from src.TrainingStrategies.catboost import CatboostModel
 from src.TrainingStrategies.xgboost import XGBoostModel
-from src.modelEvaluate.classificationReport import classificationReportEvaluation
-from src.modelEvaluate.confusionMatrix import confusionMatrixEvaluation
-from src.dataDecode import labelEncodingStrategy
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.dataStrategies.resampling import create_resampling_strategy
+from src.Deployment.FeedbackStore import create_feedback_backend
+from src.Deployment.modelService import ModelRegistry
+from src.incrementalTraining import TrainingState, load_feedback_rows, replay_sample
+from src.trainingOrchestrator import TrainingOrchestrator, save_model, select_model
+from src.modelEvaluate.crossValidation import CrossValidationEvaluator
+from src.hyperparameterSearch import HyperparameterSearch
+from src.dataSplit import SplitIndex
+from src.stepCache import replace_if_changed
+import copy
+import json
 import logging
 import mlflow
 import os 
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -20,40 +27,46 @@ logger.setLevel(logging.INFO)
 @step
 def split_step(
     data: pd.DataFrame,
-    target: str = "weather",
-    test_size: float = 0.2,
-    random_state: int = 42
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    split_config: dict,
+    target: str = "weather"
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, dict]:
     """
-    Splits a given dataset into training and test sets using train_test_split.
-    
+    Splits a given dataset into training and test sets, before any resampling.
+
+    The split is persisted as index arrays keyed on the data and the split
+    parameters (see ``SplitIndex``), so an unchanged dataset gets the same
+    split on every run, and the test CSV is only rewritten when the split changes.
+
     Args:
         data (pd.DataFrame): The dataset to split.
+        split_config (dict): The ``training.split`` section of the config.
         target (str, optional): The target column name. Defaults to "weather".
-        test_size (float, optional): The proportion of the dataset to include in the test split.
-            Defaults to 0.2.
-        random_state (int, optional): Controls the shuffling applied to the data before applying the split.
-            Defaults to 42.
-    
+
     Returns:
-        Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]: A tuple containing the training data, test data, 
-        training labels, and test labels.
+        Tuple[pd.DataFrame, pd.DataFrame, pd.Series, dict]: The training rows with the target
+        column (to be resampled), the test data, the test labels and the split indices.
     """
     try:
-        logger.info(f"Splitting data with test_size={test_size}")
-        X = data.drop(columns=[target])
-        y = data[target]
-
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state
-        )
-        # save the data of the test in a test file 
-        test_data_path = os.path.join("data", "test", "test_data.csv")
-        os.makedirs(os.path.dirname(test_data_path), exist_ok=True)
-        pd.concat([X_test, y_test], axis=1).to_csv(test_data_path, index=False)
-        
-        logger.info(f"Train shape: {X_train.shape}, Test shape: {X_test.shape}")
-        return X_train, X_test, y_train, y_test
+        logger.info(f"Splitting data with test_size={split_config['test_size']}")
+        split, created = SplitIndex(split_config["directory"]).load_or_create(
+            data, target, test_size=split_config["test_size"], random_state=split_config["random_state"],
+            stratify=split_config["stratify"], n_folds=split_config["n_folds"])
+
+        train_data = data.iloc[split["train"]]
+        test_data = data.iloc[split["test"]]
+        X_test = test_data.drop(columns=[target])
+        y_test = test_data[target]
+
+        # save the data of the test in a test file
+        test_data_path = split_config["test_data_path"]
+        if created or not os.path.exists(test_data_path):
+            os.makedirs(os.path.dirname(test_data_path), exist_ok=True)
+            test_data.to_csv(f"{test_data_path}.tmp", index=False)
+            replace_if_changed(f"{test_data_path}.tmp", test_data_path)
+
+        mlflow.log_param("split_key", split["key"])
+        logger.info(f"Train shape: {train_data.shape}, Test shape: {X_test.shape}")
+        return train_data, X_test, y_test, split
     except Exception as e:
         logger.error(f"Error in data splitting: {e}")
         raise
@@ -61,7 +74,9 @@ def split_step(
 
 
 @step
-def trainingCatBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) -> CatboostModel:
+def trainingCatBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str, native_path : str = None,
+                     init_model : str = None, iterations : int = None, state_path : str = None,
+                     params : dict = None) -> CatboostModel:
     """
     Step to train a CatBoost model on given data and save it to the given path.
 
@@ -69,21 +84,34 @@ def trainingCatBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) ->
         x_train: The training data
         x_test: The test data
         path: The path to save the model
+        native_path: Optional path to also export the model in CatBoost's .cbm format
+        init_model: Optional .cbm model to continue training from
+        iterations: Optional number of trees to train, CatBoost's default otherwise
+        state_path: Optional training state file where the training time is recorded
+        params: Optional hyperparameters, e.g. the tuned params of the last full training
 
     Returns:
         The trained CatBoost model
     """
     try:
-        model = CatboostModel()
-
-        model.train(x_train, x_test)
+        params = dict(params or {})
+        if iterations:
+            params["iterations"] = iterations
+        model = CatboostModel(**params)
+
+        start = time.perf_counter()
+        model.train(x_train, x_test, init_model=init_model)
+        seconds = time.perf_counter() - start
+        mlflow.log_metric("catboost_training_seconds", seconds)
+        if state_path:
+            TrainingState(state_path).record_training("catboost", seconds, incremental=init_model is not None)
 
         mlflow.log_params(model.model.get_params())
         mlflow.catboost.log_model(model.model, "models/catboost")
 
 
     
-        model.save(path=path)
+        save_model(model, path, native_path)
         return model
     except Exception as e:
         logger.error(f"Error in training model: {e}")
@@ -91,7 +119,9 @@ def trainingCatBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) ->
 
 
 @step
-def trainingXGBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) -> XGBoostModel:
+def trainingXGBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str, native_path : str = None,
+                    init_model : str = None, n_estimators : int = None, state_path : str = None,
+                    params : dict = None) -> XGBoostModel:
     """
     Step to train a XGBoost model on given data and save it to the given path.
 
@@ -99,17 +129,31 @@ def trainingXGBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) ->
         x_train: The training data
         x_test: The test data
         path: The path to save the model
+        native_path: Optional path to also export the booster in XGBoost's .ubj format
+        init_model: Optional saved booster to add boosting rounds to
+        n_estimators: Optional number of boosting rounds, XGBoost's default otherwise
+        state_path: Optional training state file where the training time is recorded
+        params: Optional hyperparameters, e.g. the tuned params of the last full training
 
     Returns:
         The trained XGBoost model
     """
     try:
-        model = XGBoostModel()
-        model.train(x_train, x_test)
+        params = dict(params or {})
+        if n_estimators:
+            params["n_estimators"] = n_estimators
+        model = XGBoostModel(**params)
+
+        start = time.perf_counter()
+        model.train(x_train, x_test, init_model=init_model)
+        seconds = time.perf_counter() - start
+        mlflow.log_metric("xgboost_training_seconds", seconds)
+        if state_path:
+            TrainingState(state_path).record_training("xgboost", seconds, incremental=init_model is not None)
 
         mlflow.log_param("random_state", model.model.get_params()["random_state"])
         mlflow.xgboost.log_model(model.model, "models/xgboost")
-        model.save(path=path)
+        save_model(model, path, native_path)
         return model
     except Exception as e:
         logger.error(f"Error in training model: {e}")
@@ -117,92 +161,337 @@ def trainingXGBoost(x_train : pd.DataFrame, x_test:pd.DataFrame, path : str) ->
 
 
 @step
-def modelEvaluation(model : Any, x_test:pd.DataFrame, y_test:pd.Series, run_id) -> Tuple[str, np.ndarray]:
+def hyperparameterSearch(train_data: pd.DataFrame, models: dict, search: dict, classes: list, resampling: dict = None,
+                         target: str = "weather") -> dict:
     """
-    Step to evaluate a model on given test data and save the classification report and confusion matrix to the given path.
+    Step to search the hyperparameters of the boosters in ``search["space"]`` with successive halving
+    and log every trial's score, fit time and predict latency to MLflow.
 
     Args:
-        model: The model to evaluate
-        x_test: The test data
-        y_test: The test labels
-        run_id: The MLflow run ID to log the artifacts
+        train_data: The training rows with the target column, before resampling. A validation
+            set is held out of them first, then only the rest is resampled
+        models: The ``training.models`` section of the config
+        search: The ``hyperparameter_search`` section of the config
+        classes: Class names, used to encode the labels of models trained on integers
+        resampling: Optional ``training.resampling`` section, applied to the search's training rows
+        target: The target column name
 
     Returns:
-        A tuple of the classification report as a string and the confusion matrix as a numpy array
+        ``models`` with the best parameters found, including the number of rounds, merged into each searched model's params.
     """
     try:
-        y_pred = model.predict(x_test)
+        options = {key: value for key, value in search.items() if key not in ("enabled", "space")}
+        results = HyperparameterSearch(search["space"], models, classes, resampling=resampling, target=target,
+                                       **options).run(train_data.drop(columns=[target]), train_data[target])
+
+        models = copy.deepcopy(models)
+        for name, result in results.items():
+            models[name]["params"] = {**(models[name].get("params") or {}), **result["params"]}
+            mlflow.log_params({f"hpo.{name}.{key}": value for key, value in result["params"].items()})
+            for trial in result["trials"]:
+                for entry in trial["history"]:
+                    for metric in ("best_val_loss", "fit_seconds", "predict_ms_per_1k_rows"):
+                        mlflow.log_metric(f"hpo.{name}.trial_{trial['id']}.{metric}", entry[metric], step=entry["rounds"])
+
+        os.makedirs("logs", exist_ok=True)
+        with open("logs/hyperparameter-search.json", "w") as f:
+            json.dump(results, f, indent=2)
+        mlflow.log_artifact("logs/hyperparameter-search.json")
+        return models
+    except Exception as e:
+        logger.error(f"Error in hyperparameter search: {e}")
+        raise
+
 
-        cr = classificationReportEvaluation().evaluate(y_test, y_pred)
-        cm = confusionMatrixEvaluation().evaluate(y_test, y_pred)
+@step
+def parallelTraining(
+    x_train: pd.DataFrame,
+    y_train: pd.Series,
+    x_test: pd.DataFrame,
+    y_test: pd.Series,
+    models: dict,
+    classes: list,
+    max_workers: int = 1,
+    min_accuracy: float = 0.0,
+    state_path: str = None,
+    class_weights: dict = None
+) -> dict:
+    """
+    Step to train and evaluate the configured models concurrently, one process per model,
+    and log their results to the current MLflow run.
+
+    Args:
+        x_train: The training data
+        y_train: The training labels, as class names
+        x_test: The test data
+        y_test: The test labels, as class names
+        models: The ``training.models`` section of the config
+        classes: Class names, used to encode the labels of ``encoded_labels`` models
+        max_workers: Number of models trained at once
+        min_accuracy: Accuracy bar of the model selection
+        state_path: Optional training state file where the training times and params are recorded
+        class_weights: Optional ``{class name: weight}`` passed to the models that accept class weights
+
+    Returns:
+        Per model, the training seconds, prediction latency per 1k rows, size and accuracy,
+        the wall-clock seconds of the step and the selected model: the fastest to predict
+        among those reaching ``min_accuracy``.
+    """
+    try:
+        results = TrainingOrchestrator(models, classes, max_workers, class_weights).run(x_train, y_train, x_test, y_test)
 
         os.makedirs("logs/classificationReports", exist_ok=True)
         os.makedirs("logs/confusionMatrix", exist_ok=True)
+        summary = {"wall_seconds": results["wall_seconds"], "models": {}}
+        for name, result in results["models"].items():
+            mlflow.log_params({f"{name}.{key}": value for key, value in result["params"].items()})
+            mlflow.log_metric(f"{name}_training_seconds", result["training_seconds"])
+            mlflow.log_metric(f"{name}_predict_ms_per_1k_rows", result["predict_ms_per_1k_rows"])
+            mlflow.log_metric(f"{name}_size_bytes", result["size_bytes"])
+            mlflow.log_metric(f"{name}_accuracy", result["accuracy"])
+
+            with open(f"logs/classificationReports/cr_{name}.txt", "w") as f:
+                f.write(result["report"])
+            with open(f"logs/confusionMatrix/cm_{name}.txt", "w") as f:
+                f.write(str(result["confusion_matrix"]))
+            mlflow.log_artifact(f"logs/classificationReports/cr_{name}.txt")
+            mlflow.log_artifact(f"logs/confusionMatrix/cm_{name}.txt")
+
+            if state_path:
+                TrainingState(state_path).record_training(name, result["training_seconds"], incremental=False)
+                TrainingState(state_path).record_params(name, models[name].get("params") or {})
+            summary["models"][name] = {
+                key: result[key] for key in ("training_seconds", "predict_ms_per_1k_rows", "size_bytes", "accuracy")
+            }
+
+        summary["selected_model"] = select_model(results["models"], min_accuracy)
+        if summary["selected_model"] is None:
+            logger.warning(f"No model reaches an accuracy of {min_accuracy}")
+        else:
+            logger.info(f"Selected model: {summary['selected_model']}")
+            mlflow.log_param("selected_model", summary["selected_model"])
+        with open("logs/model-comparison.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        mlflow.log_artifact("logs/model-comparison.json")
+
+        mlflow.log_metric("training_wall_seconds", results["wall_seconds"])
+        mlflow.log_metric("training_sum_seconds", results["training_seconds"])
+        return summary
+    except Exception as e:
+        logger.error(f"Error in parallel training: {e}")
+        raise
 
-        with open(f"logs/classificationReports/cr_{run_id}.txt", "w") as f:
-            f.write(cr)
-
-        with open(f"logs/confusionMatrix/cm_{run_id}.txt", "w") as f:
-            f.write(str(cm))
 
-        mlflow.log_artifact(f"logs/classificationReports/cr_{run_id}.txt")
-        mlflow.log_artifact(f"logs/confusionMatrix/cm_{run_id}.txt")
+@step
+def crossValidation(
+    data: pd.DataFrame,
+    split: dict,
+    models: dict,
+    classes: list,
+    resampling: dict = None,
+    max_workers: int = 1,
+    target: str = "weather"
+) -> dict:
+    """
+    Step to score the configured models on the K folds of the persisted split, in parallel
+    processes, and log the results to the current MLflow run as a single artifact.
 
-        return cr, cm
+    Args:
+        data: The dataset the split indexes, features + target
+        split: The split of ``split_step``, with its folds
+        models: The ``training.models`` section of the config
+        classes: Class names, in the order of the confusion matrices
+        resampling: Optional ``training.resampling`` section, applied to the training part of every fold
+        max_workers: Number of folds trained at once
+        target: Target column name
 
+    Returns:
+        Per model, the mean and std of the fold metrics and timings, the pooled metrics
+        and every fold's result, as written to ``logs/cross-validation.json``.
+    """
+    try:
+        results = CrossValidationEvaluator(models, classes, max_workers, resampling, target).run(data, split)
+
+        for name, result in results["models"].items():
+            for key in ("accuracy", "macro_f1", "weighted_f1", "fit_seconds"):
+                mlflow.log_metric(f"cv_{name}_{key}_mean", result["mean"][key])
+                mlflow.log_metric(f"cv_{name}_{key}_std", result["std"][key])
+        mlflow.log_metric("cv_wall_seconds", results["wall_seconds"])
+
+        os.makedirs("logs", exist_ok=True)
+        with open("logs/cross-validation.json", "w") as f:
+            json.dump({"split_key": split["key"], **results}, f, indent=2)
+        mlflow.log_artifact("logs/cross-validation.json")
+        return results
     except Exception as e:
-        logger.error(f"Error in model evaluation: {e}")
+        logger.error(f"Error in cross-validation: {e}")
         raise
 
+
 @step
-def smoteData(data: pd.DataFrame, target: str = "weather") -> pd.DataFrame:
+def resampleData(data: pd.DataFrame, resampling: dict, target: str = "weather") -> Tuple[pd.DataFrame, pd.Series, dict]:
     """
-    Step to balance data using SMOTEENN (combination of SMOTE and ENN).
+    Step to balance the classes of the training rows with the configured resampling strategy.
+    Only the training rows are resampled, so no synthetic row reaches the test set.
 
     Args:
-        data (pd.DataFrame): Input dataset with features + target.
+        data (pd.DataFrame): Training rows with features + target.
+        resampling (dict): The ``training.resampling`` section of the config.
         target (str): Target column name.
 
     Returns:
-        pd.DataFrame: Balanced dataset after resampling.
+        The resampled features and labels, and the class weights the models should
+        train with (empty unless the strategy is ``class_weight``).
     """
     try:
-        logger.info("Applying SMOTEENN for data balancing...")
+        logger.info(f"Resampling data with {resampling['strategy']}...")
+        strategy = create_resampling_strategy(resampling, target)
+        balanced_data = strategy.handle_data(data)
+        class_weights = strategy.class_weights(data[target])
+
+        mlflow.log_param("resampling", resampling["strategy"])
+        mlflow.log_metric("resample_seconds", strategy.stats["seconds"])
+        if "peak_memory_bytes" in strategy.stats:
+            mlflow.log_metric("resample_peak_memory_mb", strategy.stats["peak_memory_bytes"] / 2**20)
+        mlflow.log_metric("resampled_rows", strategy.stats["rows_out"])
+        logger.info(f"Data balanced: Original size={len(data)}, New size={len(balanced_data)}, class weights: {class_weights}")
+        return balanced_data.drop(columns=[target]), balanced_data[target], class_weights
+
+    except Exception as e:
+        logger.error(f"Error in resampling step: {e}")
+        raise
+
+@step(enable_cache=False)
+def feedbackData(
+    data_path: str,
+    state_path: str,
+    feedback_config: dict,
+    feature_config: dict,
+    scaler_path: str,
+    classes: list,
+    replay_rows_per_class: int,
+    target: str = "weather",
+    outlier_bounds_path: str = None
+) -> Tuple[pd.DataFrame, pd.Series, pd.Series, Any, int]:
+    """
+    Step to build the training set of an incremental run: the feedback received
+    since the last run plus a small per-class replay of the processed data.
+
+    Args:
+        data_path: Processed dataset the models were last fully trained on
+        state_path: Training state file holding the feedback cursor
+        feedback_config: The ``serving.feedback`` section of the config
+        feature_config: Arguments of the FeatureTransformer
+        scaler_path: Scaler the feedback features are scaled with
+        classes: Class names, indexed by the numeric labels of the feedback
+        replay_rows_per_class: Number of processed rows replayed per class
+        target: The target column name
+        outlier_bounds_path: Outlier bounds the raw feedback features are capped to
 
+    Returns:
+        The features, the class names, the encoded labels, the new feedback cursor
+        and the number of feedback rows used.
+    """
+    try:
+        transformer = FeatureTransformer(**feature_config)
+        transformer.load_scaler(scaler_path)
+        if outlier_bounds_path:
+            transformer.load_outlier_bounds(outlier_bounds_path)
+        cursor = TrainingState(state_path).load()["feedback_cursor"]
+        rows, cursor = load_feedback_rows(create_feedback_backend(feedback_config), cursor, transformer, classes, target)
+
+        replay = replay_sample(pd.read_csv(data_path), replay_rows_per_class, target)
+        data = pd.concat([rows, replay[rows.columns]], ignore_index=True)
         X = data.drop(columns=[target])
         y = data[target]
+        y_encoded = y.map({name: i for i, name in enumerate(classes)})
 
-        smote_enn = SMOTEENN(
-            sampling_strategy="auto",  
-            random_state=42,
-            n_jobs=-1
-        )
-        X_res, y_res = smote_enn.fit_resample(X, y)
+        mlflow.log_metric("feedback_rows", len(rows))
+        logger.info(f"Incremental training set: {len(rows)} feedback rows + {len(replay)} replayed rows")
+        return X, y, y_encoded, cursor, len(rows)
+    except Exception as e:
+        logger.error(f"Error loading feedback data: {e}")
+        raise
 
-        balanced_data = pd.DataFrame(X_res, columns=X.columns)
-        balanced_data[target] = y_res
+@step(enable_cache=False)
+def registerIncrementalModel(
+    name: str,
+    version: str,
+    path: str,
+    test_data_path: str,
+    serving_models: dict,
+    classes: list,
+    manifest_path: str,
+    target: str = "weather"
+) -> dict:
+    """
+    Step to register a model retrained by an incremental run as a new version of ``name``
+    and promote it only if it beats the active version on the held-out test set.
 
-        logger.info(f"Data balanced: Original size={len(data)}, New size={len(balanced_data)}")
-        return balanced_data
+    Args:
+        name: Model name in ``serving.models``
+        version: Version the retrained model is registered as
+        path: Path of the retrained model
+        test_data_path: Processed test rows of the last split, features + target
+        serving_models: The ``serving.models`` section of the config
+        classes: Class names, used to decode models with ``encoded_labels``
+        manifest_path: Model manifest the version and the promotion are saved to
+        target: The target column name
 
+    Returns:
+        The version, the accuracy of the active and the retrained model and whether it was promoted.
+    """
+    try:
+        registry = ModelRegistry(serving_models, classes=classes, manifest_path=manifest_path)
+        test_data = pd.read_csv(test_data_path)
+        X_test, y_test = test_data.drop(columns=[target]), test_data[target].to_numpy()
+
+        active = registry.active_version(name)
+        current = float((registry.get(name).predict(X_test).ravel() == y_test).mean())
+        registry.register(name, version, path)
+        candidate = float((registry.get_version(name, version).predict(X_test).ravel() == y_test).mean())
+        mlflow.log_metric(f"{name}_active_accuracy", current)
+        mlflow.log_metric(f"{name}_incremental_accuracy", candidate)
+
+        promoted = candidate > current
+        if promoted:
+            # Only the manifest changes: the API follows it, and no version's file is overwritten.
+            registry.promote(name, version)
+            logger.info(f"{name}: promoted {version} ({candidate:.4f}) over {active} ({current:.4f})")
+        else:
+            logger.info(f"{name}: kept {active} ({current:.4f}), {version} only reaches {candidate:.4f}")
+        mlflow.log_param(f"{name}_promoted", promoted)
+        return {"version": version, "active_accuracy": current, "accuracy": candidate, "promoted": promoted}
     except Exception as e:
-        logger.error(f"Error in SMOTEENN step: {e}")
+        logger.error(f"Error registering incremental model {name}: {e}")
         raise
 
-@step
-def decodeData(Data : pd.DataFrame) -> pd.DataFrame:
+@step(enable_cache=False)
+def commitIncrementalRun(cursor: Any, rows: int, state_path: str) -> dict:
     """
-    Step to decode categorical columns in the DataFrame using LabelEncoder.
+    Step to store the feedback cursor once the models are retrained and report the time saved
+    compared with the last full training.
 
     Args:
-        Data (pd.DataFrame): Input DataFrame with features.
+        cursor: Feedback cursor returned by feedbackData
+        rows: Number of feedback rows used
+        state_path: Training state file
 
     Returns:
-        pd.DataFrame: Decoded DataFrame.
+        The report of TrainingState.commit
     """
-
     try:
-        return labelEncodingStrategy().encode(Data)
+        report = TrainingState(state_path).commit(cursor, rows)
+        for model, times in report["models"].items():
+            if times["saved_seconds"] is None:
+                logger.info(f"{model}: trained in {times['incremental_seconds']:.2f}s, no full training time recorded")
+                continue
+            mlflow.log_metric(f"{model}_training_seconds_saved", times["saved_seconds"])
+            logger.info(
+                f"{model}: trained in {times['incremental_seconds']:.2f}s instead of {times['full_seconds']:.2f}s "
+                f"({times['saved_seconds']:.2f}s saved)"
+            )
+        return report
     except Exception as e:
-        logger.error(f"Error in data decoding: {e}")
-        raise
\ No newline at end of file
+        logger.error(f"Error committing incremental run: {e}")
+        raise
@@ -0,0 +1,36 @@
+import pandas as pd
+import yaml
+from src.batchScoring import BatchScorer
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+CONFIG_PATH = "config/config.yaml"
+RAW_DATA_PATH = "Data/raw/seattle-weather.csv"
+
+def score_with(model_path, input_path, output_path):
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    scorer = BatchScorer(
+        model_path=model_path,
+        scaler_path=config["serving"]["scaler_path"],
+        feature_config=FeatureTransformer.config_slice(config),
+        chunk_size=100,
+        outlier_bounds_path=config["serving"]["outlier_bounds_path"],
+        label_column="weather",
+        classes=config["serving"]["classes"],
+    )
+    stats = scorer.score(str(input_path), str(output_path))
+    return pd.read_csv(output_path)["prediction"], stats
+
+def test_models_trained_on_encoded_labels_write_class_names(tmp_path):
+    input_path = tmp_path / "input.csv"
+    pd.read_csv(RAW_DATA_PATH).head(300).to_csv(input_path, index=False)
+
+    catboost, _ = score_with("Artifacts/ctb-model.pkl", input_path, tmp_path / "ctb.csv")
+    tree, stats = score_with("Artifacts/dt-model.pkl", input_path, tmp_path / "dt.csv")
+
+    classes = {"drizzle", "fog", "rain", "snow", "sun"}
+    assert set(catboost) <= classes
+    assert set(tree) <= classes
+    # Both models are scored against the same labels, so they mostly agree.
+    assert (catboost == tree).mean() > 0.5
+    assert stats["metrics"]["accuracy"] > 0.5
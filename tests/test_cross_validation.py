@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from src.dataSplit import SplitIndex, fold_indices
+from src.modelEvaluate.crossValidation import CrossValidationEvaluator
+
+CLASSES = ["fog", "rain", "sun"]
+MODELS = {
+    "decision_tree": {"strategy": "decision_tree", "params": {"max_depth": 3, "random_state": 0}},
+    "knn": {"strategy": "knn", "encoded_labels": True, "params": {"n_neighbors": 3}},
+    "lightgbm": {"strategy": "lightgbm", "enabled": False},
+}
+
+def make_data(rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 3)), columns=["precipitation", "temp_max", "wind"])
+    weather = np.where(X["precipitation"] > 0.5, "rain", np.where(X["temp_max"] > 0, "sun", "fog"))
+    return X.assign(weather=weather)
+
+def test_persisted_split_and_folds_are_reused(tmp_path):
+    data = make_data()
+    index = SplitIndex(str(tmp_path))
+    split, created = index.load_or_create(data, test_size=0.25, n_folds=2)
+    again, created_again = index.load_or_create(data.copy(), test_size=0.25, n_folds=2)
+
+    assert created and not created_again
+    assert list(tmp_path.glob("*.npz")) == [tmp_path / f"{split['key']}.npz"]
+    for name in ("train", "test", "folds"):
+        np.testing.assert_array_equal(split[name], again[name])
+    assert not set(split["train"]) & set(split["test"])
+    assert set(split["folds"]) == {0, 1}
+
+    train_idx, val_idx = fold_indices(split, 0)
+    assert len(train_idx) + len(val_idx) == len(split["train"])
+    assert not set(train_idx) & set(val_idx)
+
+def test_two_fold_cross_validation_is_deterministic(tmp_path):
+    data = make_data()
+    split, _ = SplitIndex(str(tmp_path)).load_or_create(data, test_size=0.25, n_folds=2)
+    evaluator = CrossValidationEvaluator(MODELS, CLASSES)
+    results = evaluator.run(data, split)
+
+    assert results["n_folds"] == 2
+    assert set(results["models"]) == {"decision_tree", "knn"}
+    for name, result in results["models"].items():
+        folds = result["folds"]
+        assert len(folds) == 2
+        # Every training row is validated exactly once across the folds.
+        assert np.sum(result["pooled"]["confusion_matrix"]) == len(split["train"])
+        assert result["mean"]["accuracy"] == np.mean([fold["accuracy"] for fold in folds])
+        assert result["mean"]["accuracy"] > 0.6
+
+    again = evaluator.run(data, split)
+    for name, result in results["models"].items():
+        assert again["models"][name]["pooled"]["confusion_matrix"] == result["pooled"]["confusion_matrix"]
+
+def test_parallel_catboost_folds_write_no_training_files(tmp_path, monkeypatch):
+    data = make_data()
+    split, _ = SplitIndex(str(tmp_path / "splits")).load_or_create(data, test_size=0.25, n_folds=2)
+    monkeypatch.chdir(tmp_path)
+    models = {"catboost": {"strategy": "catboost", "params": {"iterations": 20, "verbose": False}}}
+    results = CrossValidationEvaluator(models, CLASSES, max_workers=2).run(data, split)
+
+    assert len(results["models"]["catboost"]["folds"]) == 2
+    assert not (tmp_path / "catboost_info").exists()
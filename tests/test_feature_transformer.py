@@ -0,0 +1,43 @@
+import pickle
+import numpy as np
+import pandas as pd
+import yaml
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+CONFIG_PATH = "config/config.yaml"
+SCALER_PATH = "Artifacts/scaler.pkl"
+RAW_DATA_PATH = "Data/raw/seattle-weather.csv"
+
+def load_transformer():
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    with open(SCALER_PATH, "rb") as f:
+        scaler = pickle.load(f)
+    return FeatureTransformer.from_config(config, scaler=scaler)
+
+def test_transform_matches_dataframe_pipeline():
+    transformer = load_transformer()
+    df = pd.read_csv(RAW_DATA_PATH).head(200)
+
+    expected = df.copy()
+    expected["temp_avg"] = (expected["temp_max"] + expected["temp_min"]) / 2
+    expected["temp_diff"] = expected["temp_max"] - expected["temp_min"]
+    expected["precipitation"] = np.log1p(expected["precipitation"])
+    expected["wind"] = np.sqrt(expected["wind"])
+    columns = transformer.output_columns
+    expected[columns] = transformer.scaler.transform(expected[columns])
+
+    result = transformer.transform_frame(df)
+
+    assert list(result.columns) == columns
+    np.testing.assert_allclose(result.to_numpy(), expected[columns].to_numpy())
+
+def test_missing_input_column_raises():
+    transformer = load_transformer()
+    df = pd.DataFrame([{"precipitation": 0.0, "temp_max": 10.0, "wind": 3.0}])
+    try:
+        transformer.transform_frame(df)
+    except ValueError as e:
+        assert "temp_min" in str(e)
+    else:
+        raise AssertionError("Expected a ValueError for the missing column")
@@ -0,0 +1,42 @@
+import pytest
+from src.Deployment.FeedbackStore import CsvFeedbackBackend, feedback_fields
+from src.Deployment.feedbackDataset import FeedbackDataset
+
+pytest.importorskip("pyarrow")
+
+FEATURES = ["date", "precipitation", "temp_max", "temp_min", "wind"]
+
+def make_record(received_at, wind):
+    return {"received_at": received_at, "date": "2015-01-01", "precipitation": 0.0,
+            "temp_max": 10.0, "temp_min": 2.0, "wind": wind, "prediction": 4.0, "actual": 2.0}
+
+def test_compaction_is_incremental_and_partitioned(tmp_path):
+    backend = CsvFeedbackBackend(str(tmp_path / "feedback.csv"), feedback_fields(FEATURES))
+    dataset = FeedbackDataset(str(tmp_path / "dataset"))
+
+    backend.write([make_record("2024-05-01T10:00:00+00:00", 1.0), make_record("2024-05-02T10:00:00+00:00", 2.0)])
+    assert dataset.compact(backend)["rows"] == 2
+    backend.write([make_record("2024-05-02T11:00:00+00:00", 3.0)])
+    assert dataset.compact(backend)["rows"] == 1
+    assert dataset.compact(backend)["rows"] == 0
+
+    assert dataset.stats()["partitions"] == 2
+    assert dataset.read()["wind"].tolist() == [1.0, 2.0, 3.0]
+    day = dataset.read(start="2024-05-02", end="2024-05-02", columns=["wind", "actual"])
+    assert day.columns.tolist() == ["wind", "actual"]
+    assert day["wind"].tolist() == [2.0, 3.0]
+
+def test_evaluate_streams_the_confusion_matrix(tmp_path):
+    backend = CsvFeedbackBackend(str(tmp_path / "feedback.csv"), feedback_fields(FEATURES))
+    dataset = FeedbackDataset(str(tmp_path / "dataset"))
+    records = [make_record("2024-05-01T10:00:00+00:00", 1.0), make_record("2024-05-02T10:00:00+00:00", 2.0)]
+    records.append({**make_record("2024-05-02T11:00:00+00:00", 3.0), "prediction": 2.0})
+    backend.write(records)
+    dataset.compact(backend)
+
+    metrics = dataset.evaluate(["drizzle", "fog", "rain", "snow", "sun"])
+    assert metrics["support"] == 3
+    assert metrics["accuracy"] == pytest.approx(1 / 3)
+    assert metrics["confusion_matrix"][2][4] == 2
+    assert metrics["per_class"]["rain"]["recall"] == pytest.approx(1 / 3)
+    assert metrics["per_class"]["rain"]["precision"] == 1.0
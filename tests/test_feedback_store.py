@@ -0,0 +1,82 @@
+import threading
+from src.Deployment.FeedbackStore import FeedbackWriter, SqliteFeedbackBackend, CsvFeedbackBackend, feedback_fields
+
+FEATURE_COLUMNS = ["date", "precipitation", "temp_max", "temp_min", "wind"]
+FEATURES = {"date": "2024-05-01", "precipitation": 0.5, "temp_max": 18.0, "temp_min": 9.0, "wind": 3.2}
+
+class RecordingBackend:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def write(self, records):
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append(list(records))
+        self.written.set()
+
+def test_records_are_written_in_batches():
+    backend = RecordingBackend()
+    writer = FeedbackWriter(backend, flush_interval=60, max_batch=3)
+    for i in range(3):
+        writer.submit(FEATURES, prediction=float(i), actual=2.0)
+    # A full batch wakes the writer up before the flush interval.
+    assert backend.written.wait(5)
+    writer.close()
+
+    assert [len(batch) for batch in backend.batches] == [3]
+    assert [record["prediction"] for record in backend.batches[0]] == [0.0, 1.0, 2.0]
+    assert writer.stats()["written"] == 3
+
+def test_close_flushes_the_queue():
+    backend = RecordingBackend()
+    writer = FeedbackWriter(backend, flush_interval=60, max_batch=100)
+    writer.submit(FEATURES, prediction=2.0, actual=2.0)
+    writer.submit(FEATURES, prediction=4.0, actual=1.0)
+    assert backend.batches == []
+    writer.close()
+
+    assert [len(batch) for batch in backend.batches] == [2]
+    assert writer.stats()["queued"] == 0
+
+def test_queue_is_capped_while_the_backend_fails():
+    backend = RecordingBackend(fail=True)
+    writer = FeedbackWriter(backend, flush_interval=60, max_batch=1000, max_queued=5)
+    for i in range(8):
+        writer.submit(FEATURES, prediction=float(i), actual=0.0)
+    assert writer.flush() == 0
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["queued"] == 5
+    assert stats["dropped"] == 3
+    assert stats["failed_flushes"] >= 2
+    # The most recent records are kept for the next retry.
+    backend.fail = False
+    writer.flush()
+    assert [record["prediction"] for record in backend.batches[0]] == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+def test_sqlite_backend_reads_from_its_cursor(tmp_path):
+    backend = SqliteFeedbackBackend(str(tmp_path / "feedback.db"), feedback_fields(FEATURE_COLUMNS))
+    writer = FeedbackWriter(backend, flush_interval=60)
+    for i in range(3):
+        writer.submit(FEATURES, prediction=float(i), actual=float(i))
+    writer.close()
+
+    records, cursor = backend.read_since(0)
+    assert records["prediction"].tolist() == [0.0, 1.0, 2.0]
+    assert list(records.columns) == feedback_fields(FEATURE_COLUMNS)
+
+    backend.write([{**FEATURES, "received_at": "now", "prediction": 4.0, "actual": 3.0}])
+    records, cursor = backend.read_since(cursor)
+    assert records["actual"].tolist() == [3.0]
+    assert len(backend.read_since(cursor)[0]) == 0
+
+def test_csv_backend_reads_from_its_cursor(tmp_path):
+    backend = CsvFeedbackBackend(str(tmp_path / "feedback.csv"), feedback_fields(FEATURE_COLUMNS))
+    backend.write([{**FEATURES, "received_at": "now", "prediction": 1.0, "actual": 1.0}])
+    records, cursor = backend.read_since(0)
+    backend.write([{**FEATURES, "received_at": "now", "prediction": 2.0, "actual": 0.0}])
+    assert records["prediction"].tolist() == [1.0]
+    assert backend.read_since(cursor)[0]["prediction"].tolist() == [2.0]
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.hyperparameterSearch import HyperparameterSearch, sample_params
+
+CLASSES = ["fog", "rain", "sun"]
+MODELS = {"xgboost": {"strategy": "xgboost"}}
+SPACE = {"xgboost": {"max_depth": [2, 3], "learning_rate": {"low": 0.05, "high": 0.3, "log": True}}}
+
+def make_data(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 3)), columns=["precipitation", "temp_max", "wind"])
+    # An imbalanced target, so that resampling adds rows.
+    y = pd.Series(np.where(X["precipitation"] > 1.0, "rain", np.where(X["temp_max"] > -0.5, "sun", "fog")))
+    return X, y
+
+def test_sampled_params_stay_in_their_space():
+    rng = np.random.default_rng(0)
+    space = {"depth": [4, 6], "rate": {"low": 0.01, "high": 0.1, "log": True}, "leaves": {"low": 8, "high": 16},
+             "subsample": {"low": 0.5, "high": 1.0}, "seed": 7}
+    for _ in range(20):
+        params = sample_params(space, rng)
+        assert params["depth"] in (4, 6)
+        assert 0.01 <= params["rate"] <= 0.1
+        assert isinstance(params["leaves"], int) and 8 <= params["leaves"] <= 16
+        assert 0.5 <= params["subsample"] <= 1.0
+        assert params["seed"] == 7
+    assert sample_params(space, np.random.default_rng(1)) == sample_params(space, np.random.default_rng(1))
+
+def test_rungs_grow_by_the_reduction_factor_up_to_max_rounds():
+    assert HyperparameterSearch(SPACE, MODELS, CLASSES, min_rounds=50, max_rounds=450).rungs == [50, 150, 450]
+    assert HyperparameterSearch(SPACE, MODELS, CLASSES, min_rounds=10, max_rounds=50).rungs == [10, 30, 50]
+
+def test_validation_rows_are_held_out_before_resampling():
+    X, y = make_data()
+    search = HyperparameterSearch(SPACE, MODELS, CLASSES, validation_size=0.25, resampling={"strategy": "random_over"})
+    X_train, y_train, X_val, y_val = search._split(X, y)
+
+    assert len(X_val) == 50
+    assert X_val.index.isin(X.index).all()
+    assert len(X_train) > 150
+    assert y_train.value_counts().nunique() == 1
+    # No validation row was copied into the training rows.
+    assert not X_train.merge(X_val, how="inner").shape[0]
+
+def test_successive_halving_is_deterministic():
+    X, y = make_data()
+    search = HyperparameterSearch(SPACE, MODELS, CLASSES, n_trials=3, min_rounds=5, max_rounds=15,
+                                  reduction_factor=3, validation_size=0.25)
+    result = search.run(X, y)["xgboost"]
+
+    trials = result["trials"]
+    assert [len(trial["history"]) for trial in trials].count(2) == 1
+    assert [len(trial["history"]) for trial in trials].count(1) == 2
+    assert result["best_trial"] == next(trial["id"] for trial in trials if len(trial["history"]) == 2)
+    assert 1 <= result["params"]["n_estimators"] <= 15
+    assert result["params"]["max_depth"] in (2, 3)
+    assert search.run(X, y)["xgboost"]["params"] == result["params"]
+
+def test_only_boosters_are_searched():
+    X, y = make_data()
+    search = HyperparameterSearch({"decision_tree": {"max_depth": [2, 3]}}, {"decision_tree": {"strategy": "decision_tree"}},
+                                  CLASSES, n_trials=2, min_rounds=5, max_rounds=15)
+    with pytest.raises(ValueError, match="no boosting rounds"):
+        search.run(X, y)
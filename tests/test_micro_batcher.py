@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from src.Deployment.microBatcher import MicroBatcher
+
+class RecordingModel:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def predict(self, X):
+        self.batches.append(len(X))
+        if self.fail:
+            raise RuntimeError("model failure")
+        return X[:, 0] * 2
+
+def test_concurrent_submissions_are_coalesced():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=4, max_wait_ms=1000)
+    futures = [batcher.submit(np.array([[float(i), 0.0]])) for i in range(4)]
+    results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert model.batches == [4]
+    assert [r.tolist() for r in results] == [[0.0], [2.0], [4.0], [6.0]]
+    assert batcher.stats()["requests"] == 4
+
+def test_partial_batch_is_flushed_after_max_wait():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=100, max_wait_ms=20)
+    result = batcher.predict(np.array([[1.5, 0.0], [2.5, 0.0]]))
+    batcher.close()
+
+    assert model.batches == [2]
+    assert result.tolist() == [3.0, 5.0]
+
+def test_errors_reach_every_waiter_of_the_batch():
+    model = RecordingModel(fail=True)
+    batcher = MicroBatcher(model.predict, max_batch_size=3, max_wait_ms=1000)
+    futures = [batcher.submit(np.array([[float(i), 0.0]])) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model failure"):
+            future.result(timeout=5)
+    batcher.close()
+
+    assert model.batches == [3]
@@ -0,0 +1,78 @@
+import shutil
+import numpy as np
+import pandas as pd
+import yaml
+from src.Deployment.artifactRegistry import ArtifactRegistry
+from src.Deployment.modelService import ModelRegistry
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.incrementalTraining import TrainingState, valid_labels
+
+CONFIG_PATH = "config/config.yaml"
+MODEL_PATH = "Artifacts/dt-model.pkl"
+SCALER_PATH = "Artifacts/scaler.json"
+OTHER_MODEL_PATH = "Artifacts/knn-model.pkl"
+CLASSES = ["drizzle", "fog", "rain", "snow", "sun"]
+
+X = np.array([[0.0, 10.0, 2.0, 3.0], [1.0, 12.0, 4.0, 2.0], [5.0, 8.0, 1.0, 6.0]])
+
+def make_models():
+    return {"dt": {"active": "v1", "encoded_labels": True, "versions": {"v1": MODEL_PATH}}}
+
+def test_registered_and_promoted_versions_reach_other_processes(tmp_path):
+    manifest = str(tmp_path / "model-versions.json")
+    trainer = ModelRegistry(make_models(), classes=CLASSES, manifest_path=manifest)
+    serving = ModelRegistry(make_models(), classes=CLASSES, manifest_path=manifest, check_interval=0)
+    switched = []
+    serving.add_promote_listener(lambda name, version: switched.append((name, version)))
+    assert serving.get("dt").version == "v1"
+
+    version = trainer.next_version("dt")
+    assert version == "v2"
+    trainer.register("dt", version, OTHER_MODEL_PATH)
+    assert serving.get("dt").version == "v1"
+
+    trainer.promote("dt", version)
+    assert serving.get("dt").version == "v2"
+    assert serving.active_path("dt") == OTHER_MODEL_PATH
+    assert switched == [("dt", "v2")]
+
+    # A registry started later reads the manifest over the config.
+    restarted = ModelRegistry(make_models(), classes=CLASSES, manifest_path=manifest)
+    assert restarted.active_version("dt") == "v2"
+    assert restarted.next_version("dt") == "v3"
+
+def test_only_usable_labels_are_counted():
+    records = pd.DataFrame({"actual": [0.0, 4.0, 5.0, -1.0, 1.5, None, "x"]})
+    assert int(valid_labels(records, CLASSES).notna().sum()) == 2
+
+def test_tuned_params_are_kept_in_the_training_state(tmp_path):
+    state = TrainingState(str(tmp_path / "training-state.json"))
+    assert state.load()["model_params"] == {}
+    state.record_params("catboost", {"depth": 4, "iterations": 150})
+    state.record_training("catboost", 1.5, incremental=False)
+    assert state.load()["model_params"]["catboost"] == {"depth": 4, "iterations": 150}
+
+def test_rollback_serves_the_original_version(tmp_path):
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    v1 = shutil.copy(MODEL_PATH, tmp_path / "model.pkl")
+    v2 = shutil.copy(OTHER_MODEL_PATH, tmp_path / "model-v2.pkl")
+    with open(v1, "rb") as f:
+        v1_bytes = f.read()
+    manifest = str(tmp_path / "model-versions.json")
+    models = {"dt": {"active": "v1", "encoded_labels": True, "versions": {"v1": str(v1)}}}
+    trainer = ModelRegistry(models, classes=CLASSES, manifest_path=manifest)
+    trainer.promote("dt", "v1")
+    serving = ArtifactRegistry(str(v1), SCALER_PATH, FeatureTransformer.config_slice(config), check_interval=0,
+                               classes=CLASSES, manifest_path=manifest, model_name="dt")
+    before = serving.current().predict(X)
+
+    trainer.register("dt", "v2", str(v2))
+    trainer.promote("dt", "v2")
+    assert serving.current().service.path == str(v2)
+
+    trainer.promote("dt", "v1")
+    assert serving.current().service.path == str(v1)
+    assert list(serving.current().predict(X)) == list(before)
+    with open(v1, "rb") as f:
+        assert f.read() == v1_bytes
@@ -0,0 +1,72 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from src.Deployment.onlineMonitor import OnlineMonitor, build_feature_reference, population_stability_index
+from src.dataStrategies.outliers import IQROutlierEngine
+
+CONFIG_PATH = "config/config.yaml"
+RAW_DATA_PATH = "Data/raw/seattle-weather.csv"
+CLASSES = ["drizzle", "fog", "rain", "snow", "sun"]
+
+def make_reference():
+    data = pd.DataFrame({"wind": np.arange(100, dtype=float)})
+    return build_feature_reference(data, ["wind"], bins=4)
+
+def test_window_evicts_the_oldest_events():
+    monitor = OnlineMonitor(CLASSES, make_reference(), window_size=3, min_events=1)
+    monitor.observe({"wind": 10.0}, prediction=0, actual=1)
+    for _ in range(3):
+        monitor.observe({"wind": 90.0}, prediction=2, actual=2)
+
+    stats = monitor.stats()
+    assert stats["events"] == 4
+    assert stats["window_events"] == 3
+    assert stats["rolling_accuracy"] == 1.0
+    assert stats["confusion_matrix"][0][1] == 0
+    assert stats["features"]["wind"]["histogram"] == [0, 0, 0, 3]
+
+def test_psi_is_zero_on_the_reference_and_grows_with_the_shift():
+    reference = np.array([0.25, 0.25, 0.25, 0.25])
+    assert population_stability_index(reference, reference) == pytest.approx(0.0)
+    small = population_stability_index(np.array([0.3, 0.25, 0.25, 0.2]), reference)
+    large = population_stability_index(np.array([0.0, 0.0, 0.0, 1.0]), reference)
+    assert 0 < small < 0.1 < large
+
+def test_retraining_is_recommended_on_low_accuracy_or_drift():
+    monitor = OnlineMonitor(CLASSES, make_reference(), window_size=10, min_events=4, min_accuracy=0.6, psi_threshold=0.2)
+    for wind in (10.0, 30.0, 60.0):
+        monitor.observe({"wind": wind}, prediction=1, actual=1)
+    assert not monitor.stats()["retrain_recommended"]
+
+    drifted = OnlineMonitor(CLASSES, make_reference(), window_size=10, min_events=4, psi_threshold=0.2)
+    for _ in range(4):
+        drifted.observe({"wind": 95.0}, prediction=1, actual=1)
+    stats = drifted.stats()
+    assert stats["retrain_recommended"]
+    assert stats["reasons"] == [f"wind PSI {stats['features']['wind']['psi']:.3f} above 0.2"]
+
+    inaccurate = OnlineMonitor(CLASSES, make_reference(), window_size=10, min_events=4, psi_threshold=10)
+    for wind in (10.0, 30.0, 60.0, 90.0):
+        inaccurate.observe({"wind": wind}, prediction=0, actual=4.0)
+    assert inaccurate.stats()["reasons"] == ["rolling accuracy 0.000 below 0.6"]
+
+def test_reference_matches_the_raw_feedback_inputs():
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    monitoring = config["serving"]["monitoring"]
+    with open(monitoring["reference_path"], "r") as f:
+        reference = json.load(f)
+    data = pd.read_csv(RAW_DATA_PATH).drop(columns=config["data_cleaning"]["drop_columns"]).drop_duplicates()
+
+    # /feedback receives raw values, so the reference must not be capped.
+    cap = IQROutlierEngine(cap_columns=["precipitation"]).handle_data(data)["precipitation"].max()
+    assert reference["features"]["precipitation"]["quantiles"]["0.95"] > cap
+
+    monitor = OnlineMonitor(CLASSES, reference, window_size=len(data), min_events=100, min_accuracy=0)
+    for row in data.to_dict("records"):
+        monitor.observe(row, prediction=0, actual=0)
+    stats = monitor.stats()
+    assert all(feature["psi"] < 0.01 for feature in stats["features"].values())
+    assert not stats["retrain_recommended"]
@@ -0,0 +1,67 @@
+import os
+import shutil
+import numpy as np
+import yaml
+from src.Deployment.artifactRegistry import ArtifactRegistry
+from src.Deployment.modelService import ModelRegistry
+from src.Deployment.predictionCache import PredictionCache
+from src.dataStrategies.featureTransformer import FeatureTransformer
+
+CONFIG_PATH = "config/config.yaml"
+MODEL_PATH = "Artifacts/dt-model.pkl"
+SCALER_PATH = "Artifacts/scaler.json"
+
+X = np.array([[0.0, 10.0, 2.0, 3.0], [1.0, 12.0, 4.0, 2.0], [5.0, 8.0, 1.0, 6.0]])
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.Deployment.predictionCache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(max_size=10, ttl_seconds=60)
+    keys = cache.keys(X, "1:default")
+    cache.store(keys, ["rain", "sun", "fog"])
+
+    now[0] += 59
+    assert cache.lookup(keys) == (["rain", "sun", "fog"], [])
+    now[0] += 2
+    assert cache.lookup(keys) == ([None, None, None], [0, 1, 2])
+    assert cache.stats()["expirations"] == 3
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PredictionCache(max_size=2, ttl_seconds=60)
+    keys = cache.keys(X, "1:default")
+    cache.store(keys[:2], ["rain", "sun"])
+    cache.lookup(keys[:1])
+    cache.store(keys[2:], ["fog"])
+
+    values, missing = cache.lookup(keys)
+    assert values == ["rain", None, "fog"]
+    assert missing == [1]
+    assert cache.stats()["evictions"] == 1
+
+def test_keys_depend_on_the_model_version():
+    cache = PredictionCache()
+    assert cache.keys(X, "1:dt:v1") != cache.keys(X, "1:dt:v2")
+    assert cache.keys(X * -0.0, "k") == cache.keys(X * 0.0, "k")
+
+def test_cache_is_cleared_on_reload_and_promote(tmp_path):
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    model_path = shutil.copy(MODEL_PATH, tmp_path / "model.pkl")
+    scaler_path = shutil.copy(SCALER_PATH, tmp_path / "scaler.json")
+    cache = PredictionCache()
+
+    registry = ArtifactRegistry(str(model_path), str(scaler_path), FeatureTransformer.config_slice(config), check_interval=0)
+    registry.add_reload_listener(cache.clear)
+    cache.store(cache.keys(X, "1:default"), ["rain", "sun", "fog"])
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.current().version == 2
+    assert cache.stats()["size"] == 0
+
+    models = ModelRegistry({"dt": {"active": "v1", "versions": {"v1": str(model_path), "v2": str(model_path)}}})
+    models.add_promote_listener(cache.clear)
+    assert models.get("dt").version == "v1"
+    cache.store(cache.keys(X, "2:dt:v1"), ["rain", "sun", "fog"])
+    assert models.promote("dt", "v2").version == "v2"
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 2
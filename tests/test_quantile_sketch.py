@@ -0,0 +1,43 @@
+import numpy as np
+from src.streamingPreprocessing import QuantileSketch
+
+def test_small_streams_are_exact():
+    values = np.random.default_rng(0).normal(size=500)
+    sketch = QuantileSketch(k=1024)
+    sketch.update(values[:200])
+    sketch.update(np.append(values[200:], np.nan))
+    q = [0.0, 0.25, 0.5, 0.75, 1.0]
+    np.testing.assert_allclose(sketch.quantile(q), np.quantile(values, q))
+
+def test_compaction_keeps_the_total_weight():
+    rng = np.random.default_rng(0)
+    sketch = QuantileSketch(k=64)
+    for _ in range(50):
+        sketch.update(rng.random(37))
+    weight = sum(len(level) * 2 ** h for h, level in enumerate(sketch.levels))
+    assert weight == sketch.count == 50 * 37
+    assert sketch.size() < 64 * len(sketch.levels) + 64
+
+def test_odd_items_and_offsets_are_drawn_at_every_compaction():
+    kept_smallest = kept_largest = 0
+    promoted_first = set()
+    for seed in range(40):
+        sketch = QuantileSketch(k=4, random_state=seed)
+        sketch.update([1.0, 2.0, 3.0, 4.0, 5.0])
+        kept = sketch.levels[0].tolist()
+        kept_smallest += kept == [1.0]
+        kept_largest += kept == [5.0]
+        promoted_first.add(sketch.levels[1][0])
+    assert kept_smallest + kept_largest == 40
+    assert kept_smallest and kept_largest
+    # The first promoted item is the first or the second of the pairs.
+    assert len(promoted_first) > 1
+
+def test_large_streams_stay_within_the_rank_error():
+    values = np.random.default_rng(1).random(200000)
+    sketch = QuantileSketch(k=256)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+    q = np.linspace(0.05, 0.95, 19)
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(q)) / len(values)
+    assert np.max(np.abs(ranks - q)) < 0.02
@@ -0,0 +1,28 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.dataStrategies.resampling import RandomOverSamplingStrategy, create_resampling_strategy
+
+def make_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"a": rng.normal(size=100), "weather": ["sun"] * 80 + ["fog"] * 20})
+
+def test_memory_is_not_traced_by_default():
+    strategy = create_resampling_strategy({"strategy": "random_over"})
+    balanced = strategy.handle_data(make_data())
+    assert len(balanced) == 160
+    assert "peak_memory_bytes" not in strategy.stats
+    assert not tracemalloc.is_tracing()
+
+def test_a_running_tracer_is_left_running():
+    tracemalloc.start()
+    try:
+        strategy = RandomOverSamplingStrategy(trace_memory=True)
+        strategy.handle_data(make_data())
+        assert strategy.stats["peak_memory_bytes"] > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    strategy.handle_data(make_data())
+    assert not tracemalloc.is_tracing()
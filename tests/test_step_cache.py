@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+import yaml
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.stepCache import StepCache
+
+CONFIG_PATH = "config/config.yaml"
+RAW_DATA_PATH = "Data/raw/seattle-weather.csv"
+
+def test_cached_helper_runs_once_per_input(tmp_path):
+    calls = []
+    cache = StepCache(directory=str(tmp_path))
+
+    @cache.cached
+    def scale(data: pd.DataFrame, config: dict) -> pd.DataFrame:
+        calls.append(len(data))
+        return data * config["factor"]
+
+    data = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+    first = scale(data, {"factor": 2})
+    pd.testing.assert_frame_equal(scale(data.copy(), {"factor": 2}), first)
+    assert calls == [3]
+
+    scale(data, {"factor": 3})
+    scale(data.head(2), {"factor": 2})
+    assert calls == [3, 3, 2]
+
+def test_disabled_cache_always_runs(tmp_path):
+    calls = []
+    cache = StepCache(directory=str(tmp_path), enabled=False)
+    increment = cache.cached(lambda value: calls.append(value) or value + 1)
+    assert increment(1) == increment(1) == 2
+    assert calls == [1, 1]
+
+def test_feature_engineering_is_cached_under_an_undecorated_step():
+    pytest.importorskip("zenml")
+    from steps import dataHandling
+
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    feature_config = FeatureTransformer.config_slice(config)
+    data = pd.read_csv(RAW_DATA_PATH).drop(columns=config["data_cleaning"]["drop_columns"]).head(50)
+
+    transformer = FeatureTransformer(**feature_config)
+    expected = transformer.to_frame(transformer.engineer(transformer.inputs_from_frame(data)), index=data.index)
+    engineered = dataHandling.engineer_features(data, feature_config)
+    pd.testing.assert_frame_equal(engineered[transformer.output_columns], expected)
+    pd.testing.assert_frame_equal(dataHandling.engineer_features(data, feature_config), engineered)
+    assert not hasattr(dataHandling.engineer_features, "entrypoint")
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+import yaml
+from src.dataStrategies.featureTransformer import FeatureTransformer
+from src.streamingPreprocessing import StreamingPreprocessor
+
+CONFIG_PATH = "config/config.yaml"
+RAW_DATA_PATH = "Data/raw/seattle-weather.csv"
+
+def make_preprocessor(tmp_path):
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    dedup = {**config["data_cleaning"]["dedup"], "persist": True, "directory": str(tmp_path / "dedup")}
+    return StreamingPreprocessor(
+        config["data_cleaning"]["drop_columns"],
+        config["outlier_handling"]["remove_columns"],
+        config["outlier_handling"]["cap_columns"],
+        FeatureTransformer.config_slice(config),
+        chunk_size=500,
+        spool_directory=str(tmp_path / "spool"),
+        dedup_config=dedup,
+        outlier_bounds_path=str(tmp_path / "outlier-bounds.json"),
+        scaler_path=str(tmp_path / "scaler.json"),
+    )
+
+def test_persisted_dedup_appends_new_rows_only(tmp_path):
+    raw = pd.read_csv(RAW_DATA_PATH)
+    first, full = tmp_path / "first.csv", tmp_path / "full.csv"
+    raw.head(800).to_csv(first, index=False)
+    raw.to_csv(full, index=False)
+    output = str(tmp_path / "processed.csv")
+
+    preprocessor = make_preprocessor(tmp_path)
+    stats = preprocessor.run(str(first), output)
+    assert not stats["incremental"]
+    preprocessor.engine.save_bounds(preprocessor.outlier_bounds_path)
+    preprocessor.transformer.save_scaler(preprocessor.scaler_path)
+    written = stats["rows_written"]
+
+    stats = make_preprocessor(tmp_path).run(str(full), output)
+    assert stats["incremental"]
+    assert stats["duplicates"] >= 800
+    assert len(pd.read_csv(output)) == written + stats["rows_written"]
+
+    # Nothing new: fail instead of leaving an empty or unchanged dataset behind silently.
+    with pytest.raises(ValueError, match="No new rows"):
+        make_preprocessor(tmp_path).run(str(full), output)
+    assert len(pd.read_csv(output)) == written + stats["rows_written"]
+
+def test_spool_is_removed_when_a_run_fails(tmp_path):
+    raw = pd.read_csv(RAW_DATA_PATH)
+    source = tmp_path / "raw.csv"
+    raw.head(800).to_csv(source, index=False)
+
+    # Writing the output fails after every row was spooled.
+    with pytest.raises(OSError):
+        make_preprocessor(tmp_path).run(str(source), str(tmp_path / "missing" / "processed.csv"))
+    assert list((tmp_path / "spool").iterdir()) == []
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.TrainingStrategies.registry import MODEL_STRATEGIES, load_strategy
+from src.trainingOrchestrator import TrainingOrchestrator, build_model, save_model, select_model
+
+CLASSES = ["fog", "rain", "sun"]
+SMALL_PARAMS = {
+    "catboost": {"iterations": 20, "verbose": False},
+    "xgboost": {"n_estimators": 20},
+    "lightgbm": {"n_estimators": 20, "verbose": -1},
+    "hist_gradient_boosting": {"max_iter": 20},
+    "random_forest": {"n_estimators": 10},
+    "extra_trees": {"n_estimators": 10},
+    "knn": {"n_neighbors": 3},
+    "decision_tree": {"max_depth": 3},
+}
+
+def make_data(rows=150, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 3)), columns=["precipitation", "temp_max", "wind"])
+    y = pd.Series(np.where(X["precipitation"] > 0.5, "rain", np.where(X["temp_max"] > 0, "sun", "fog")))
+    return X[:100], y[:100], X[100:], y[100:]
+
+@pytest.mark.parametrize("name", sorted(MODEL_STRATEGIES))
+def test_every_strategy_of_the_zoo_trains_and_predicts(name):
+    if name == "lightgbm":
+        pytest.importorskip("lightgbm")
+    X_train, y_train, X_test, y_test = make_data()
+    model, encoded = build_model(name, {"strategy": name, "params": SMALL_PARAMS[name]}, CLASSES)
+    assert encoded == load_strategy(name).requires_encoded_labels
+
+    codes = {label: i for i, label in enumerate(CLASSES)}
+    model.train(X_train, y_train.map(codes) if encoded else y_train)
+    preds = np.asarray(model.predict(X_test)).ravel()
+    if encoded:
+        preds = np.asarray(CLASSES)[preds.astype(int)]
+    assert set(preds) <= set(CLASSES)
+    assert np.mean(preds == y_test.to_numpy()) > 0.6
+
+def test_class_weights_follow_the_label_encoding():
+    weights = {"fog": 1.0, "rain": 2.0, "sun": 0.5}
+    model, encoded = build_model("xgb", {"strategy": "xgboost"}, CLASSES, weights)
+    assert encoded and model.class_weight == {0: 1.0, 1: 2.0, 2: 0.5}
+    model, encoded = build_model("dt", {"strategy": "decision_tree"}, CLASSES, weights)
+    assert not encoded and model.model.get_params()["class_weight"] == weights
+
+def test_catboost_workers_write_no_training_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X_train, y_train, _, _ = make_data()
+    model, _ = build_model("catboost", {"strategy": "catboost", "params": SMALL_PARAMS["catboost"]}, CLASSES)
+    model.train(X_train, y_train)
+    assert not (tmp_path / "catboost_info").exists()
+
+def test_orchestrator_trains_saves_and_selects(tmp_path):
+    models = {
+        "decision_tree": {"strategy": "decision_tree", "params": {"max_depth": 3, "random_state": 0},
+                          "path": str(tmp_path / "dt-model.pkl")},
+        "knn": {"strategy": "knn", "encoded_labels": True, "params": {"n_neighbors": 3},
+                "path": str(tmp_path / "knn-model.pkl")},
+        "random_forest": {"strategy": "random_forest", "enabled": False, "path": str(tmp_path / "rf-model.pkl")},
+    }
+    results = TrainingOrchestrator(models, CLASSES, max_workers=1).run(*make_data())
+
+    assert set(results["models"]) == {"decision_tree", "knn"}
+    assert not (tmp_path / "rf-model.pkl").exists()
+    for name, result in results["models"].items():
+        assert (tmp_path / f"{'dt' if name == 'decision_tree' else 'knn'}-model.pkl").stat().st_size == result["size_bytes"]
+        assert result["accuracy"] > 0.6
+    assert results["training_seconds"] == pytest.approx(sum(r["training_seconds"] for r in results["models"].values()))
+
+def test_selection_prefers_the_fastest_accurate_model():
+    results = {
+        "slow": {"accuracy": 0.9, "predict_ms_per_1k_rows": 20.0},
+        "fast": {"accuracy": 0.8, "predict_ms_per_1k_rows": 1.0},
+        "fastest": {"accuracy": 0.5, "predict_ms_per_1k_rows": 0.1},
+    }
+    assert select_model(results, min_accuracy=0.75) == "fast"
+    assert select_model(results, min_accuracy=0.85) == "slow"
+    assert select_model(results, min_accuracy=0.95) is None
+
+def test_models_without_a_native_format_keep_only_the_pickle(tmp_path):
+    X_train, y_train, _, _ = make_data()
+    model, _ = build_model("dt", {"strategy": "decision_tree"}, CLASSES)
+    model.train(X_train, y_train)
+    assert not save_model(model, str(tmp_path / "dt.pkl"), str(tmp_path / "dt.native"))
+    assert (tmp_path / "dt.pkl").exists() and not (tmp_path / "dt.native").exists()
+
+    model, _ = build_model("catboost", {"strategy": "catboost", "params": SMALL_PARAMS["catboost"]}, CLASSES)
+    model.train(X_train, y_train)
+    assert save_model(model, str(tmp_path / "ctb.pkl"), str(tmp_path / "ctb.cbm"))
+    assert (tmp_path / "ctb.cbm").exists()